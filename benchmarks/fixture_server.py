@@ -0,0 +1,41 @@
+# benchmarks/fixture_server.py
+
+# 📦 Import libraries
+import os
+import threading
+from functools import partial
+from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
+
+# 📂 Recorded/synthetic application forms served by the benchmark
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+# 📝 Fixture entry pages (each ends on success.html)
+FIXTURES = ["single_page", "multi_step_1", "dynamic_dropdown", "file_upload"]
+
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    """Static file handler without per-request console output and without caching."""
+
+    def log_message(self, format, *args):
+        pass
+
+    def end_headers(self):
+        self.send_header("Cache-Control", "no-store")
+        super().end_headers()
+
+
+def start_fixture_server(host: str = "127.0.0.1", port: int = 0):
+    """
+    Serves the fixtures directory on a background thread.
+
+    Args:
+        host (str): Interface to bind.
+        port (int): Port to bind (0 picks a free one).
+
+    Returns:
+        tuple: (server, base_url). Call server.shutdown() when done.
+    """
+    server = ThreadingHTTPServer((host, port), partial(QuietHandler, directory=FIXTURES_DIR))
+    thread = threading.Thread(target=server.serve_forever, name="fixture-server", daemon=True)
+    thread.start()
+    return server, f"http://{host}:{server.server_address[1]}"
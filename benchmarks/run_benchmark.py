@@ -0,0 +1,181 @@
+# benchmarks/run_benchmark.py
+
+# 📦 Imports
+import sys
+import os
+import argparse
+import json
+import statistics
+import time
+
+# 🛠️ Add project root to path so imports work correctly
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# 📥 Load modules
+import src.main as agent
+from config.settings import FIELD_MAPPER_ENABLED
+from src.browser.driver_setup import get_driver
+from src.tools.field_mapper import FieldMapper
+from src.tools.hands_tool import HandsTool
+from src.tools.memory_index import MemoryIndex
+from src.tools.profiler import profiler, percentile
+from src.tools.logger_tool import log_event, shutdown_logger
+from benchmarks.fixture_server import FIXTURES, FIXTURES_DIR, start_fixture_server
+from benchmarks.stub_planner import StubPlanner
+
+SUCCESS_TEXT = "Thank you for applying"
+
+# 📊 Metrics compared against a baseline (True = higher is better)
+COMPARED_METRICS = {
+    "links_per_hour": True,
+    "seconds_per_form": False,
+    "p95_seconds_per_form": False,
+    "webdriver_calls_per_form": False,
+}
+
+
+class WebDriverCallCounter:
+    """
+    Counts WebDriver protocol commands sent by a driver.
+
+    Every driver and element method goes through driver.execute, so wrapping
+    it on the instance counts page loads, finds, clicks, scripts, etc.
+    """
+
+    def __init__(self, driver):
+        self.calls = 0
+        self.by_command = {}
+        original_execute = driver.execute
+
+        def counting_execute(driver_command, params=None):
+            self.calls += 1
+            self.by_command[driver_command] = self.by_command.get(driver_command, 0) + 1
+            return original_execute(driver_command, params)
+
+        driver.execute = counting_execute
+
+
+def run_benchmark(rounds: int = 3, latency: float = 0.5, fixtures: list = None, headless: bool = True) -> dict:
+    """
+    Drives the real main loop and HandsTool over the local fixtures with a stub planner.
+
+    Args:
+        rounds (int): Times each fixture is processed.
+        latency (float): Seconds the stub planner sleeps per call (stands in for Gemini).
+        fixtures (list): Fixture names to run (default: all).
+        headless (bool): Run Chrome headless.
+
+    Returns:
+        dict: Run metrics plus a per-fixture breakdown.
+    """
+    fixtures = fixtures or FIXTURES
+    with open(os.path.join(FIXTURES_DIR, "memory.json"), "r", encoding="utf-8") as f:
+        memory_data = json.load(f)
+    memory_index = MemoryIndex(memory_data)
+    field_mapper = FieldMapper(memory_data, memory_index) if FIELD_MAPPER_ENABLED else None
+
+    # 🤖 Swap Gemini for the deterministic planner
+    planner = StubPlanner(latency)
+    agent.decide_next_actions = planner
+
+    server, base_url = start_fixture_server()
+    driver = get_driver(headless=headless, profile_dir="")
+    counter = WebDriverCallCounter(driver)
+    hands = HandsTool(driver)
+
+    forms = []
+    started = time.perf_counter()
+    try:
+        for _ in range(rounds):
+            for name in fixtures:
+                link = f"{base_url}/{name}.html"
+                calls_before, form_started = counter.calls, time.perf_counter()
+                result = agent.process_link(driver, hands, link, memory_data, plan_cache=None, memory_index=memory_index,
+                                            field_mapper=field_mapper)
+                forms.append({
+                    "fixture": name,
+                    "seconds": time.perf_counter() - form_started,
+                    "webdriver_calls": counter.calls - calls_before,
+                    "completed": bool(result and result[0] == "Success") or SUCCESS_TEXT in driver.page_source,
+                })
+    finally:
+        elapsed = time.perf_counter() - started
+        driver.quit()
+        server.shutdown()
+
+    seconds = [form["seconds"] for form in forms]
+    report = {
+        "forms": len(forms),
+        "completed": sum(form["completed"] for form in forms),
+        "elapsed_seconds": round(elapsed, 2),
+        "links_per_hour": round(len(forms) * 3600 / elapsed, 1) if elapsed else 0.0,
+        "seconds_per_form": round(statistics.mean(seconds), 3) if seconds else 0.0,
+        "p95_seconds_per_form": round(percentile(seconds, 95), 3),
+        "webdriver_calls_per_form": round(statistics.mean(f["webdriver_calls"] for f in forms), 1) if forms else 0.0,
+        "planner_calls": planner.calls,
+        "planner_latency": latency,
+        "fixtures": {},
+    }
+    for name in fixtures:
+        runs = [form for form in forms if form["fixture"] == name]
+        report["fixtures"][name] = {
+            "completed": f"{sum(r['completed'] for r in runs)}/{len(runs)}",
+            "seconds_per_form": round(statistics.mean(r["seconds"] for r in runs), 3),
+            "webdriver_calls_per_form": round(statistics.mean(r["webdriver_calls"] for r in runs), 1),
+        }
+    report["top_commands"] = dict(sorted(counter.by_command.items(), key=lambda item: item[1], reverse=True)[:10])
+    return report
+
+
+def print_report(report: dict, baseline: dict = None):
+    """Prints the metrics table, with the change against a baseline if given."""
+    print("\n📊 Benchmark results")
+    print(f"   Forms: {report['completed']}/{report['forms']} completed in {report['elapsed_seconds']}s "
+          f"(stub latency {report['planner_latency']}s, {report['planner_calls']} planner calls)")
+    for metric, higher_is_better in COMPARED_METRICS.items():
+        line = f"   {metric:<26} {report[metric]}"
+        if baseline and baseline.get(metric):
+            change = (report[metric] - baseline[metric]) / baseline[metric] * 100
+            better = change > 0 if higher_is_better else change < 0
+            line += f"   (baseline {baseline[metric]}, {change:+.1f}% {'✅' if better or change == 0 else '⚠️'})"
+        print(line)
+
+    print("\n   Per fixture:")
+    for name, stats in report["fixtures"].items():
+        print(f"   {name:<18} completed {stats['completed']:<6} "
+              f"{stats['seconds_per_form']}s/form  {stats['webdriver_calls_per_form']} calls/form")
+    print(f"\n   Top WebDriver commands: {report['top_commands']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline benchmark: local ATS fixtures + stub planner")
+    parser.add_argument("--rounds", type=int, default=3, help="Times each fixture is processed")
+    parser.add_argument("--latency", type=float, default=0.5, help="Stub planner seconds per call")
+    parser.add_argument("--fixtures", help=f"Comma-separated subset of {','.join(FIXTURES)}")
+    parser.add_argument("--headed", action="store_true", help="Show the browser")
+    parser.add_argument("--output", metavar="PATH", help="Write the report as JSON (e.g. to keep as a baseline)")
+    parser.add_argument("--baseline", metavar="PATH", help="Compare against a previously written report")
+    args = parser.parse_args()
+
+    fixtures = [name.strip() for name in args.fixtures.split(",")] if args.fixtures else None
+    report = run_benchmark(args.rounds, args.latency, fixtures, headless=not args.headed)
+    profiler.log_summary()
+    log_event(f"📊 Benchmark: {report['links_per_hour']} links/hour, {report['seconds_per_form']}s/form, "
+              f"{report['webdriver_calls_per_form']} WebDriver calls/form")
+    shutdown_logger()
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+    print_report(report, baseline)
+
+    if args.output:
+        os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\n💾 Report written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
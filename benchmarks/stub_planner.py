@@ -0,0 +1,80 @@
+# benchmarks/stub_planner.py
+
+# 📦 Import libraries
+import os
+import re
+import time
+
+# 🛠️ Project imports
+from src.tools.dom_distiller import distill_dom
+from src.tools.memory_index import MemoryIndex
+from benchmarks.fixture_server import FIXTURES_DIR
+
+# 🖱️ Buttons that move an application forward
+SUBMIT_TEXT = re.compile(r"submit|apply|next|continue", re.IGNORECASE)
+
+# 🔽 Text inputs that are really type-ahead pickers
+DYNAMIC_PLACEHOLDER = re.compile(r"^(select|start typing|search)", re.IGNORECASE)
+
+RESUME_FILE = os.path.join(FIXTURES_DIR, "resume.pdf")
+FALLBACK_TEXT = "Benchmark answer"
+
+
+class StubPlanner:
+    """
+    Deterministic stand-in for decide_next_actions.
+
+    Builds the plan from the distilled form model: every field is filled from
+    memory (or a fixed answer), then the submit/next button is clicked. Sleeps
+    `latency` seconds per call to stand in for the Gemini round trip.
+    """
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.calls = 0
+        self.index = None
+
+    def __call__(self, dom_html: str, memory_data: dict, session=None, memory_index=None, on_action=None,
+                 form_model: dict = None) -> dict:
+        self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+        if "Thank you for applying" in dom_html:
+            return {"status": "completed"}
+
+        if memory_index is None:
+            if self.index is None:
+                self.index = MemoryIndex(memory_data)
+            memory_index = self.index
+
+        form_model = form_model or distill_dom(dom_html)
+        prefilled = session.prefilled if session else set()
+        fields = [field for field in form_model["fields"] if field["xpath"] not in prefilled]
+        actions = [action for action in (self._fill(field, memory_index) for field in fields) if action]
+        buttons = [b for b in form_model["buttons"] if SUBMIT_TEXT.search(b.get("text", ""))] or form_model["buttons"][-1:]
+        actions.extend({"type": "click", "selector": b["xpath"]} for b in buttons[:1])
+
+        if session:
+            session.observe(form_model)
+        return {"status": "action_required", "actions": actions, "job_summary": {"Job Title": form_model.get("title", "")}}
+
+    def _fill(self, field: dict, memory_index) -> dict:
+        """One action for a distilled field, or None if it needs nothing."""
+        label = field.get("label") or field.get("placeholder") or field.get("name") or ""
+        keys = memory_index.match(label)
+        answer = memory_index.flat[keys[0]] if keys else None
+
+        if field["type"] == "file":
+            return {"type": "upload", "selector": field["xpath"], "file_path": RESUME_FILE}
+        if field["type"] in ("checkbox", "radio"):
+            return {"type": "check", "selector": field["xpath"]}
+        if field["tag"] == "select":
+            options = [o for o in field.get("options", []) if o and not o.lower().startswith("select")]
+            if not options:
+                return None
+            option = answer if answer in options else options[0]
+            return {"type": "select", "selector": field["xpath"], "option_text": option}
+        if DYNAMIC_PLACEHOLDER.match(field.get("placeholder") or ""):
+            return {"type": "dynamic_select", "selector": field["xpath"], "option_text": answer or FALLBACK_TEXT}
+        return {"type": "type", "selector": field["xpath"], "text": answer or FALLBACK_TEXT}
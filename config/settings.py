@@ -13,3 +13,120 @@ PASSWORD_FOR_LOGIN = os.getenv("PASSWORD_FOR_LOGIN")
 
 # API key for accessing Google's Gemini AI models
 GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
+
+# Reduce the page DOM to a compact form model before prompting Gemini
+DISTILL_DOM = os.getenv("DISTILL_DOM", "true").lower() == "true"
+
+# Persistent plan cache (replays actions on pages with a known form structure)
+PLAN_CACHE_ENABLED = os.getenv("PLAN_CACHE_ENABLED", "true").lower() == "true"
+PLAN_CACHE_FILE = os.getenv("PLAN_CACHE_FILE", "output/plan_cache.json")
+PLAN_CACHE_SIZE = int(os.getenv("PLAN_CACHE_SIZE", "200"))
+
+# Condition-based waits (seconds / milliseconds)
+WAIT_TIMEOUT = float(os.getenv("WAIT_TIMEOUT", "10"))
+WAIT_POLL_INTERVAL = float(os.getenv("WAIT_POLL_INTERVAL", "0.1"))
+DOM_QUIET_MS = int(os.getenv("DOM_QUIET_MS", "300"))
+NETWORK_IDLE_MS = int(os.getenv("NETWORK_IDLE_MS", "500"))
+# Upper bound for the settle, DOM-quiet and network-idle waits after loads and actions
+# (pages that poll or animate never settle; element waits keep WAIT_TIMEOUT)
+SETTLE_TIMEOUT = float(os.getenv("SETTLE_TIMEOUT", "2.5"))
+
+# Apply consecutive type/check/select actions in a single execute_script call
+BATCH_FILL_ENABLED = os.getenv("BATCH_FILL_ENABLED", "true").lower() == "true"
+
+# Prefetched first-step plans older than this (seconds) are discarded
+PREFETCH_TTL = float(os.getenv("PREFETCH_TTL", "600"))
+
+# Incremental prompting: send only the changed part of the page on later steps of a link
+DELTA_PROMPTING = os.getenv("DELTA_PROMPTING", "true").lower() == "true"
+DELTA_MAX_RATIO = float(os.getenv("DELTA_MAX_RATIO", "0.6"))
+
+# Send only the memory entries that match the page's field labels
+MEMORY_INDEX_ENABLED = os.getenv("MEMORY_INDEX_ENABLED", "true").lower() == "true"
+
+# Token accounting: local tokenizer model, per-call prompt budget and prices (USD per 1M tokens)
+TOKENIZER_MODEL = os.getenv("TOKENIZER_MODEL", "gemini-1.5-flash-002")
+MAX_PROMPT_TOKENS = int(os.getenv("MAX_PROMPT_TOKENS", "30000"))
+PRICE_PER_MILLION_INPUT = float(os.getenv("PRICE_PER_MILLION_INPUT", "0.10"))
+PRICE_PER_MILLION_OUTPUT = float(os.getenv("PRICE_PER_MILLION_OUTPUT", "0.40"))
+
+# Logging: minimum level (DEBUG, INFO, WARNING, ERROR), queue bound and write batch size
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+LOG_BATCH_SIZE = int(os.getenv("LOG_BATCH_SIZE", "200"))
+
+# Results database (SQLite, WAL mode) and commit batching
+RESULTS_DB = os.getenv("RESULTS_DB", "output/application_results.db")
+RESULTS_COMMIT_EVERY = int(os.getenv("RESULTS_COMMIT_EVERY", "10"))
+RESULTS_COMMIT_SECONDS = float(os.getenv("RESULTS_COMMIT_SECONDS", "5"))
+
+# Browser startup: fixed chromedriver path (skips the installer), cached path file,
+# headless mode, persistent profile directory and driver recycling (links per driver, 0 = never)
+CHROMEDRIVER_PATH = os.getenv("CHROMEDRIVER_PATH", "")
+DRIVER_PATH_CACHE = os.getenv("DRIVER_PATH_CACHE", "output/.chromedriver_path")
+HEADLESS = os.getenv("HEADLESS", "false").lower() == "true"
+CHROME_PROFILE_DIR = os.getenv("CHROME_PROFILE_DIR", "")
+DRIVER_RECYCLE_AFTER = int(os.getenv("DRIVER_RECYCLE_AFTER", "25"))
+
+# Resource blocking via CDP: on/off, resource types to drop (image, font, media)
+# and extra comma-separated wildcard URL patterns on top of the tracker blocklist
+BLOCK_RESOURCES = os.getenv("BLOCK_RESOURCES", "true").lower() == "true"
+BLOCK_RESOURCE_TYPES = [t for t in os.getenv("BLOCK_RESOURCE_TYPES", "image,font,media").split(",") if t.strip()]
+BLOCK_URL_PATTERNS = [p for p in os.getenv("BLOCK_URL_PATTERNS", "").split(",") if p.strip()]
+
+# Streaming plans: execute actions while Gemini is still generating, and how many
+# targeted repair calls an invalid or truncated plan gets
+STREAM_RESPONSES = os.getenv("STREAM_RESPONSES", "true").lower() == "true"
+PLAN_REPAIR_RETRIES = int(os.getenv("PLAN_REPAIR_RETRIES", "1"))
+
+# Outcome observer: page-side success/error/CAPTCHA detection, with optional extra rules
+# (JSON shaped like DEFAULT_OUTCOME_RULES in src/browser/outcome_observer.py)
+OUTCOME_OBSERVER_ENABLED = os.getenv("OUTCOME_OBSERVER_ENABLED", "true").lower() == "true"
+OUTCOME_RULES_FILE = os.getenv("OUTCOME_RULES_FILE", "config/outcome_rules.json")
+
+# Per-link budgets: planning steps, wall-clock seconds and LLM tokens, and how many
+# steps without any page change trigger an escalated plan (one more aborts the link)
+MAX_STEPS_PER_LINK = int(os.getenv("MAX_STEPS_PER_LINK", "15"))
+MAX_SECONDS_PER_LINK = float(os.getenv("MAX_SECONDS_PER_LINK", "300"))
+MAX_TOKENS_PER_LINK = int(os.getenv("MAX_TOKENS_PER_LINK", "150000"))
+STALL_LIMIT = int(os.getenv("STALL_LIMIT", "2"))
+
+# LLM scheduler: model per tier (an empty fast model sends everything to the main model),
+# requests and tokens per minute per tier (0 = unlimited), request timeout (seconds),
+# retries with jittered exponential backoff, and the largest page that counts as simple
+LLM_MODEL = os.getenv("LLM_MODEL", "gemini-2.0-flash-exp")
+LLM_FAST_MODEL = os.getenv("LLM_FAST_MODEL", "gemini-2.0-flash-lite")
+LLM_RPM = int(os.getenv("LLM_RPM", "10"))
+LLM_TPM = int(os.getenv("LLM_TPM", "1000000"))
+LLM_FAST_RPM = int(os.getenv("LLM_FAST_RPM", "30"))
+LLM_FAST_TPM = int(os.getenv("LLM_FAST_TPM", "1000000"))
+LLM_TIMEOUT = float(os.getenv("LLM_TIMEOUT", "60"))
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "4"))
+LLM_BACKOFF_BASE = float(os.getenv("LLM_BACKOFF_BASE", "1.0"))
+LLM_BACKOFF_MAX = float(os.getenv("LLM_BACKOFF_MAX", "30"))
+FAST_TIER_MAX_FIELDS = int(os.getenv("FAST_TIER_MAX_FIELDS", "3"))
+FAST_TIER_MAX_TOKENS = int(os.getenv("FAST_TIER_MAX_TOKENS", "4000"))
+
+# LLM response cache: off, record (serve cached responses, store new ones) or replay
+# (cached responses only, a miss fails the step without calling Gemini), directory and size bound
+RESPONSE_CACHE_MODE = os.getenv("RESPONSE_CACHE_MODE", "off").lower()
+RESPONSE_CACHE_DIR = os.getenv("RESPONSE_CACHE_DIR", "output/response_cache")
+RESPONSE_CACHE_MAX_MB = float(os.getenv("RESPONSE_CACHE_MAX_MB", "200"))
+
+# Pre-screening: read each job page's JSON-LD JobPosting / meta tags over plain HTTP before the
+# browser and skip jobs failing the filters (location, salary, expired) checked against memory;
+# parallel fetches, fetch timeout (seconds), whether remote jobs pass the location filter and a
+# minimum yearly salary (0 = lower bound of "Salary Expectation" in memory)
+PRESCREEN_ENABLED = os.getenv("PRESCREEN_ENABLED", "true").lower() == "true"
+PRESCREEN_FILTERS = [f.strip() for f in os.getenv("PRESCREEN_FILTERS", "location,salary,expired").split(",") if f.strip()]
+PRESCREEN_WORKERS = int(os.getenv("PRESCREEN_WORKERS", "8"))
+PRESCREEN_TIMEOUT = float(os.getenv("PRESCREEN_TIMEOUT", "10"))
+PRESCREEN_ALLOW_REMOTE = os.getenv("PRESCREEN_ALLOW_REMOTE", "true").lower() == "true"
+PRESCREEN_MIN_SALARY = float(os.getenv("PRESCREEN_MIN_SALARY", "0"))
+
+# Field mapper: fill standard fields (name, email, phone, address, EEO selects...) straight from memory
+# and send only the remaining fields to Gemini; share of a label's words a memory key or synonym must
+# cover, and the difflib similarity accepted for near-miss labels
+FIELD_MAPPER_ENABLED = os.getenv("FIELD_MAPPER_ENABLED", "true").lower() == "true"
+FIELD_MAPPER_MIN_COVERAGE = float(os.getenv("FIELD_MAPPER_MIN_COVERAGE", "0.6"))
+FIELD_MAPPER_CUTOFF = float(os.getenv("FIELD_MAPPER_CUTOFF", "0.85"))
@@ -2,49 +2,182 @@
 
 # 📦 Import necessary libraries
 import json
-import google.generativeai as genai  # Gemini SDK # type: ignore
+import time
 
 # 🛠 Correct imports after restructuring
-from config.settings import GOOGLE_API_KEY 
+from config.settings import DISTILL_DOM, DELTA_PROMPTING, DELTA_MAX_RATIO, MAX_PROMPT_TOKENS
+from config.settings import STREAM_RESPONSES, PLAN_REPAIR_RETRIES, LLM_TIMEOUT
+from src.agent.llm_scheduler import scheduler, choose_tier, PartialResponseError, STRONG
+from src.agent.response_cache import response_cache, ReplayClient
+from src.agent.plan_parser import IncrementalPlanParser, strip_code_fences, validate_action, validate_plan
 from src.tools.logger_tool import log_event
-from src.tools.token_counter import count_tokens
+from src.tools.profiler import profiler
+from src.tools.token_counter import count_tokens, trim_to_budget, tokenizer_name, ledger
+from src.tools.dom_distiller import distill_dom, render_form_model, diff_form_models, field_labels
 
-# 🧠 Configure Gemini model
-genai.configure(api_key=GOOGLE_API_KEY)
-model = genai.GenerativeModel("gemini-2.0-flash-exp")
+# ⏱️ Per-request options passed to generate_content
+REQUEST_OPTIONS = {"timeout": LLM_TIMEOUT}
 
-def decide_next_actions(dom_html: str, memory_data: dict) -> dict:
+# 📝 How the page section of the prompt is described to Gemini
+RAW_DOM_NOTE = "Full HTML of the page."
+FORM_MODEL_NOTE = (
+    "Compact JSON model of the page: \"fields\" (xpath, type, name, label, placeholder, options), "
+    "\"buttons\" (xpath, text) and visible \"text\". Non-interactive markup was removed."
+)
+DELTA_NOTE = (
+    "Only what changed since the previous step of this application, in the same compact JSON format: "
+    "new or changed \"fields\" and \"buttons\", \"removed\" xpaths and the new \"text\" if it changed. "
+    "\"unchanged\" items were already handled and are omitted."
+)
+
+
+def build_page_context(dom_html: str, session=None, form_model: dict = None) -> tuple:
     """
-    Analyze the DOM and candidate memory to generate next actions for HandsTool.
-    
+    Returns the page section for the prompt, distilled into a form model when possible.
+
+    When a LinkSession is given and the page changed only partly since the
+    previous step, just the changed fields and buttons are sent. Fields the
+    field mapper already filled on this step (session.prefilled) are left out.
+
     Args:
         dom_html (str): Full HTML source of the current page.
-        memory_data (dict): Candidate FAQ and resume data.
+        session (LinkSession | None): State of the link being processed.
+        form_model (dict | None): distill_dom() of dom_html if the caller already has it.
 
     Returns:
-        dict: Action plan and job summary (if extracted).
+        tuple: (page_context, note describing its format, form model or None if raw DOM is sent)
     """
+    if not DISTILL_DOM:
+        return dom_html, RAW_DOM_NOTE, None
 
-    log_event("🔎 Asking Gemini to analyze DOM and generate HandsTool actions...")
+    if form_model is None:
+        try:
+            form_model = distill_dom(dom_html)
+        except Exception as e:
+            log_event(f"⚠️ DOM distillation failed, sending raw DOM: {str(e)}")
+            return dom_html, RAW_DOM_NOTE, None
+
+    if not (form_model["fields"] or form_model["buttons"]):
+        log_event("ℹ️ No fields or buttons found by distiller, sending raw DOM.")
+        return dom_html, RAW_DOM_NOTE, None
+
+    page_context, page_note = None, FORM_MODEL_NOTE
+    if session is not None:
+        previous_model = session.previous_model
+        session.observe(form_model)
+        delta = None
+        if DELTA_PROMPTING and previous_model is not None and not session.stall_note:
+            delta = diff_form_models(previous_model, form_model)
+        if session.prefilled:
+            # 🗺️ Already filled from memory: neither the model nor the delta mentions them
+            form_model = {**form_model, "fields": [f for f in form_model["fields"] if f["xpath"] not in session.prefilled]}
+            if delta is not None:
+                delta["fields"] = [f for f in delta["fields"] if f["xpath"] not in session.prefilled]
+        if delta is not None:
+            if not (delta["fields"] or delta["buttons"]):
+                log_event("ℹ️ No structural change since last step, sending full form model.")
+            elif delta["ratio"] > DELTA_MAX_RATIO:
+                log_event(f"ℹ️ DOM delta too large ({delta['ratio']:.0%} changed), sending full form model.")
+            else:
+                page_context = render_form_model({key: value for key, value in delta.items() if key != "ratio"})
+                page_note = DELTA_NOTE
+                log_event(
+                    f"🧩 Prompting with DOM delta: {len(delta['fields'])} field(s), "
+                    f"{len(delta['buttons'])} button(s) changed, {delta['unchanged']} unchanged omitted."
+                )
+
+    if page_context is None:
+        page_context = render_form_model(form_model)
+    raw_tokens = count_tokens(dom_html)
+    distilled_tokens = count_tokens(page_context)
+    log_event(
+        f"🧹 DOM distilled: {raw_tokens} ➔ {distilled_tokens} tokens "
+        f"({raw_tokens - distilled_tokens} saved, {len(form_model['fields'])} fields, {len(form_model['buttons'])} buttons)"
+    )
+    return page_context, page_note, form_model
 
-    # 📝 Prepare the full prompt for Gemini
-    prompt = f"""
+
+def trim_page_context(page_context: str, page_note: str, max_tokens: int) -> str:
+    """
+    Shrinks the page section to a token budget.
+
+    Raw DOM is cut from the end. A form model (or delta) is trimmed by
+    structure so it stays valid JSON and keeps every button: first the
+    visible text goes, then the option lists, then fields from the end.
+    """
+    if page_note == RAW_DOM_NOTE:
+        return trim_to_budget(page_context, max_tokens)
+
+    model = json.loads(page_context)
+    render = lambda: json.dumps(model, ensure_ascii=False, separators=(",", ":"))
+    if count_tokens(page_context) <= max_tokens:
+        return page_context
+
+    model.pop("text", None)
+    if count_tokens(render()) > max_tokens:
+        for field in model.get("fields", []):
+            field.pop("options", None)
+    fields = model.get("fields", [])
+    if fields and count_tokens(render()) > max_tokens:
+        # 🔍 Binary search for the most leading fields that fit
+        low, high = 0, len(fields)
+        while low < high:
+            middle = (low + high + 1) // 2
+            model["fields"] = fields[:middle]
+            if count_tokens(render()) <= max_tokens:
+                low = middle
+            else:
+                high = middle - 1
+        model["fields"] = fields[:low]
+    if count_tokens(render()) > max_tokens:
+        log_event(f"⚠️ Buttons alone exceed the page budget ({max_tokens} tokens), sending them anyway.")
+    return render()
+
+
+def build_memory_context(memory_data: dict, memory_index=None, form_model=None) -> str:
+    """
+    Returns the candidate memory section for the prompt.
+
+    With a MemoryIndex and a form model, only entries matching the page's
+    field labels are included; otherwise the whole memory is sent.
+    """
+    if memory_index is None or form_model is None:
+        return str(memory_data)
+
+    memory_slice = memory_index.select(field_labels(form_model))
+    memory_context = json.dumps(memory_slice, ensure_ascii=False, separators=(",", ":"))
+    log_event(
+        f"🧠 Memory slice: {len(memory_slice)}/{len(memory_index.flat)} entries, "
+        f"{count_tokens(str(memory_data))} ➔ {count_tokens(memory_context)} tokens."
+    )
+    return memory_context
+
+
+def build_prompt(page_context: str, page_note: str, history_section: str, memory_context: str,
+                 summary_known: bool = False) -> str:
+    """Fills the Gemini prompt template with the page, history and memory sections."""
+    summary_task = (
+        "3. The job data is already known: leave out \"job_summary\"."
+        if summary_known else
+        "3. If visible, scrape key job data (Job Title, Company Name, Location, Salary, Skills, Summary)."
+    )
+    return f"""
 You are a strict agentic AI working for an Auto-Apply bot.
 
-# 📄 Current Page DOM:
+# 📄 Current Page DOM ({page_note}):
 -----
-{dom_html}
+{page_context}
 -----
-
+{history_section}
 # 📂 Candidate Memory (for filling forms):
 -----
-{memory_data}
+{memory_context}
 -----
 
 # 🎯 Your Task:
 1. Analyze the DOM carefully.
 2. Plan a step-by-step list of actions needed (click, type, select, dynamic_select, check, upload).
-3. If visible, scrape key job data (Job Title, Company Name, Location, Salary, Skills, Summary).
+{summary_task}
 
 # 📦 Output Requirements:
 - Return ONLY valid JSON.
@@ -61,7 +194,7 @@ You are a strict agentic AI working for an Auto-Apply bot.
     - "file_path" = "memory/Resume Shreyas.Katagi.pdf" (for uploads)
 
 # ⚡ Important Rules:
-- Prefer XPath selectors.
+- Prefer XPath selectors. When the page is given as a form model, use the "xpath" of each field or button as the selector.
 - Match labels and fields exactly from DOM.
 - If human verification (CAPTCHA, Email OTP) is detected ➔ mark status as "human_intervention_required" and give reason.
 
@@ -87,26 +220,249 @@ You are a strict agentic AI working for an Auto-Apply bot.
 Strictly output valid JSON. No extra text or explanations.
 """
 
-    try:
-        # 🔢 Count and log estimated tokens
+
+def call_gemini(prompt: str, token_estimate: int, session=None, on_action=None, tier: str = STRONG) -> tuple:
+    """
+    Sends one prompt to Gemini through the LLM scheduler and records its usage.
+
+    With on_action (and STREAM_RESPONSES), the response is streamed and each
+    action is handed over as soon as its JSON object is complete. Streaming
+    stops handing over actions at the first invalid one, so the streamed
+    actions are always a valid prefix of the plan. Rate limits, timeouts and
+    server errors are retried by the scheduler, unless actions were already
+    handed over (PartialResponseError). With the response cache enabled, a
+    recorded response is replayed without touching the scheduler or network.
+
+    Returns:
+        tuple: (response_text, streamed_actions)
+    """
+    streamed_actions = []
+    started = callback_seconds = 0.0
+
+    def attempt(model):
+        nonlocal started, callback_seconds
+        parser = IncrementalPlanParser()
+        streaming = bool(STREAM_RESPONSES and on_action)
+        callback_seconds = 0.0
+        started = time.perf_counter()
+        try:
+            if streaming:
+                response = model.generate_content(prompt, stream=True, request_options=REQUEST_OPTIONS)
+                for chunk in response:
+                    try:
+                        text = chunk.text
+                    except ValueError:
+                        continue  # Chunk without text parts (e.g. only a finish reason)
+                    for action in parser.feed(text):
+                        if not streaming:
+                            continue
+                        error = validate_action(action)
+                        if error:
+                            log_event(f"⚠️ Streamed action rejected ({error}), waiting for the full plan.")
+                            streaming = False
+                            continue
+                        if not streamed_actions:
+                            log_event(f"⚡ Time to first action: {time.perf_counter() - started:.2f}s")
+                        callback_started = time.perf_counter()
+                        on_action(action)
+                        callback_seconds += time.perf_counter() - callback_started
+                        streamed_actions.append(action)
+            else:
+                response = model.generate_content(prompt, request_options=REQUEST_OPTIONS)
+                parser.feed(response.text)
+        except Exception as e:
+            if streamed_actions:
+                raise PartialResponseError(streamed_actions, e) from e
+            raise
+        return response, parser
+
+    # 💽 Recorded response for this exact prompt and model (replay mode raises on a miss)
+    model_name = scheduler.model_name(tier)
+    cached = response_cache.get(model_name, prompt)
+    if cached:
+        response, parser = attempt(ReplayClient(cached))
+        usage = response.usage_metadata
+        if session:
+            session.add_usage(usage.prompt_token_count + usage.candidates_token_count)
+        log_event(f"💽 Gemini response replayed from cache ({model_name}).")
+        return parser.text.strip(), streamed_actions
+
+    response, parser = scheduler.submit(attempt, tier, token_estimate)
+
+    # ⏱️ Gemini time only (actions executed during the stream are timed by HandsTool)
+    latency = time.perf_counter() - started - callback_seconds
+    profiler.record("llm", started, latency)
+    response_text = parser.text.strip()
+
+    # 📒 Record usage (Gemini's own counts when available) in the run ledger
+    usage = getattr(response, "usage_metadata", None)
+    prompt_tokens = getattr(usage, "prompt_token_count", 0) or token_estimate
+    response_tokens = getattr(usage, "candidates_token_count", 0) or count_tokens(response_text)
+    ledger.record(session.link if session else None, prompt_tokens, response_tokens, latency)
+    response_cache.put(model_name, prompt, parser.text, prompt_tokens, response_tokens)
+    scheduler.record_usage(tier, token_estimate, prompt_tokens + response_tokens)
+    if session:
+        session.add_usage(prompt_tokens + response_tokens)
+    log_event(f"📒 Gemini call ({scheduler.resolve_tier(tier)} tier): {prompt_tokens} in / {response_tokens} out tokens in {latency:.2f}s.")
+
+    return response_text, streamed_actions
+
+
+def parse_plan(response_text: str) -> tuple:
+    """
+    Parses and validates a plan.
+
+    Returns:
+        tuple: (plan or None, list of problems)
+    """
+    with profiler.stage("parse"):
+        try:
+            plan = json.loads(strip_code_fences(response_text))
+        except ValueError as e:
+            return None, [f"response is not valid JSON ({str(e)}), it may be truncated"]
+        return plan, validate_plan(plan)
+
+
+def align_streamed(plan: dict, streamed_actions: list) -> dict:
+    """
+    Makes sure the plan starts with the actions already executed while streaming.
+
+    main runs actions[streamed:], so a repaired plan that reordered or edited
+    that prefix would skip actions or repeat them. If the prefix differs, the
+    executed actions are removed from the plan wherever they appear and put
+    back in front, leaving only new actions after them.
+    """
+    actions = plan.get("actions") or []
+    if not streamed_actions or actions[:len(streamed_actions)] == streamed_actions:
+        return plan
+
+    remaining = list(actions)
+    for action in streamed_actions:
+        if action in remaining:
+            remaining.remove(action)
+    log_event(
+        f"🩹 Repaired plan changed the {len(streamed_actions)} streamed action(s), "
+        f"keeping them and running {len(remaining)} new action(s) after them."
+    )
+    return {**plan, "actions": streamed_actions + remaining}
+
+
+def build_repair_prompt(response_text: str, errors: list, streamed: int) -> str:
+    """Asks Gemini to fix its own plan without resending the page."""
+    streamed_note = (
+        f"\nThe first {streamed} action(s) were already performed. Keep them unchanged at the start of \"actions\".\n"
+        if streamed else ""
+    )
+    problems = "\n".join(f"- {error}" for error in errors)
+    return f"""
+Your previous response for the Auto-Apply bot could not be used.
+
+# ❌ Problems:
+{problems}
+
+# 📄 Previous Response:
+-----
+{response_text}
+-----
+{streamed_note}
+# 📦 Output Requirements:
+- Return ONLY valid JSON with "status" ("action_required" OR "human_intervention_required"),
+  "actions" (list) and optional "job_summary" (object), and "reason" for human intervention.
+- Each action needs "type" (click, type, select, dynamic_select, check, upload) and "selector",
+  plus "text" for type, "option_text" for select/dynamic_select and "file_path" for upload.
+- If the response was cut off, complete it; drop an action only if it cannot be completed.
+
+Strictly output valid JSON. No extra text or explanations.
+"""
+
+
+def decide_next_actions(dom_html: str, memory_data: dict, session=None, memory_index=None, on_action=None,
+                        form_model: dict = None) -> dict:
+    """
+    Analyze the DOM and candidate memory to generate next actions for HandsTool.
+    
+    Args:
+        dom_html (str): Full HTML source of the current page.
+        memory_data (dict): Candidate FAQ and resume data.
+        session (LinkSession | None): Link state for incremental (delta) prompting.
+        memory_index (MemoryIndex | None): Index used to send only the relevant memory entries.
+        on_action (callable | None): Called with each valid action while the response streams.
+        form_model (dict | None): Already distilled page (distilled here if not given).
+
+    Returns:
+        dict: Action plan and job summary (if extracted). "streamed" is the number of
+        leading actions already passed to on_action.
+    """
+
+    log_event("🔎 Asking Gemini to analyze DOM and generate HandsTool actions...")
+
+    with profiler.stage("prompt_build"):
+        # 🧹 Strip the DOM down to what can be interacted with
+        page_context, page_note, form_model = build_page_context(dom_html, session, form_model)
+        memory_context = build_memory_context(memory_data, memory_index, form_model)
+
+        # 🧾 Short summary of what was already done on this link
+        history = session.history_summary() if session else ""
+        history_section = f"""
+# 🧾 Actions Already Performed On This Application:
+-----
+{history}
+-----
+""" if history else ""
+        if session and session.stall_note:
+            history_section += f"""
+# 🧱 No Progress:
+{session.stall_note}
+"""
+
+        # 📝 Prepare the full prompt for Gemini, trimming the page if it is over budget
+        #    (job data is not requested when pre-screening already read it from structured data)
+        summary_known = bool(session and session.summary_known)
+        prompt = build_prompt(page_context, page_note, history_section, memory_context, summary_known)
         token_estimate = count_tokens(prompt)
-        log_event(f"🧮 Approx tokens sent to Gemini: {token_estimate}")
+        if token_estimate > MAX_PROMPT_TOKENS:
+            page_budget = MAX_PROMPT_TOKENS - (token_estimate - count_tokens(page_context))
+            page_context = trim_page_context(page_context, page_note, page_budget)
+            prompt = build_prompt(page_context, page_note, history_section, memory_context, summary_known)
+            log_event(f"✂️ Prompt over budget ({token_estimate} > {MAX_PROMPT_TOKENS} tokens), page trimmed to {page_budget} tokens.")
+            token_estimate = count_tokens(prompt)
+
+    try:
+        # 🔢 Log tokens about to be sent
+        log_event(f"🧮 Tokens sent to Gemini: {token_estimate} ({tokenizer_name()} tokenizer)")
 
-        # 🚀 Generate response from Gemini
-        response = model.generate_content(prompt)
-        response_text = response.text.strip()
+        # 🚀 Generate response from Gemini (streamed actions are executed as they arrive);
+        #    simple pages go to the fast model tier, escalated steps always to the main one
+        tier = choose_tier(form_model, token_estimate, escalated=bool(session and session.stall_note))
+        response_text, streamed_actions = call_gemini(prompt, token_estimate, session, on_action, tier)
+        plan, errors = parse_plan(response_text)
 
-        # 🧹 Clean triple backticks if Gemini returns with them
-        if response_text.startswith("```"):
-            response_text = response_text.strip("`").replace("json", "", 1).strip()
-        response_text = response_text.replace("```", "").strip()
+        # 🩹 Targeted repair: send back only the broken response and what is wrong with it
+        for attempt in range(PLAN_REPAIR_RETRIES):
+            if not errors:
+                break
+            log_event(f"🩹 Invalid plan ({'; '.join(errors[:3])}), asking Gemini to repair it (attempt {attempt + 1}).")
+            repair_prompt = build_repair_prompt(response_text, errors, len(streamed_actions))
+            response_text, _ = call_gemini(repair_prompt, count_tokens(repair_prompt), session, tier=STRONG)
+            plan, errors = parse_plan(response_text)
 
-        # 🔍 Parse JSON response into dict
-        plan = json.loads(response_text)
+        if errors:
+            log_event(f"⚠️ Failed to generate decision plan: {'; '.join(errors[:3])}")
+            if streamed_actions:
+                # ✅ Keep what was already executed so the next step re-plans from the live page
+                return {"status": "action_required", "actions": streamed_actions, "streamed": len(streamed_actions)}
+            return {}
+
+        plan = align_streamed(plan, streamed_actions)
+        plan["streamed"] = len(streamed_actions)
         log_event(f"✅ Gemini returned structured decision plan.")
 
         return plan
 
+    except PartialResponseError as e:
+        log_event(f"⚠️ Gemini response broke off: {str(e)}")
+        return {"status": "action_required", "actions": e.actions, "streamed": len(e.actions)}
+
     except Exception as e:
         log_event(f"⚠️ Failed to generate decision plan: {str(e)}")
         return {}
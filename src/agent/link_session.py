@@ -0,0 +1,48 @@
+# src/agent/link_session.py
+
+
+class LinkSession:
+    """
+    Per-link state carried between the steps of a multi-page application.
+
+    Holds the form model Gemini last saw and the actions already performed,
+    so later steps can be prompted with only what changed.
+    """
+
+    # ✂️ Only the most recent actions are summarized in prompts
+    MAX_HISTORY = 30
+
+    def __init__(self, link: str):
+        self.link = link
+        self.previous_model = None
+        self.actions_taken = []
+        self.tokens_used = 0
+        self.stall_note = ""
+        self.summary_known = False  # Job summary already read from structured data, Gemini need not extract it
+        self.load_outcome = None  # Outcome observer flags right after the job page loaded (see accept_outcome)
+        self.prefilled = set()  # XPaths filled from memory by the field mapper on the current step
+
+    def observe(self, form_model: dict):
+        """Remembers the form model of the page the latest plan was made for."""
+        self.previous_model = form_model
+
+    def record_actions(self, actions: list):
+        """Adds performed actions to the link history."""
+        self.actions_taken.extend(actions)
+
+    def escalate(self, note: str):
+        """Marks the next plan as escalated: full page instead of a delta, plus a note for Gemini."""
+        self.stall_note = note
+
+    def add_usage(self, tokens: int):
+        """Adds prompt + response tokens spent on this link."""
+        self.tokens_used += tokens
+
+    def history_summary(self) -> str:
+        """One line per recent action, e.g. 'type //input[@id='email'] = a@b.com'."""
+        lines = []
+        for action in self.actions_taken[-self.MAX_HISTORY:]:
+            value = action.get("text") or action.get("option_text") or action.get("file_path") or ""
+            line = f"{action.get('type')} {action.get('selector')}"
+            lines.append(f"{line} = {value}" if value else line)
+        return "\n".join(lines)
@@ -0,0 +1,158 @@
+# src/agent/link_state.py
+
+# 📦 Import libraries
+import hashlib
+import time
+
+# 🛠️ Project imports
+from config.settings import MAX_STEPS_PER_LINK, MAX_SECONDS_PER_LINK, MAX_TOKENS_PER_LINK, STALL_LIMIT
+from src.tools.dom_distiller import render_form_model
+from src.tools.logger_tool import log_event
+
+# 🔀 Link states
+LOADING = "loading"
+PLANNING = "planning"
+ACTING = "acting"
+SUCCESS = "success"
+HUMAN = "human_intervention"
+FAILED = "failed"
+
+# 🧾 Status recorded by the scribe for each final state
+FINAL_STATUSES = {SUCCESS: "Success", HUMAN: "Human Intervention", FAILED: "Failed"}
+
+# 📈 Progress verdicts of check_progress
+PROGRESS = "progress"
+ESCALATE = "escalate"
+ABORT = "abort"
+
+
+# ✍️ Live state of every form control: page_source never contains what was typed, selected or checked
+FORM_STATE_SCRIPT = """
+var out = [];
+document.querySelectorAll('input, select, textarea').forEach(function (el) {
+    if (el.type === 'hidden') return;
+    out.push(el.type === 'checkbox' || el.type === 'radio' ? (el.checked ? '1' : '0') : el.value);
+});
+return out.join('\u0001');
+"""
+
+
+def live_form_state(driver) -> str:
+    """Values and checked flags of the page's form controls, read with one script call ("" on failure)."""
+    try:
+        return driver.execute_script(FORM_STATE_SCRIPT) or ""
+    except Exception:
+        return ""
+
+
+def page_hash(form_model: dict, form_state: str = "") -> str:
+    """
+    Hash of everything the agent can see on a page: fields, buttons and text from
+    the distilled HTML, plus the live control values (see live_form_state), so a
+    step that only fills fields counts as progress.
+    """
+    digest = hashlib.sha1(render_form_model(form_model).encode("utf-8"))
+    digest.update(form_state.encode("utf-8"))
+    return digest.hexdigest()
+
+
+class LinkStateMachine:
+    """
+    Lifecycle of one job link: loading ➔ (planning ➔ acting)* ➔ success / human_intervention / failed.
+
+    Each step must fit the link's budgets (steps, wall time, tokens). The page
+    hash is compared between steps: after `stall_limit` steps without any
+    change the next plan is escalated (full page, no cached plan, a note that
+    the last actions did nothing); if the page still does not change the
+    link is aborted.
+    """
+
+    def __init__(self, session, max_steps: int = MAX_STEPS_PER_LINK, max_seconds: float = MAX_SECONDS_PER_LINK,
+                 max_tokens: int = MAX_TOKENS_PER_LINK, stall_limit: int = STALL_LIMIT):
+        self.session = session
+        self.max_steps = max_steps
+        self.max_seconds = max_seconds
+        self.max_tokens = max_tokens
+        self.stall_limit = stall_limit
+        self.state = LOADING
+        self.reason = ""
+        self.steps = 0
+        self.started = time.monotonic()
+        self.last_hash = None
+        self.unchanged = 0
+
+    def transition(self, state: str, reason: str = ""):
+        """Moves to a new state and logs the transition."""
+        if state == self.state:
+            return
+        log_event(f"🔀 {self.state} ➔ {state}{f' ({reason})' if reason else ''}", level="DEBUG")
+        self.state = state
+
+    def budget_exceeded(self) -> str:
+        """
+        Returns:
+            str | None: Which budget is used up, or None if the link may take another step.
+        """
+        if self.steps >= self.max_steps:
+            return f"step budget exhausted ({self.max_steps} steps)"
+        elapsed = time.monotonic() - self.started
+        if elapsed >= self.max_seconds:
+            return f"time budget exhausted ({elapsed:.0f}s > {self.max_seconds}s)"
+        if self.session.tokens_used >= self.max_tokens:
+            return f"token budget exhausted ({self.session.tokens_used} > {self.max_tokens} tokens)"
+        return None
+
+    def next_step(self) -> bool:
+        """
+        Starts the next planning step.
+
+        Returns:
+            bool: False if a budget is exhausted (the link is then failed).
+        """
+        reason = self.budget_exceeded()
+        if reason:
+            self.finish(FAILED, reason)
+            return False
+        self.steps += 1
+        self.transition(PLANNING)
+        return True
+
+    def check_progress(self, current_hash: str) -> str:
+        """
+        Compares the page with the one seen at the previous step.
+
+        Returns:
+            str: PROGRESS, ESCALATE (stalled for stall_limit steps) or ABORT (still stalled after escalating).
+        """
+        if current_hash != self.last_hash:
+            self.last_hash = current_hash
+            self.unchanged = 0
+            return PROGRESS
+
+        self.unchanged += 1
+        if self.unchanged > self.stall_limit:
+            return ABORT
+        if self.unchanged == self.stall_limit:
+            log_event(f"🧱 Page unchanged after {self.unchanged} step(s), escalating the next plan.")
+            return ESCALATE
+        return PROGRESS
+
+    def finish(self, state: str, reason: str = "", job_summary: dict = None) -> tuple:
+        """
+        Enters a final state.
+
+        Returns:
+            tuple: (status, job_summary, reason) for the scribe.
+        """
+        self.transition(state, reason)
+        self.reason = reason
+        log_event(
+            f"🏁 Link finished: {FINAL_STATUSES[state]} after {self.steps} step(s), "
+            f"{time.monotonic() - self.started:.1f}s, {self.session.tokens_used} tokens"
+            f"{f' ({reason})' if reason else ''}."
+        )
+        return FINAL_STATUSES[state], job_summary or {}, reason
+
+    def result(self, job_summary: dict = None) -> tuple:
+        """(status, job_summary, reason) of the final state reached."""
+        return FINAL_STATUSES.get(self.state, "Failed"), job_summary or {}, self.reason
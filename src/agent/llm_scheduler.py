@@ -0,0 +1,258 @@
+# src/agent/llm_scheduler.py
+
+# 📦 Import libraries
+import random
+import threading
+import time
+
+# 🛠️ Project imports
+from config.settings import GOOGLE_API_KEY, LLM_MODEL, LLM_FAST_MODEL, LLM_RPM, LLM_TPM, LLM_FAST_RPM, LLM_FAST_TPM
+from config.settings import LLM_MAX_RETRIES, LLM_BACKOFF_BASE, LLM_BACKOFF_MAX, FAST_TIER_MAX_FIELDS, FAST_TIER_MAX_TOKENS
+from src.tools.logger_tool import log_event
+from src.tools.profiler import profiler
+
+# 🎚️ Model tiers: a cheaper, faster model for simple pages and the main model for everything else
+FAST = "fast"
+STRONG = "strong"
+
+# 🔁 Transient failures worth retrying (google.api_core exception names and HTTP codes)
+RETRYABLE_ERRORS = {
+    "ResourceExhausted", "TooManyRequests", "ServiceUnavailable", "DeadlineExceeded",
+    "InternalServerError", "GatewayTimeout", "BadGateway", "Aborted",
+}
+RETRYABLE_CODES = {408, 429, 500, 502, 503, 504}
+RATE_LIMIT_ERRORS = {"ResourceExhausted", "TooManyRequests"}
+
+
+class PartialResponseError(Exception):
+    """A streamed response failed after some actions were already executed, so it must not be retried."""
+
+    def __init__(self, actions: list, error: Exception):
+        super().__init__(f"{type(error).__name__} after {len(actions)} streamed action(s): {error}")
+        self.actions = actions
+
+
+def is_retryable(error: Exception) -> bool:
+    """True for rate limits, timeouts and server-side errors."""
+    if isinstance(error, PartialResponseError):
+        return False
+    if isinstance(error, (TimeoutError, ConnectionError)):
+        return True
+    if type(error).__name__ in RETRYABLE_ERRORS:
+        return True
+    code = getattr(error, "code", None)
+    return isinstance(code, int) and code in RETRYABLE_CODES
+
+
+def is_rate_limited(error: Exception) -> bool:
+    """True if the API rejected the call for exceeding a quota (HTTP 429)."""
+    return type(error).__name__ in RATE_LIMIT_ERRORS or getattr(error, "code", None) == 429
+
+
+def gemini_client(model_name: str):
+    """Default client factory: imports the Gemini SDK on first use and returns a GenerativeModel."""
+    import google.generativeai as genai  # Gemini SDK # type: ignore
+    genai.configure(api_key=GOOGLE_API_KEY)
+    return genai.GenerativeModel(model_name)
+
+
+class TokenBucket:
+    """
+    Thread-safe budget refilled evenly over a minute, holding at most one minute's worth.
+
+    Callers reserve capacity up front and may drive the bucket into debt; the
+    returned wait is how long until their share has refilled. Reservations are
+    served in the order they were made, so concurrent callers queue fairly.
+    A limit of 0 means unlimited.
+    """
+
+    def __init__(self, per_minute: float, clock=time.monotonic):
+        self.capacity = float(per_minute)
+        self.rate = self.capacity / 60.0
+        self.level = self.capacity
+        self.clock = clock
+        self.updated = clock()
+        self.lock = threading.Lock()
+
+    def _refill(self):
+        now = self.clock()
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self, amount: float) -> float:
+        """
+        Takes `amount` from the bucket.
+
+        Returns:
+            float: Seconds to wait before using the reservation (0 if available now).
+        """
+        if self.capacity <= 0:
+            return 0.0
+        with self.lock:
+            self._refill()
+            self.level -= min(amount, self.capacity)
+            return 0.0 if self.level >= 0 else -self.level / self.rate
+
+    def adjust(self, amount: float):
+        """Charges (or refunds, if negative) the difference between a reservation and actual usage."""
+        if self.capacity <= 0:
+            return
+        with self.lock:
+            self._refill()
+            self.level = min(self.capacity, self.level - amount)
+
+    def drain(self):
+        """Empties the bucket (the API said the quota is used up, whatever our estimate was)."""
+        if self.capacity <= 0:
+            return
+        with self.lock:
+            self._refill()
+            self.level = min(self.level, 0.0)
+
+
+def choose_tier(form_model: dict, prompt_tokens: int, escalated: bool = False) -> str:
+    """
+    Picks the model tier for a page.
+
+    A page is simple (FAST) when it was distilled and has at most
+    FAST_TIER_MAX_FIELDS fields in a prompt of at most FAST_TIER_MAX_TOKENS,
+    e.g. a lone "Apply" button or a short contact form. Raw DOM, longer
+    forms and escalated steps (no progress on the page) go to STRONG.
+    """
+    if escalated or form_model is None:
+        return STRONG
+    if len(form_model.get("fields", [])) <= FAST_TIER_MAX_FIELDS and prompt_tokens <= FAST_TIER_MAX_TOKENS:
+        return FAST
+    return STRONG
+
+
+class LLMScheduler:
+    """
+    Single gate for LLM calls across all workers.
+
+    Each tier has a requests-per-minute and a tokens-per-minute bucket; a call
+    reserves its estimated tokens once and one request per attempt, and sleeps
+    until both are available. A call that fails for good gives its tokens
+    back. Transient failures (429, timeouts, 5xx) are retried with jittered
+    exponential backoff, and a 429 drains the tier's buckets so every caller
+    slows down. Clients come from `client_factory(model_name)`, anything
+    with Gemini's `generate_content`, so a local fake client can stand in.
+    """
+
+    def __init__(self, client_factory=gemini_client, tiers: dict = None, max_retries: int = LLM_MAX_RETRIES,
+                 backoff_base: float = LLM_BACKOFF_BASE, backoff_max: float = LLM_BACKOFF_MAX,
+                 sleep=time.sleep, clock=time.monotonic):
+        """
+        Args:
+            client_factory (callable): Returns a client for a model name.
+            tiers (dict): {tier: {"model", "rpm", "tpm"}} (default: from settings; no fast model = one tier).
+            max_retries (int): Retries per call after the first attempt.
+            backoff_base (float): Delay of the first retry in seconds, doubled on each further retry.
+            backoff_max (float): Upper bound of a retry delay in seconds.
+            sleep (callable): Used for all waits (injectable for tests).
+            clock (callable): Monotonic clock of the buckets.
+        """
+        self.client_factory = client_factory
+        self.tiers = tiers or {
+            STRONG: {"model": LLM_MODEL, "rpm": LLM_RPM, "tpm": LLM_TPM},
+            FAST: {"model": LLM_FAST_MODEL, "rpm": LLM_FAST_RPM, "tpm": LLM_FAST_TPM},
+        }
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.sleep = sleep
+        self.requests = {tier: TokenBucket(cfg["rpm"], clock) for tier, cfg in self.tiers.items()}
+        self.tokens = {tier: TokenBucket(cfg["tpm"], clock) for tier, cfg in self.tiers.items()}
+        self.clients = {}
+        self.lock = threading.Lock()
+        self.counts = {"calls": 0, "retries": 0, "failures": 0, "waited_seconds": 0.0}
+        self.tier_calls = {tier: 0 for tier in self.tiers}
+
+    def resolve_tier(self, tier: str) -> str:
+        """Falls back to STRONG for unknown tiers or a tier without a model."""
+        return tier if self.tiers.get(tier, {}).get("model") else STRONG
+
+    def model_name(self, tier: str) -> str:
+        """Model that serves a tier."""
+        return self.tiers[self.resolve_tier(tier)]["model"]
+
+    def client(self, tier: str):
+        """Client for a tier, created on first use."""
+        with self.lock:
+            if tier not in self.clients:
+                started = time.perf_counter()
+                self.clients[tier] = self.client_factory(self.tiers[tier]["model"])
+                log_event(f"🧠 {self.tiers[tier]['model']} client ready in {time.perf_counter() - started:.2f}s.")
+            return self.clients[tier]
+
+    def backoff(self, attempt: int) -> float:
+        """Delay before retry `attempt` (0-based): half fixed, half random, doubling up to backoff_max."""
+        delay = min(self.backoff_max, self.backoff_base * 2 ** attempt)
+        return delay / 2 + random.uniform(0, delay / 2)
+
+    def acquire(self, tier: str, tokens: int):
+        """Blocks until the tier has room for one more request of `tokens` tokens."""
+        wait = max(self.requests[tier].reserve(1), self.tokens[tier].reserve(tokens))
+        if wait > 0:
+            log_event(f"🚦 LLM rate limit ({tier} tier): waiting {wait:.1f}s.")
+            started = time.perf_counter()
+            self.sleep(wait)
+            profiler.record("llm_wait", started, wait)
+            with self.lock:
+                self.counts["waited_seconds"] += wait
+
+    def submit(self, call, tier: str = STRONG, tokens: int = 0):
+        """
+        Runs call(client) within the tier's rate limits, retrying transient failures.
+
+        Args:
+            call (callable): Receives the tier's client and performs the request.
+            tier (str): FAST or STRONG.
+            tokens (int): Estimated tokens of the request (prompt plus expected output).
+
+        Returns:
+            Whatever call returns.
+
+        Raises:
+            The last error if it is not retryable or the retries are used up.
+        """
+        tier = self.resolve_tier(tier)
+        for attempt in range(self.max_retries + 1):
+            # 🎟️ Tokens are reserved by the first attempt only; record_usage settles them once
+            self.acquire(tier, tokens if attempt == 0 else 0)
+            with self.lock:
+                self.counts["calls"] += 1
+                self.tier_calls[tier] += 1
+            try:
+                return call(self.client(tier))
+            except Exception as e:
+                if not is_retryable(e) or attempt >= self.max_retries:
+                    with self.lock:
+                        self.counts["failures"] += 1
+                    if not isinstance(e, PartialResponseError):
+                        self.tokens[tier].adjust(-tokens)  # Nothing was generated, give the reservation back
+                    raise
+                if is_rate_limited(e):
+                    self.requests[tier].drain()
+                    self.tokens[tier].drain()
+                delay = self.backoff(attempt)
+                with self.lock:
+                    self.counts["retries"] += 1
+                log_event(
+                    f"🔁 {type(e).__name__} from the {tier} model, retrying in {delay:.1f}s "
+                    f"({attempt + 1}/{self.max_retries}).", level="WARNING"
+                )
+                self.sleep(delay)
+
+    def record_usage(self, tier: str, estimated: int, actual: int):
+        """Corrects the token bucket once the real usage of a call is known."""
+        self.tokens[self.resolve_tier(tier)].adjust(actual - estimated)
+
+    def stats(self) -> dict:
+        """Calls, retries, failures and rate-limit waits so far, plus calls per tier."""
+        with self.lock:
+            return {**self.counts, "waited_seconds": round(self.counts["waited_seconds"], 2), "tiers": dict(self.tier_calls)}
+
+
+# 🚦 Scheduler shared by the whole run
+scheduler = LLMScheduler()
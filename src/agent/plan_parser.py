@@ -0,0 +1,147 @@
+# src/agent/plan_parser.py
+
+# 📦 Import libraries
+import json
+import re
+
+# 📐 Plan schema (mirrors the output requirements in the Gemini prompt)
+STATUSES = {"action_required", "human_intervention_required"}
+ACTION_FIELDS = {
+    "click": [],
+    "type": ["text"],
+    "select": ["option_text"],
+    "dynamic_select": ["option_text"],
+    "check": [],
+    "upload": ["file_path"],
+}
+
+ACTIONS_KEY = re.compile(r'"actions"\s*:\s*\[')
+CODE_FENCE = re.compile(r"^\s*```[a-zA-Z]*\s*|\s*```\s*$")
+
+
+def strip_code_fences(text: str) -> str:
+    """Removes a ```json ... ``` wrapper around a response."""
+    return CODE_FENCE.sub("", text.strip()).strip()
+
+
+def validate_action(action) -> str:
+    """
+    Checks one action against the schema.
+
+    Returns:
+        str | None: What is wrong with the action, or None if it is valid.
+    """
+    if not isinstance(action, dict):
+        return f"action is not an object: {action!r}"
+    action_type = action.get("type")
+    if action_type not in ACTION_FIELDS:
+        return f"unknown action type {action_type!r}"
+    if not isinstance(action.get("selector"), str) or not action["selector"].strip():
+        return f"{action_type} action without a selector"
+    for field in ACTION_FIELDS[action_type]:
+        if not isinstance(action.get(field), str) or not action[field]:
+            return f"{action_type} action on {action['selector']} is missing \"{field}\""
+    return None
+
+
+def validate_plan(plan) -> list:
+    """
+    Checks a parsed plan against the schema.
+
+    Returns:
+        list: Problems found (empty if the plan is valid).
+    """
+    if not isinstance(plan, dict):
+        return ["response is not a JSON object"]
+
+    errors = []
+    status = plan.get("status")
+    if status not in STATUSES:
+        errors.append(f"\"status\" must be one of {sorted(STATUSES)}, got {status!r}")
+    if status == "action_required":
+        actions = plan.get("actions")
+        if not isinstance(actions, list) or not actions:
+            errors.append("\"actions\" must be a non-empty list when status is action_required")
+        else:
+            for index, action in enumerate(actions):
+                error = validate_action(action)
+                if error:
+                    errors.append(f"actions[{index}]: {error}")
+    if "job_summary" in plan and not isinstance(plan["job_summary"], dict):
+        errors.append("\"job_summary\" must be an object")
+    return errors
+
+
+class IncrementalPlanParser:
+    """
+    Pulls complete action objects out of a plan while it is still streaming.
+
+    Text is fed chunk by chunk. Once the "actions" array starts, each object
+    in it is emitted as soon as its closing brace arrives (string contents
+    and escapes are tracked so braces inside values do not count).
+    """
+
+    def __init__(self):
+        self.text = ""
+        self.position = None  # Scan position inside the actions array, once found
+        self.depth = 0
+        self.in_string = False
+        self.escaped = False
+        self.object_start = None
+        self.done = False
+
+    def feed(self, chunk: str) -> list:
+        """
+        Adds a chunk of streamed text.
+
+        Returns:
+            list: Action dicts completed by this chunk (None for an object that is not valid JSON).
+        """
+        self.text += chunk
+        if self.done:
+            return []
+        if self.position is None:
+            match = ACTIONS_KEY.search(self.text)
+            if not match:
+                return []
+            self.position = match.end()
+
+        completed = []
+        while self.position < len(self.text):
+            char = self.text[self.position]
+            if self.in_string:
+                if self.escaped:
+                    self.escaped = False
+                elif char == "\\":
+                    self.escaped = True
+                elif char == '"':
+                    self.in_string = False
+            elif char == '"':
+                self.in_string = True
+            elif char == "{":
+                if self.depth == 0:
+                    self.object_start = self.position
+                self.depth += 1
+            elif char == "}":
+                self.depth -= 1
+                if self.depth == 0 and self.object_start is not None:
+                    try:
+                        completed.append(json.loads(self.text[self.object_start:self.position + 1]))
+                    except ValueError:
+                        completed.append(None)  # Keeps positions aligned; rejected by validate_action
+                    self.object_start = None
+            elif char == "]" and self.depth == 0:
+                self.done = True
+                self.position += 1
+                break
+            self.position += 1
+        return completed
+
+    def finish(self) -> dict:
+        """
+        Parses the complete response.
+
+        Raises:
+            ValueError: If the response is not valid JSON (e.g. truncated).
+        """
+        return json.loads(strip_code_fences(self.text))
@@ -0,0 +1,199 @@
+# src/agent/prefetcher.py
+
+# 📦 Import libraries
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+
+# 🛠️ Project imports
+from config.settings import PREFETCH_TTL
+from src.agent.decision_maker import decide_next_actions
+from src.agent.link_session import LinkSession
+from src.browser.driver_setup import get_driver
+from src.browser.resource_blocker import log_network_stats
+from src.browser.waits import wait_for_page_settled
+from src.tools.dom_distiller import distill_dom, page_fingerprint
+from src.tools.logger_tool import log_event, log_context
+
+
+class Prefetcher:
+    """
+    Loads upcoming job links in a secondary browser and plans their first step in the background.
+
+    Page loads are serialized on one prefetch browser; Gemini calls run on a
+    small thread pool. At most `depth` links ahead of the current one are in flight.
+    The plan is made the way process_link would make it: with the pre-screen
+    summary flag, the field mapper's answers, and a LinkSession whose token
+    usage is charged to the link when it is taken.
+    """
+
+    def __init__(self, memory_data: dict, depth: int = 1, ttl: float = PREFETCH_TTL, memory_index=None,
+                 prescreener=None, field_mapper=None):
+        self.memory_data = memory_data
+        self.memory_index = memory_index
+        self.prescreener = prescreener
+        self.field_mapper = field_mapper
+        self.depth = max(1, depth)
+        self.ttl = ttl
+        self.driver = None
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.browser_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="prefetch-browser")
+        self.llm_pool = ThreadPoolExecutor(max_workers=self.depth, thread_name_prefix="prefetch-llm")
+        self.used = 0
+        self.discarded = 0
+
+    def iterate(self, indexed_links):
+        """
+        Yields (index, link) pairs while keeping the next `depth` links prefetched.
+
+        Args:
+            indexed_links: Iterable of (index, link) pairs.
+        """
+        source = iter(indexed_links)
+        lookahead = deque()
+        while True:
+            while len(lookahead) <= self.depth:
+                item = next(source, None)
+                if item is None:
+                    break
+                lookahead.append(item)
+            if not lookahead:
+                return
+
+            index, link = lookahead.popleft()
+            for _, next_link in lookahead:
+                self.schedule(next_link)
+            yield index, link
+            self.discard(link)
+
+    def schedule(self, link: str):
+        """Starts prefetching a link unless it is already queued or the queue is full."""
+        with self.lock:
+            if link in self.entries or len(self.entries) > self.depth:
+                return
+            job_summary, summary_known = self.prescreener.peek(link) if self.prescreener else ({}, False)
+            session = LinkSession(link)
+            session.summary_known = summary_known
+            cancelled = threading.Event()
+            self.entries[link] = {
+                "created": time.time(),
+                "session": session,
+                "cancelled": cancelled,
+                "capture": self.browser_pool.submit(self._capture, link, session, bool(job_summary), cancelled),
+            }
+        log_event(f"🔮 Prefetching next job page: {link}")
+
+    def _capture(self, link: str, session: LinkSession, has_summary: bool, cancelled: threading.Event):
+        """Runs on the prefetch browser thread: loads the page and starts planning."""
+        with log_context(link=link, stage="prefetch"):
+            if self.driver is None:
+                self.driver = get_driver()
+            self.driver.get(link)
+            wait_for_page_settled(self.driver)
+            dom_html = self.driver.page_source
+            log_network_stats(self.driver)
+            form_model = distill_dom(dom_html)
+            fingerprint = page_fingerprint(form_model)
+        plan_future = self.llm_pool.submit(self._plan, link, dom_html, form_model, session, has_summary, cancelled)
+        return fingerprint, plan_future
+
+    def _plan(self, link: str, dom_html: str, form_model: dict, session: LinkSession, has_summary: bool,
+              cancelled: threading.Event):
+        """
+        Runs on the LLM pool: first-step plan for a prefetched page.
+
+        Fields the field mapper can answer lead the plan and are hidden from
+        Gemini, as in process_link; a fully mapped page needs no Gemini call.
+        Returns None without calling Gemini if the prefetch was discarded meanwhile.
+        """
+        with log_context(link=link, stage="prefetch"):
+            mapped_actions = []
+            if self.field_mapper:
+                mapping = self.field_mapper.map(form_model, allow_submit=session.summary_known or has_summary)
+                if mapping["complete"]:
+                    return {"status": "action_required", "actions": mapping["actions"]}
+                mapped_actions = mapping["actions"]
+                session.prefilled = {action["selector"] for action in mapped_actions}
+                session.record_actions(mapped_actions)
+
+            if cancelled.is_set():
+                return None
+            plan = decide_next_actions(dom_html, self.memory_data, session, self.memory_index, form_model=form_model)
+            if plan and mapped_actions:
+                plan = {**plan, "actions": mapped_actions + plan.get("actions", [])}
+            return plan
+
+    def take(self, link: str, fingerprint, session: LinkSession = None):
+        """
+        Returns the prefetched first-step plan for a link if it is still valid.
+
+        The plan is discarded when it is older than the TTL, when its page was
+        not captured yet, or when the live page no longer has the same form
+        structure as the prefetched one. Tokens the prefetch spent are added
+        to the link's session either way, so they count toward its budget.
+
+        Args:
+            link (str): Job link being processed.
+            fingerprint (str | None): Fingerprint of the live page.
+            session (LinkSession | None): The link's session.
+
+        Returns:
+            dict | None: Gemini plan, or None if there is no usable prefetch.
+        """
+        with self.lock:
+            entry = self.entries.pop(link, None)
+        if entry is None:
+            return None
+        try:
+            return self._take(link, entry, fingerprint)
+        finally:
+            if session is not None:
+                session.add_usage(entry["session"].tokens_used)
+
+    def _take(self, link: str, entry: dict, fingerprint):
+        """Validity checks of take() for a popped entry."""
+        if time.time() - entry["created"] > self.ttl:
+            return self._drop(link, entry, "expired")
+        if not entry["capture"].done():
+            return self._drop(link, entry, "page not captured yet")
+
+        try:
+            captured_fingerprint, plan_future = entry["capture"].result()
+        except Exception as e:
+            return self._drop(link, entry, f"capture failed: {str(e)}")
+        if captured_fingerprint != fingerprint:
+            plan_future.cancel()
+            return self._drop(link, entry, "page changed since prefetch")
+
+        plan = plan_future.result()
+        if not plan:
+            return self._drop(link, entry, "empty plan")
+
+        self.used += 1
+        log_event(f"🔮 Using prefetched plan for {link}.")
+        return plan
+
+    def discard(self, link: str):
+        """Drops a prefetch that was never taken (e.g. a cached plan was used instead)."""
+        with self.lock:
+            entry = self.entries.pop(link, None)
+        if entry is not None:
+            self._drop(link, entry, "not used")
+
+    def _drop(self, link: str, entry: dict, reason: str):
+        """Cancels a prefetch entry (a running capture stops before its Gemini call) and counts it as discarded."""
+        entry["cancelled"].set()
+        entry["capture"].cancel()
+        self.discarded += 1
+        log_event(f"🗑️ Discarded prefetched plan for {link}: {reason}.")
+        return None
+
+    def close(self):
+        """Stops background work and closes the prefetch browser."""
+        self.llm_pool.shutdown(wait=False, cancel_futures=True)
+        self.browser_pool.shutdown(wait=True, cancel_futures=True)
+        if self.driver is not None:
+            self.driver.quit()
+        log_event(f"🔮 Prefetch stats: {self.used} used, {self.discarded} discarded.")
@@ -0,0 +1,439 @@
+# src/agent/prescreen.py
+
+# 📦 Import libraries
+import html
+import json
+import re
+import threading
+import urllib.request
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from html.parser import HTMLParser
+
+# 🛠️ Project imports
+from config.settings import PRESCREEN_FILTERS, PRESCREEN_WORKERS, PRESCREEN_TIMEOUT, PRESCREEN_ALLOW_REMOTE
+from config.settings import PRESCREEN_MIN_SALARY
+from src.tools.logger_tool import log_event, log_context
+from src.tools.profiler import profiler
+
+# 🌐 Plain HTTP fetch: browser-like headers and a cap on how much of the page is read
+FETCH_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0 Safari/537.36",
+    "Accept": "text/html,application/xhtml+xml",
+    "Accept-Language": "en-US,en;q=0.9",
+}
+MAX_FETCH_BYTES = 2_000_000
+
+# 📅 Salary units ➔ yearly multiplier
+SALARY_UNITS = {"HOUR": 2080, "DAY": 260, "WEEK": 52, "MONTH": 12, "YEAR": 1}
+CURRENCY_SYMBOLS = {"$": "USD", "€": "EUR", "£": "GBP", "₹": "INR"}
+
+# 🗺️ US state abbreviations, so "Santa Clara, CA" matches a preferred "California"
+US_STATES = {
+    "Alabama": "AL", "Alaska": "AK", "Arizona": "AZ", "Arkansas": "AR", "California": "CA", "Colorado": "CO",
+    "Connecticut": "CT", "Delaware": "DE", "Florida": "FL", "Georgia": "GA", "Hawaii": "HI", "Idaho": "ID",
+    "Illinois": "IL", "Indiana": "IN", "Iowa": "IA", "Kansas": "KS", "Kentucky": "KY", "Louisiana": "LA",
+    "Maine": "ME", "Maryland": "MD", "Massachusetts": "MA", "Michigan": "MI", "Minnesota": "MN",
+    "Mississippi": "MS", "Missouri": "MO", "Montana": "MT", "Nebraska": "NE", "Nevada": "NV",
+    "New Hampshire": "NH", "New Jersey": "NJ", "New Mexico": "NM", "New York": "NY", "North Carolina": "NC",
+    "North Dakota": "ND", "Ohio": "OH", "Oklahoma": "OK", "Oregon": "OR", "Pennsylvania": "PA",
+    "Rhode Island": "RI", "South Carolina": "SC", "South Dakota": "SD", "Tennessee": "TN", "Texas": "TX",
+    "Utah": "UT", "Vermont": "VT", "Virginia": "VA", "Washington": "WA", "West Virginia": "WV",
+    "Wisconsin": "WI", "Wyoming": "WY", "District of Columbia": "DC",
+}
+
+# 🌎 A location that is only one of these names (or a 2-3 letter code) is a country, not a place
+COUNTRY_NAMES = {"united states", "united states of america", "usa", "us", "u.s.", "canada", "united kingdom", "india"}
+
+# ✂️ Length of the job description kept as "Summary"
+MAX_SUMMARY_CHARS = 300
+
+
+class _StructuredDataParser(HTMLParser):
+    """Collects JSON-LD scripts, meta tags and the page title."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.json_ld = []
+        self.meta = {}
+        self.title = ""
+        self._capture = None
+        self._buffer = []
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == "script" and (attrs.get("type") or "").lower() == "application/ld+json":
+            self._capture, self._buffer = "json_ld", []
+        elif tag == "title" and not self.title:
+            self._capture, self._buffer = "title", []
+        elif tag == "meta":
+            key = (attrs.get("property") or attrs.get("name") or "").lower()
+            if key and attrs.get("content") and key not in self.meta:
+                self.meta[key] = attrs["content"].strip()
+
+    def handle_endtag(self, tag):
+        if self._capture == "json_ld" and tag == "script":
+            self.json_ld.append("".join(self._buffer))
+            self._capture = None
+        elif self._capture == "title" and tag == "title":
+            self.title = " ".join("".join(self._buffer).split())
+            self._capture = None
+
+    def handle_data(self, data):
+        if self._capture:
+            self._buffer.append(data)
+
+
+def fetch_html(url: str, timeout: float = PRESCREEN_TIMEOUT) -> str:
+    """Downloads a page without a browser (at most MAX_FETCH_BYTES)."""
+    request = urllib.request.Request(url, headers=FETCH_HEADERS)
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        charset = response.headers.get_content_charset() or "utf-8"
+        return response.read(MAX_FETCH_BYTES).decode(charset, errors="replace")
+
+
+def _find_job_postings(data) -> list:
+    """JobPosting objects anywhere in parsed JSON-LD (lists and @graph included)."""
+    if isinstance(data, list):
+        return [posting for item in data for posting in _find_job_postings(item)]
+    if not isinstance(data, dict):
+        return []
+    types = data.get("@type")
+    types = types if isinstance(types, list) else [types]
+    if "JobPosting" in types:
+        return [data]
+    return _find_job_postings(data.get("@graph", []))
+
+
+def extract_structured_data(page_html: str) -> dict:
+    """
+    Reads the machine-readable job data of a page.
+
+    Returns:
+        dict: {"postings": [JobPosting dicts], "meta": {name: content}, "title": str}
+    """
+    parser = _StructuredDataParser()
+    parser.feed(page_html)
+    postings = []
+    for block in parser.json_ld:
+        try:
+            postings.extend(_find_job_postings(json.loads(block.strip())))
+        except ValueError:
+            continue  # Broken JSON-LD is common, the page may still have meta tags
+    return {"postings": postings, "meta": parser.meta, "title": parser.title}
+
+
+def _plain_text(value) -> str:
+    """HTML description ➔ single-line text."""
+    text = re.sub(r"<[^>]+>", " ", html.unescape(str(value or "")))
+    return " ".join(text.split())
+
+
+def _name(value) -> str:
+    """Name of a schema.org object, or the value itself if it is a string."""
+    if isinstance(value, dict):
+        return str(value.get("name") or "")
+    return str(value or "")
+
+
+def _as_list(value) -> list:
+    if value is None:
+        return []
+    return value if isinstance(value, list) else [value]
+
+
+def posting_places(posting: dict) -> list:
+    """
+    Locations of a JobPosting as {"locality", "region", "country"} dicts.
+
+    A plain-text address is split on commas ("San Jose, CA 95112, US"); a
+    lone country name or code goes to "country".
+    """
+    places = []
+    for place in _as_list(posting.get("jobLocation")):
+        address = place.get("address", place) if isinstance(place, dict) else place
+        if isinstance(address, dict):
+            parts = [_name(address.get(key)).strip() for key in ("addressLocality", "addressRegion", "addressCountry")]
+        else:
+            parts = [part.strip() for part in str(address or "").split(",")][:3]
+            if len(parts) == 1 and (parts[0].lower() in COUNTRY_NAMES or re.fullmatch(r"[A-Z]{2,3}", parts[0])):
+                parts = ["", "", parts[0]]
+            parts += [""] * (3 - len(parts))
+        place = dict(zip(("locality", "region", "country"), parts))
+        if any(place.values()) and place not in places:
+            places.append(place)
+    return places
+
+
+def posting_locations(posting: dict) -> list:
+    """Locations of a JobPosting as "City, Region, Country" strings, plus "Remote" for telecommute jobs."""
+    locations = [", ".join(part for part in place.values() if part) for place in posting_places(posting)]
+    if is_remote(posting):
+        locations.append("Remote")
+    return locations
+
+
+def is_remote(posting: dict) -> bool:
+    """True for telecommute (remote) JobPostings."""
+    return "TELECOMMUTE" in [str(t).upper() for t in _as_list(posting.get("jobLocationType"))]
+
+
+def salary_range(posting: dict) -> tuple:
+    """
+    Yearly salary range of a JobPosting.
+
+    Returns:
+        tuple: (minimum, maximum, currency), None where unknown.
+    """
+    salary = (_as_list(posting.get("baseSalary")) or _as_list(posting.get("estimatedSalary")) or [None])[0]
+    if not isinstance(salary, dict):
+        return None, None, None
+    currency = salary.get("currency")
+    value = salary.get("value")
+    unit = salary.get("unitText")
+    if isinstance(value, dict):
+        unit = value.get("unitText") or unit
+        low, high = value.get("minValue", value.get("value")), value.get("maxValue", value.get("value"))
+    else:
+        low = high = value
+
+    multiplier = SALARY_UNITS.get(str(unit or "YEAR").upper(), 1)
+    try:
+        low = float(low) * multiplier if low is not None else None
+        high = float(high) * multiplier if high is not None else None
+    except (TypeError, ValueError):
+        return None, None, currency
+    return low, high, currency
+
+
+def job_summary_from_posting(posting: dict) -> dict:
+    """JobPosting ➔ job_summary in the same shape Gemini is asked to return."""
+    low, high, currency = salary_range(posting)
+    salary = ""
+    if low and high and low != high:
+        salary = f"{low:,.0f}-{high:,.0f}"
+    elif low or high:
+        salary = f"{high or low:,.0f}"
+    if salary:
+        salary = " ".join(part for part in (salary, currency, "per year") if part)
+    skills = posting.get("skills")
+    return {
+        "Company Name": _name(posting.get("hiringOrganization")),
+        "Job Title": _plain_text(posting.get("title")),
+        "Location": " | ".join(posting_locations(posting)),
+        "Salary": salary,
+        "Skills": [s.strip() for s in skills.split(",")] if isinstance(skills, str) else _as_list(skills),
+        "Summary": _plain_text(posting.get("description"))[:MAX_SUMMARY_CHARS],
+    }
+
+
+def job_summary_from_meta(data: dict) -> dict:
+    """Partial job_summary from Open Graph / meta tags (no location or salary)."""
+    meta = data["meta"]
+    summary = {
+        "Company Name": meta.get("og:site_name", ""),
+        "Job Title": meta.get("og:title") or meta.get("twitter:title") or data["title"],
+        "Summary": (meta.get("og:description") or meta.get("description") or "")[:MAX_SUMMARY_CHARS],
+    }
+    return {key: value for key, value in summary.items() if value}
+
+
+def parse_salary_expectation(text) -> tuple:
+    """
+    Lower bound of a free-text salary expectation, e.g. "$90,000 - $100,000 per year" or "90k".
+
+    Returns:
+        tuple: (yearly amount or None, currency code)
+    """
+    text = str(text or "")
+    currency = next((code for symbol, code in CURRENCY_SYMBOLS.items() if symbol in text), "USD")
+    amounts = []
+    for number, suffix in re.findall(r"(\d[\d,]*(?:\.\d+)?)\s*([kK])?", text):
+        amount = float(number.replace(",", ""))
+        amounts.append(amount * 1000 if suffix else amount)
+    if not amounts:
+        return None, currency
+    multiplier = next((m for unit, m in SALARY_UNITS.items() if unit.lower() in text.lower()), 1)
+    return min(amounts) * multiplier, currency
+
+
+def _location_patterns(preferred: list) -> list:
+    """(case-insensitive name pattern, US state code or None) for each preferred location."""
+    patterns = []
+    for place in preferred:
+        place = place.strip()
+        if place:
+            patterns.append((re.compile(rf"\b{re.escape(place)}\b", re.IGNORECASE), US_STATES.get(place.title())))
+    return patterns
+
+
+def place_matches(place: dict, patterns: list) -> bool:
+    """
+    True if a posting place is one of the preferred locations.
+
+    Names may appear in any part of the place; a state code only counts as
+    the region ("CA" in "San Jose, CA 95112"), never as a country (Canada).
+    """
+    text = ", ".join(part for part in place.values() if part)
+    region = re.sub(r"\s*\d[\d\-]*$", "", place["region"]).upper()
+    return any(name.search(text) or (code and region == code) for name, code in patterns)
+
+
+class Prescreener:
+    """
+    Screens job links from their structured data before any browser work.
+
+    Each page is fetched over plain HTTP; schema.org JobPosting JSON-LD (or
+    meta tags as a fallback) gives the job summary, and the job is skipped
+    if it fails a filter:
+      - location: none of the job's locations matches "Preferred Locations" (remote jobs pass if allowed)
+      - salary: the top of the yearly range is below the expected minimum
+      - expired: "validThrough" is in the past
+    Missing data never skips a job. Fetches run in parallel ahead of the workers.
+    """
+
+    def __init__(self, memory_data: dict, filters: list = None, workers: int = PRESCREEN_WORKERS,
+                 timeout: float = PRESCREEN_TIMEOUT, allow_remote: bool = PRESCREEN_ALLOW_REMOTE,
+                 min_salary: float = PRESCREEN_MIN_SALARY, fetch=fetch_html):
+        """
+        Args:
+            memory_data (dict): Candidate memory ("Preferred Locations", "Salary Expectation").
+            filters (list): Filters to apply (default: PRESCREEN_FILTERS).
+            workers (int): Pages fetched in parallel.
+            timeout (float): Seconds per fetch.
+            allow_remote (bool): Remote jobs pass the location filter.
+            min_salary (float): Minimum yearly salary (0 = lower bound of "Salary Expectation").
+            fetch (callable): fetch(url, timeout) ➔ HTML (injectable for offline use).
+        """
+        self.filters = set(PRESCREEN_FILTERS if filters is None else filters)
+        self.workers = max(1, workers)
+        self.timeout = timeout
+        self.allow_remote = allow_remote
+        self.fetch = fetch
+
+        preferred = memory_data.get("Preferred Locations") or []
+        preferred = preferred.split(",") if isinstance(preferred, str) else preferred
+        self.location_patterns = _location_patterns(preferred)
+        expected, self.currency = parse_salary_expectation(memory_data.get("Salary Expectation"))
+        self.min_salary = min_salary or expected
+
+        self.lock = threading.Lock()
+        self.summaries = {}
+        self.counts = {"screened": 0, "structured": 0, "meta_only": 0, "no_data": 0, "fetch_failed": 0, "skipped": 0}
+
+    def check_filters(self, posting: dict) -> str:
+        """
+        Returns:
+            str: Why the job is skipped, or "" if it passes.
+        """
+        if "expired" in self.filters and posting.get("validThrough"):
+            try:
+                if date.fromisoformat(str(posting["validThrough"])[:10]) < date.today():
+                    return f"expired on {str(posting['validThrough'])[:10]}"
+            except ValueError:
+                pass
+
+        # 🌎 Country-only places (nationwide postings) say nothing about the city, so they never skip a job
+        places = posting_places(posting)
+        if "location" in self.filters and self.location_patterns and places:
+            remote_ok = self.allow_remote and is_remote(posting)
+            nationwide = any(not (place["locality"] or place["region"]) for place in places)
+            if not (remote_ok or nationwide or any(place_matches(place, self.location_patterns) for place in places)):
+                return f"location {' | '.join(posting_locations(posting))} not in preferred locations"
+
+        if "salary" in self.filters and self.min_salary:
+            low, high, currency = salary_range(posting)
+            top = high or low
+            if top and (currency is None or currency == self.currency) and top < self.min_salary:
+                return f"salary up to {top:,.0f} {currency or self.currency} below expected {self.min_salary:,.0f}"
+        return ""
+
+    def screen(self, link: str) -> dict:
+        """
+        Fetches and screens one job page.
+
+        Returns:
+            dict: {"skip": bool, "reason": str, "job_summary": dict, "structured": bool}
+        """
+        result = {"skip": False, "reason": "", "job_summary": {}, "structured": False}
+        with log_context(link=link, stage="prescreen"), profiler.stage("prescreen"):
+            try:
+                data = extract_structured_data(self.fetch(link, self.timeout))
+            except Exception as e:
+                log_event(f"ℹ️ Pre-screen fetch failed, leaving the job to the browser: {str(e)[:120]}", level="DEBUG")
+                self._count("fetch_failed")
+                return result
+
+            if data["postings"]:
+                posting = data["postings"][0]
+                result["job_summary"] = job_summary_from_posting(posting)
+                result["structured"] = True
+                result["reason"] = self.check_filters(posting)
+                result["skip"] = bool(result["reason"])
+                self._count("structured")
+            else:
+                result["job_summary"] = job_summary_from_meta(data)
+                self._count("meta_only" if result["job_summary"] else "no_data")
+
+            if result["skip"]:
+                self._count("skipped")
+                log_event(f"⏭️ Pre-screen: skipping {result['job_summary'].get('Job Title') or link} ({result['reason']}).")
+        return result
+
+    def _count(self, key: str):
+        """Counts one outcome (fetch results also count as screened)."""
+        with self.lock:
+            self.counts[key] += 1
+            if key in ("structured", "meta_only", "no_data", "fetch_failed"):
+                self.counts["screened"] += 1
+
+    def iterate(self, indexed_links, writer=None):
+        """
+        Yields the (index, link) pairs that pass, screening up to `workers` links ahead.
+
+        Skipped links are recorded through `writer` as "Skipped" with their reason;
+        the summary of passing links is kept for take().
+        """
+        source = iter(indexed_links)
+        pending = deque()
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="prescreen") as executor:
+            while True:
+                while len(pending) < self.workers * 2:
+                    item = next(source, None)
+                    if item is None:
+                        break
+                    pending.append((item, executor.submit(self.screen, item[1])))
+                if not pending:
+                    return
+
+                (index, link), future = pending.popleft()
+                result = future.result()
+                if result["skip"]:
+                    if writer:
+                        writer.submit(index, link, ("Skipped", result["job_summary"], f"pre-screen: {result['reason']}"))
+                    continue
+                if result["job_summary"]:
+                    with self.lock:
+                        self.summaries[link] = result
+                yield index, link
+
+    def take(self, link: str) -> tuple:
+        """
+        Returns:
+            tuple: (job_summary, structured) found for a link that passed (empty if none).
+        """
+        with self.lock:
+            result = self.summaries.pop(link, None)
+        return (result["job_summary"], result["structured"]) if result else ({}, False)
+
+    def peek(self, link: str) -> tuple:
+        """Like take(), but leaves the result for the worker (used when planning a link ahead of time)."""
+        with self.lock:
+            result = self.summaries.get(link)
+        return (result["job_summary"], result["structured"]) if result else ({}, False)
+
+    def stats(self) -> dict:
+        """Pages screened, by kind of data found, and how many were skipped."""
+        with self.lock:
+            return dict(self.counts)
@@ -0,0 +1,206 @@
+# src/agent/response_cache.py
+
+# 📦 Import libraries
+import hashlib
+import json
+import os
+import re
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from types import SimpleNamespace
+
+# 🛠️ Project imports
+from config.settings import RESPONSE_CACHE_MODE, RESPONSE_CACHE_DIR, RESPONSE_CACHE_MAX_MB
+from src.tools.logger_tool import log_event
+
+# 🎛️ Cache modes
+OFF = "off"
+RECORD = "record"
+REPLAY = "replay"
+MODES = (OFF, RECORD, REPLAY)
+
+# 🧹 Whitespace differences never change the answer
+WHITESPACE = re.compile(r"\s+")
+
+
+class ResponseCacheMiss(Exception):
+    """Replay mode found no recorded response for a prompt (Gemini is not called)."""
+
+
+def normalize_prompt(prompt: str) -> str:
+    """Collapses whitespace so formatting-only differences share a cache entry."""
+    return WHITESPACE.sub(" ", prompt or "").strip()
+
+
+def response_key(model_name: str, prompt: str) -> str:
+    """Content address of a response: SHA-256 of the model name and the normalized prompt."""
+    return hashlib.sha256(f"{model_name}\n{normalize_prompt(prompt)}".encode("utf-8")).hexdigest()
+
+
+class CachedResponse:
+    """
+    A recorded response shaped like Gemini's: `.text`, `.usage_metadata`, and
+    iterable as a single chunk so streaming code can consume it unchanged.
+    """
+
+    def __init__(self, entry: dict):
+        self.text = entry["text"]
+        self.usage_metadata = SimpleNamespace(
+            prompt_token_count=entry.get("prompt_tokens", 0),
+            candidates_token_count=entry.get("response_tokens", 0),
+        )
+
+    def __iter__(self):
+        yield self
+
+
+class ReplayClient:
+    """Client whose generate_content returns one recorded response."""
+
+    def __init__(self, entry: dict):
+        self.entry = entry
+
+    def generate_content(self, prompt, stream: bool = False, request_options=None):
+        return CachedResponse(self.entry)
+
+
+class ResponseCache:
+    """
+    Content-addressed on-disk cache of LLM responses.
+
+    Each response is one JSON file named by response_key(), so concurrent
+    workers and crashed runs never corrupt each other's entries. The total
+    size is bounded; the least recently used files (by mtime, refreshed on
+    every hit) are evicted first.
+
+    Modes: "record" serves cached responses and stores every new one;
+    "replay" serves cached responses only and raises ResponseCacheMiss
+    instead of calling Gemini; "off" does nothing.
+    """
+
+    def __init__(self, mode: str = RESPONSE_CACHE_MODE, directory: str = RESPONSE_CACHE_DIR,
+                 max_mb: float = RESPONSE_CACHE_MAX_MB):
+        self.mode = mode if mode in MODES else OFF
+        self.directory = directory
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self.lock = threading.Lock()
+        self.index = None  # key ➔ size in bytes, least recently used first (loaded on first use)
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.mode != OFF
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], f"{key}.json")
+
+    def _load_index(self):
+        """Scans the cache directory once (called with the lock held)."""
+        if self.index is not None:
+            return
+        files = []
+        for root, _, names in os.walk(self.directory):
+            for name in names:
+                if name.endswith(".json"):
+                    stat = os.stat(os.path.join(root, name))
+                    files.append((stat.st_mtime, name[:-5], stat.st_size))
+        files.sort()
+        self.index = OrderedDict((key, size) for _, key, size in files)
+        self.total_bytes = sum(self.index.values())
+        if files:
+            log_event(f"💽 Response cache ({self.mode}): {len(files)} response(s), {self.total_bytes / 1024:.0f} KB in {self.directory}.")
+
+    def get(self, model_name: str, prompt: str):
+        """
+        Looks up the recorded response for a prompt.
+
+        Returns:
+            dict | None: {"model", "text", "prompt_tokens", "response_tokens", "created"} or None on a miss.
+
+        Raises:
+            ResponseCacheMiss: On a miss in replay mode.
+        """
+        if not self.enabled:
+            return None
+        key = response_key(model_name, prompt)
+        path = self._path(key)
+        with self.lock:
+            self._load_index()
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    entry = json.load(f)
+                os.utime(path)
+                if key not in self.index:
+                    self.index[key] = os.path.getsize(path)
+                    self.total_bytes += self.index[key]
+                self.index.move_to_end(key)
+                self.hits += 1
+            except (OSError, ValueError):
+                entry = None
+                self.misses += 1
+
+        if entry is None and self.mode == REPLAY:
+            raise ResponseCacheMiss(f"no recorded {model_name} response for this prompt (key {key[:12]})")
+        return entry
+
+    def put(self, model_name: str, prompt: str, text: str, prompt_tokens: int = 0, response_tokens: int = 0):
+        """Stores a response (record mode only) and evicts old ones beyond the size bound."""
+        if self.mode != RECORD:
+            return
+        key = response_key(model_name, prompt)
+        path = self._path(key)
+        entry = {
+            "model": model_name,
+            "text": text,
+            "prompt_tokens": prompt_tokens,
+            "response_tokens": response_tokens,
+            "created": datetime.now().isoformat(timespec="seconds"),
+        }
+        with self.lock:
+            self._load_index()
+            try:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                tmp_path = f"{path}.{threading.get_ident()}.tmp"
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(entry, f, ensure_ascii=False)
+                os.replace(tmp_path, path)
+            except OSError as e:
+                log_event(f"⚠️ Failed to store LLM response in cache: {str(e)}")
+                return
+
+            self.total_bytes -= self.index.pop(key, 0)
+            self.index[key] = os.path.getsize(path)
+            self.total_bytes += self.index[key]
+            self.stores += 1
+
+            # 🧹 Evict least recently used responses (never the one just written)
+            while self.total_bytes > self.max_bytes and len(self.index) > 1:
+                old_key, size = self.index.popitem(last=False)
+                self.total_bytes -= size
+                self.evictions += 1
+                try:
+                    os.remove(self._path(old_key))
+                except OSError:
+                    pass
+
+    def stats(self) -> dict:
+        """Mode, hits, misses, stores, evictions and current size."""
+        with self.lock:
+            return {
+                "mode": self.mode,
+                "hits": self.hits,
+                "misses": self.misses,
+                "stores": self.stores,
+                "evictions": self.evictions,
+                "entries": len(self.index or {}),
+                "kb": round(self.total_bytes / 1024, 1),
+            }
+
+
+# 💽 Cache shared by the whole run
+response_cache = ResponseCache()
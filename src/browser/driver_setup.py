@@ -1,33 +1,231 @@
 # src/browser/driver_setup.py
 
 # 📦 Import required libraries
-import chromedriver_autoinstaller  # Automatically installs matching ChromeDriver # type: ignore
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chrome.service import Service
+from selenium.common.exceptions import SessionNotCreatedException, WebDriverException
 
-def get_driver():
+# 🛠️ Project imports
+from config.settings import CHROMEDRIVER_PATH, DRIVER_PATH_CACHE, HEADLESS, CHROME_PROFILE_DIR, DRIVER_RECYCLE_AFTER
+from config.settings import BLOCK_RESOURCES, BLOCK_RESOURCE_TYPES, BLOCK_URL_PATTERNS, OUTCOME_OBSERVER_ENABLED
+from src.browser.outcome_observer import install_outcome_observer
+from src.browser.resource_blocker import build_blocklist, enable_resource_blocking
+from src.tools.logger_tool import log_event
+
+# 🗂️ ChromeDriver binary path, resolved once per process (and cached on disk between runs)
+_driver_path = None
+_driver_path_lock = threading.Lock()
+
+
+def get_driver_path(refresh: bool = False) -> str:
+    """
+    Returns the ChromeDriver binary path without re-running the installer on every launch.
+
+    Order: CHROMEDRIVER_PATH setting, in-process cache, on-disk cache, then
+    chromedriver_autoinstaller.install() (whose result is cached).
+
+    Args:
+        refresh (bool): Ignore caches and run the installer (e.g. after Chrome updated).
+
+    Returns:
+        str: Path to the chromedriver executable.
+    """
+    global _driver_path
+    if CHROMEDRIVER_PATH and not refresh:
+        return CHROMEDRIVER_PATH
+
+    with _driver_path_lock:
+        if _driver_path and not refresh:
+            return _driver_path
+
+        if not refresh and os.path.exists(DRIVER_PATH_CACHE):
+            with open(DRIVER_PATH_CACHE, "r", encoding="utf-8") as f:
+                cached_path = f.read().strip()
+            if cached_path and os.path.exists(cached_path):
+                _driver_path = cached_path
+                return _driver_path
+
+        # 📥 Auto-install matching ChromeDriver version (imported here, most launches hit a cache)
+        import chromedriver_autoinstaller  # type: ignore
+        _driver_path = chromedriver_autoinstaller.install()
+        os.makedirs(os.path.dirname(DRIVER_PATH_CACHE) or ".", exist_ok=True)
+        with open(DRIVER_PATH_CACHE, "w", encoding="utf-8") as f:
+            f.write(_driver_path)
+        return _driver_path
+
+
+def get_driver(headless: bool = HEADLESS, profile_dir: str = CHROME_PROFILE_DIR, block_resources: bool = BLOCK_RESOURCES):
     """
     Sets up and returns a Selenium Chrome WebDriver instance.
 
-    - Auto-installs the correct ChromeDriver version.
+    - Reuses the cached ChromeDriver binary path (installs it only when missing or outdated).
     - Configures Chrome options for stealthy automation.
-    - Returns a maximized, ready-to-use driver.
-    
+    - Optionally runs headless and/or with a persistent user-data profile (keeps sessions and cookies).
+    - Optionally blocks images, fonts, media and trackers via CDP (see resource_blocker).
+    - Injects the success/error/CAPTCHA outcome observer into every page (see outcome_observer).
+    - Logs how long the browser took to start.
+
+    Args:
+        headless (bool): Run Chrome without a window.
+        profile_dir (str): User-data directory to reuse between runs ("" for a fresh profile).
+        block_resources (bool): Block the configured resource types and URL patterns.
+
     Returns:
         webdriver.Chrome: Selenium WebDriver instance.
     """
-
-    # 📥 Auto-install matching ChromeDriver version
-    chromedriver_autoinstaller.install()
+    started = time.perf_counter()
 
     # ⚙️ Set Chrome options
     options = Options()
-    options.add_argument("--start-maximized")  # Start browser maximized
+    if headless:
+        options.add_argument("--headless=new")
+        options.add_argument("--window-size=1920,1080")  # Headless has no screen to maximize to
+    else:
+        options.add_argument("--start-maximized")  # Start browser maximized
+    if profile_dir:
+        os.makedirs(profile_dir, exist_ok=True)
+        options.add_argument(f"--user-data-dir={os.path.abspath(profile_dir)}")
     options.add_argument("--disable-blink-features=AutomationControlled")  # Hide 'controlled by automation'
     options.add_experimental_option("excludeSwitches", ["enable-automation"])  # Remove automation switches
     options.add_experimental_option('useAutomationExtension', False)  # Disable automation extension
+    if block_resources:
+        options.set_capability("goog:loggingPrefs", {"performance": "ALL"})  # Network events for blocking stats
 
     # 🚀 Launch Chrome browser with these options
-    driver = webdriver.Chrome(options=options)
+    try:
+        driver = webdriver.Chrome(service=Service(get_driver_path()), options=options)
+    except SessionNotCreatedException:
+        # 🔄 Cached driver no longer matches the installed Chrome: reinstall once
+        log_event("⚠️ Cached ChromeDriver does not match Chrome, reinstalling...")
+        driver = webdriver.Chrome(service=Service(get_driver_path(refresh=True)), options=options)
 
+    if block_resources:
+        enable_resource_blocking(driver, build_blocklist(BLOCK_RESOURCE_TYPES, BLOCK_URL_PATTERNS))
+    if OUTCOME_OBSERVER_ENABLED:
+        install_outcome_observer(driver)
+
+    mode = "headless" if headless else "headed"
+    profile = f", profile {profile_dir}" if profile_dir else ""
+    log_event(f"🚀 Chrome started in {time.perf_counter() - started:.2f}s ({mode}{profile}).")
     return driver
+
+
+def is_driver_alive(driver) -> bool:
+    """Returns True if the browser session still responds."""
+    try:
+        driver.window_handles
+        return True
+    except WebDriverException:
+        return False
+
+
+class DriverPool:
+    """
+    Warm pool of pre-launched Chrome drivers.
+
+    Drivers are launched in the background before they are needed. A driver
+    is replaced after `recycle_after` links (0 = never) or as soon as it stops
+    responding. When recycling is on, one spare driver beyond `size` is kept
+    warm, so a recycled driver is swapped for a ready one and its own
+    replacement launches in the background as the next spare. With a profile
+    directory, each pool slot keeps its own persistent sub-profile (Chrome
+    cannot share one between processes).
+    """
+
+    def __init__(self, size: int = 1, recycle_after: int = DRIVER_RECYCLE_AFTER,
+                 headless: bool = HEADLESS, profile_dir: str = CHROME_PROFILE_DIR):
+        self.recycle_after = recycle_after
+        self.headless = headless
+        self.profile_dir = profile_dir
+        self.available = queue.Queue()
+        self.slots = {}
+        self.uses = {}
+        self.lock = threading.Lock()
+        self.launches = 0
+        self.recycled = 0
+        slots = max(1, size) + (1 if recycle_after else 0)
+        self.launcher = ThreadPoolExecutor(max_workers=slots, thread_name_prefix="driver-launch")
+        for slot in range(1, slots + 1):
+            self.launcher.submit(self._launch, slot)
+
+    def _launch(self, slot: int):
+        """Starts a driver for a slot and makes it available (runs on the launcher pool)."""
+        profile = os.path.join(self.profile_dir, f"slot-{slot}") if self.profile_dir else ""
+        try:
+            driver = get_driver(headless=self.headless, profile_dir=profile)
+        except Exception as e:
+            log_event(f"❌ Failed to launch driver for slot {slot}: {str(e)}")
+            self.available.put((slot, None))
+            return
+        with self.lock:
+            self.slots[id(driver)] = slot
+            self.uses[id(driver)] = 0
+            self.launches += 1
+        self.available.put((slot, driver))
+
+    def acquire(self):
+        """
+        Returns a ready driver, waiting for a warm one if none is available yet.
+
+        Raises:
+            WebDriverException: If the driver for the slot could not be launched.
+        """
+        slot, driver = self.available.get()
+        if driver is None:
+            raise WebDriverException(f"Driver for slot {slot} failed to launch")
+        return driver
+
+    def after_link(self, driver):
+        """
+        Counts one processed link and recycles the driver if it is worn out or dead.
+
+        The old driver's slot is relaunched in the background; the caller gets
+        the warm spare (or waits for the next launch if none is ready yet).
+
+        Returns:
+            The driver to use for the next link (the same one or a fresh one).
+        """
+        with self.lock:
+            self.uses[id(driver)] = self.uses.get(id(driver), 0) + 1
+            worn_out = self.recycle_after and self.uses[id(driver)] >= self.recycle_after
+
+        if is_driver_alive(driver) and not worn_out:
+            return driver
+
+        reason = "after crash" if not worn_out else f"after {self.recycle_after} links"
+        log_event(f"♻️ Recycling driver {reason}.")
+        self._retire(driver, relaunch=True)
+        with self.lock:
+            self.recycled += 1
+        return self.acquire()
+
+    def release(self, driver):
+        """Quits a driver for good (end of a worker)."""
+        if driver is not None:
+            self._retire(driver, relaunch=False)
+
+    def _retire(self, driver, relaunch: bool):
+        with self.lock:
+            slot = self.slots.pop(id(driver), None)
+            self.uses.pop(id(driver), None)
+        try:
+            driver.quit()
+        except Exception:
+            pass
+        if relaunch and slot is not None:
+            self.launcher.submit(self._launch, slot)
+
+    def close(self):
+        """Stops launching and quits drivers that were never handed out."""
+        self.launcher.shutdown(wait=True)
+        while not self.available.empty():
+            _, driver = self.available.get_nowait()
+            if driver is not None:
+                self._retire(driver, relaunch=False)
+        log_event(f"🚀 Driver pool: {self.launches} launch(es), {self.recycled} recycle(s).")
@@ -0,0 +1,213 @@
+# src/browser/outcome_observer.py
+
+# 📦 Import libraries
+import json
+import os
+from selenium.common.exceptions import WebDriverException
+
+# 🛠️ Project imports
+from config.settings import OUTCOME_RULES_FILE
+from src.tools.logger_tool import log_event
+
+# 📐 Signals per outcome: regexes over visible text and URL, plus CSS selectors of visible elements.
+#    Extend them with a JSON file of the same shape at OUTCOME_RULES_FILE.
+#    A success text already showing when the job page loaded does not count (see accept_outcome).
+DEFAULT_OUTCOME_RULES = {
+    "success": {
+        "text": [
+            r"thank(s| you) for (applying|your application|submitting)",
+            r"application (has been |was )?(successfully )?(submitted|received|sent)",
+            r"we('ve| have) received your application",
+            r"you('ve| have) (successfully )?applied",
+            r"your application is complete",
+        ],
+        "url": [
+            r"/(apply|applications?)(/[^?#]*)?/confirm(ation)?\b",
+            r"/thank-?you",
+            r"/application/(success|submitted)",
+            r"[?&](applied|submitted)=(true|1)",
+        ],
+        "selectors": [
+            "#application_confirmation",
+            "[class*='application-confirmation']",
+            "[data-testid*='confirmation']",
+            "[data-automation-id*='Confirmation']",
+        ],
+    },
+    "error": {
+        "text": [
+            r"something went wrong",
+            r"there (was|were) (an )?errors? (with|in|submitting)",
+            r"please (fix|correct) the (following )?errors",
+            r"(unable|failed) to submit",
+            r"no longer (accepting applications|available)",
+            r"(position|job) has been (filled|closed)",
+        ],
+        "url": [r"/error", r"/job-closed", r"/expired"],
+        "selectors": [".error-summary", "[role='alert'][class*='error']", "[data-testid*='error-banner']"],
+    },
+    "captcha": {
+        "text": [
+            r"verify (that )?you('re| are) (a )?human",
+            r"enter the (verification |security )?code (we )?sent",
+            r"one[- ]time (pass)?code",
+            r"check your (email|inbox) for a (verification )?code",
+        ],
+        "url": [r"/captcha", r"/challenge", r"/verify[-_/]?(human|captcha|robot|bot)"],
+        "selectors": [
+            "iframe[src*='recaptcha/api2/anchor']:not([src*='size=invisible'])",
+            "iframe[src*='recaptcha/api2/bframe']",
+            "iframe[src*='hcaptcha.com']",
+            "iframe[src*='challenges.cloudflare.com']",
+            "input[autocomplete='one-time-code']",
+        ],
+    },
+}
+
+# 👀 Page-side observer: re-checks the rules (debounced) on DOM mutations and URL changes
+#    and keeps the result in window.__agentOutcome. Success is sticky; error/captcha reflect the current page.
+OBSERVER_TEMPLATE = """
+(function () {
+    if (window.__agentOutcome) return;
+    var rules = __RULES__;
+    var kinds = ['captcha', 'success', 'error'];
+    var compiled = {};
+    kinds.forEach(function (kind) {
+        var r = rules[kind] || {};
+        compiled[kind] = {
+            text: (r.text || []).length ? new RegExp(r.text.join('|'), 'i') : null,
+            url: (r.url || []).length ? new RegExp(r.url.join('|'), 'i') : null,
+            selectors: r.selectors || []
+        };
+    });
+    var o = window.__agentOutcome = {
+        state: null, success: null, error: null, captcha: null, url: location.href, checks: 0,
+        doc: String(performance.timeOrigin) + '-' + Math.random().toString(36).slice(2)
+    };
+
+    function visible(el) {
+        return !!(el.offsetWidth || el.offsetHeight || el.getClientRects().length);
+    }
+
+    function signal(kind, text) {
+        var c = compiled[kind];
+        var match;
+        if (c.url && (match = location.href.match(c.url))) return 'url: ' + match[0];
+        for (var i = 0; i < c.selectors.length; i++) {
+            try {
+                var el = document.querySelector(c.selectors[i]);
+                if (el && visible(el)) return 'element: ' + c.selectors[i];
+            } catch (e) {}
+        }
+        if (c.text && (match = text.match(c.text))) return 'text: ' + match[0];
+        return null;
+    }
+
+    var timer = null;
+    function check() {
+        timer = null;
+        o.checks++;
+        o.url = location.href;
+        var text = document.body ? document.body.innerText.slice(0, 50000) : '';
+        o.success = o.success || signal('success', text);
+        o.error = signal('error', text);
+        o.captcha = signal('captcha', text);
+        o.state = o.success ? 'success' : o.captcha ? 'captcha' : o.error ? 'error' : null;
+    }
+    function schedule() {
+        if (!timer) timer = setTimeout(check, 150);
+    }
+
+    new MutationObserver(schedule).observe(document, {subtree: true, childList: true, characterData: true});
+    ['pushState', 'replaceState'].forEach(function (name) {
+        var original = history[name];
+        history[name] = function () {
+            var result = original.apply(this, arguments);
+            schedule();
+            return result;
+        };
+    });
+    window.addEventListener('popstate', schedule);
+    window.addEventListener('hashchange', schedule);
+    document.addEventListener('DOMContentLoaded', check);
+    schedule();
+})();
+"""
+
+
+def load_outcome_rules(path: str = OUTCOME_RULES_FILE) -> dict:
+    """
+    Returns the default rules extended with the patterns from a JSON rules file.
+
+    Args:
+        path (str): JSON file shaped like DEFAULT_OUTCOME_RULES (missing file = defaults only).
+
+    Returns:
+        dict: Rules per outcome kind.
+    """
+    rules = {kind: {key: list(values) for key, values in signals.items()} for kind, signals in DEFAULT_OUTCOME_RULES.items()}
+    if path and os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as f:
+            extra = json.load(f)
+        for kind, signals in extra.items():
+            for key, values in signals.items():
+                rules.setdefault(kind, {}).setdefault(key, []).extend(values)
+        log_event(f"📐 Loaded outcome rules from {path}.")
+    return rules
+
+
+def build_observer_script(rules: dict) -> str:
+    """Embeds the rules into the page-side observer script."""
+    return OBSERVER_TEMPLATE.replace("__RULES__", json.dumps(rules))
+
+
+def install_outcome_observer(driver, rules: dict = None):
+    """
+    Injects the outcome observer into every document the driver opens (and the current one).
+
+    Args:
+        driver: Selenium Chrome WebDriver.
+        rules (dict): Outcome rules (default: load_outcome_rules()).
+    """
+    script = build_observer_script(rules or load_outcome_rules())
+    driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": script})
+    driver.execute_script(script)
+
+
+def accept_outcome(outcome: dict, baseline: dict = None) -> dict:
+    """
+    Drops a success that is only a text match the job page already showed when it loaded.
+
+    Job description pages can carry confirmation-like wording, so a success
+    text that was present in the same document at load time (success is
+    sticky, so it keeps showing) is ignored. A new document, e.g. the real
+    confirmation page, counts even with the same wording; URL and element
+    signals always count.
+
+    Args:
+        outcome (dict | None): Flags from poll_outcome / last_outcome.
+        baseline (dict | None): Flags read right after the job page loaded.
+
+    Returns:
+        dict | None: The outcome with "state" recomputed if the success was dropped.
+    """
+    success = (outcome or {}).get("success") or ""
+    if not success.startswith("text:") or not baseline:
+        return outcome
+    if success != baseline.get("success") or outcome.get("doc") != baseline.get("doc"):
+        return outcome
+    state = "captcha" if outcome.get("captcha") else "error" if outcome.get("error") else None
+    return {**outcome, "success": None, "state": state}
+
+
+def poll_outcome(driver) -> dict:
+    """
+    Reads the observer flags with one script call.
+
+    Returns:
+        dict | None: {"state", "success", "error", "captcha", "url", "checks"} or None if not installed.
+    """
+    try:
+        return driver.execute_script("return window.__agentOutcome || null;")
+    except WebDriverException:
+        return None
@@ -0,0 +1,111 @@
+# src/browser/resource_blocker.py
+
+# 📦 Import libraries
+import json
+
+# 🛠️ Project imports
+from src.tools.logger_tool import log_event
+
+def host_patterns(*hosts: str, path: str = "") -> list:
+    """Wildcard patterns matching a host and its subdomains only, e.g. "*://segment.com/*", "*://*.segment.com/*"."""
+    return [pattern for host in hosts for pattern in (f"*://{host}/{path}*", f"*://*.{host}/{path}*")]
+
+
+# 🧱 URL patterns per resource type (Network.setBlockedURLs matches URLs, not types)
+RESOURCE_TYPE_PATTERNS = {
+    "image": ["*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.avif", "*.ico", "*.bmp", "*.png?*", "*.jpg?*", "*.jpeg?*", "*.gif?*", "*.webp?*"],
+    "font": ["*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot", "*.woff?*", "*.woff2?*",
+             *host_patterns("fonts.googleapis.com", "fonts.gstatic.com", "use.typekit.net")],
+    "media": ["*.mp4", "*.webm", "*.mov", "*.m3u8", "*.mp3", "*.wav",
+              *host_patterns("youtube.com", path="embed"), *host_patterns("player.vimeo.com", "wistia.com")],
+}
+
+# 🕵️ Analytics, ad and chat-widget hosts a form never needs (anchored to the host, so
+#    "unqualified.com" or a first-party URL with "segment.com" in its query is not blocked)
+DEFAULT_BLOCKED_URLS = host_patterns(
+    "google-analytics.com", "googletagmanager.com", "doubleclick.net", "googleadservices.com",
+    "connect.facebook.net", "px.ads.linkedin.com", "snap.licdn.com", "bat.bing.com",
+    "hotjar.com", "clarity.ms", "fullstory.com", "segment.com", "segment.io", "mixpanel.com",
+    "amplitude.com", "heap.io", "newrelic.com", "nr-data.net", "sentry.io",
+    "intercom.io", "intercomcdn.com", "drift.com", "driftt.com", "livechatinc.com",
+    "tawk.to", "zdassets.com", "olark.com", "qualified.com",
+)
+
+def build_blocklist(resource_types: list, extra_patterns: list = None) -> list:
+    """
+    Builds the URL patterns to block.
+
+    Args:
+        resource_types (list): Keys of RESOURCE_TYPE_PATTERNS to block (e.g. ["image", "font"]).
+        extra_patterns (list): Additional wildcard URL patterns.
+
+    Returns:
+        list: Unique patterns, defaults first.
+    """
+    patterns = list(DEFAULT_BLOCKED_URLS)
+    for resource_type in resource_types:
+        patterns.extend(RESOURCE_TYPE_PATTERNS.get(resource_type.strip().lower(), []))
+    patterns.extend(p.strip() for p in (extra_patterns or []) if p.strip())
+    return list(dict.fromkeys(patterns))
+
+
+def enable_resource_blocking(driver, patterns: list):
+    """
+    Blocks matching requests in the browser through the DevTools Protocol.
+
+    Blocked requests fail immediately with blockedReason "inspector",
+    so the page load no longer waits for them.
+    """
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+    log_event(f"🚫 Blocking {len(patterns)} URL pattern(s) via CDP.")
+
+
+def collect_network_stats(driver) -> dict:
+    """
+    Drains the browser's performance log and counts blocked and loaded requests.
+
+    Requires the driver to be started with performance logging
+    (see get_driver). Bytes of blocked requests are never transferred, so
+    only their count (per resource type) is known; loaded bytes are reported
+    so runs with and without blocking can be compared.
+
+    Returns:
+        dict: {"blocked", "blocked_by_type", "loaded", "loaded_bytes"} since the last call.
+    """
+    stats = {"blocked": 0, "blocked_by_type": {}, "loaded": 0, "loaded_bytes": 0}
+    try:
+        entries = driver.get_log("performance")
+    except Exception:
+        return stats
+
+    for entry in entries:
+        try:
+            message = json.loads(entry["message"])["message"]
+        except (KeyError, ValueError, TypeError):
+            continue
+        method = message.get("method")
+        params = message.get("params", {})
+        if method == "Network.loadingFailed" and params.get("blockedReason") == "inspector":
+            stats["blocked"] += 1
+            resource_type = params.get("type", "Other")
+            stats["blocked_by_type"][resource_type] = stats["blocked_by_type"].get(resource_type, 0) + 1
+        elif method == "Network.loadingFinished":
+            stats["loaded"] += 1
+            stats["loaded_bytes"] += int(params.get("encodedDataLength", 0))
+    return stats
+
+
+def log_network_stats(driver):
+    """Logs blocked/loaded request counts for the page(s) visited since the last call."""
+    stats = collect_network_stats(driver)
+    if not stats["blocked"] and not stats["loaded"]:
+        return
+    by_type = ", ".join(f"{t}: {n}" for t, n in sorted(stats["blocked_by_type"].items()))
+    log_event(
+        f"🚫 Blocked {stats['blocked']} request(s){f' ({by_type})' if by_type else ''}; "
+        f"loaded {stats['loaded']} request(s), {stats['loaded_bytes'] / 1024:.0f} KB.",
+        blocked_requests=stats["blocked"],
+        loaded_requests=stats["loaded"],
+        loaded_bytes=stats["loaded_bytes"],
+    )
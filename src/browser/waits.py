@@ -0,0 +1,183 @@
+# src/browser/waits.py
+
+# 📦 Import required libraries
+import time
+import weakref
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException, WebDriverException
+
+# 🛠️ Project imports
+from config.settings import WAIT_TIMEOUT, WAIT_POLL_INTERVAL, DOM_QUIET_MS, NETWORK_IDLE_MS, SETTLE_TIMEOUT
+from src.tools.logger_tool import log_event
+
+# 🎯 Latest outcome observer flags per driver, refreshed by every wait
+_outcomes = weakref.WeakKeyDictionary()
+
+# 🔎 Selector types accepted by wait_for_element_interactable
+BY_TYPES = {"xpath": By.XPATH, "css": By.CSS_SELECTOR, "id": By.ID, "name": By.NAME}
+
+# 👀 Page-side watcher: installs itself once per document (MutationObserver + fetch/XHR counters)
+#    and returns the current readiness state (plus the outcome observer flags) on every call.
+WATCH_SCRIPT = """
+var w = window.__agentWatch;
+if (!w) {
+    w = window.__agentWatch = {inflight: 0, lastMutation: performance.now(), lastNetwork: performance.now()};
+    new MutationObserver(function () { w.lastMutation = performance.now(); })
+        .observe(document.documentElement, {subtree: true, childList: true, attributes: true, characterData: true});
+    var done = function () { w.inflight = Math.max(0, w.inflight - 1); w.lastNetwork = performance.now(); };
+    if (window.fetch) {
+        var origFetch = window.fetch;
+        window.fetch = function () {
+            w.inflight++; w.lastNetwork = performance.now();
+            return origFetch.apply(this, arguments).finally(done);
+        };
+    }
+    var origSend = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function () {
+        w.inflight++; w.lastNetwork = performance.now();
+        this.addEventListener('loadend', done);
+        return origSend.apply(this, arguments);
+    };
+    w.resources = performance.getEntriesByType('resource').length;
+}
+var now = performance.now();
+var resources = performance.getEntriesByType('resource').length;
+if (resources !== w.resources) { w.resources = resources; w.lastNetwork = now; }
+return {
+    ready: document.readyState,
+    inflight: w.inflight,
+    sinceMutation: now - w.lastMutation,
+    sinceNetwork: now - w.lastNetwork,
+    outcome: window.__agentOutcome || null
+};
+"""
+
+
+def _page_state(driver) -> dict:
+    """Returns the watcher state for the current document (installs the watcher if needed)."""
+    try:
+        state = driver.execute_script(WATCH_SCRIPT) or {}
+    except WebDriverException:
+        state = {}
+    _outcomes[driver] = state.get("outcome")
+    return state
+
+
+def last_outcome(driver):
+    """
+    Outcome observer flags seen by the most recent wait, without a WebDriver call.
+
+    Returns:
+        dict | None: See outcome_observer.poll_outcome.
+    """
+    return _outcomes.get(driver)
+
+
+def _wait(driver, condition, description: str, timeout: float, timeout_message: str = None):
+    """
+    Runs a WebDriverWait and logs how long it actually blocked.
+
+    Args:
+        timeout_message (str | None): Logged instead of the "timed out" warning when
+            running out of time is expected and harmless.
+
+    Returns:
+        The condition's truthy result, or None on timeout.
+    """
+    started = time.perf_counter()
+    try:
+        result = WebDriverWait(driver, timeout, poll_frequency=WAIT_POLL_INTERVAL).until(condition)
+        log_event(f"⏳ Waited {time.perf_counter() - started:.2f}s for {description}.")
+        return result
+    except TimeoutException:
+        elapsed = time.perf_counter() - started
+        if timeout_message:
+            log_event(f"⏳ Waited {elapsed:.2f}s, {timeout_message}.")
+        else:
+            log_event(f"⌛ Timed out after {elapsed:.2f}s waiting for {description}.")
+        return None
+
+
+def wait_for_document_ready(driver, timeout: float = WAIT_TIMEOUT) -> bool:
+    """Waits until document.readyState is 'complete'."""
+    condition = lambda d: d.execute_script("return document.readyState") == "complete"
+    return bool(_wait(driver, condition, "document ready", timeout))
+
+
+def wait_for_network_idle(driver, idle_ms: int = NETWORK_IDLE_MS, timeout: float = SETTLE_TIMEOUT) -> bool:
+    """
+    Waits until no fetch/XHR is in flight and no resource has loaded for idle_ms.
+
+    Runs after actions, so it is capped like wait_for_page_settled: a page that
+    keeps polling is simply "not idle" after SETTLE_TIMEOUT.
+    """
+    def condition(d):
+        state = _page_state(d)
+        return state.get("inflight", 0) == 0 and state.get("sinceNetwork", 0) >= idle_ms
+
+    return bool(_wait(driver, condition, f"network idle ({idle_ms}ms)", timeout, "network not idle (still polling), continuing"))
+
+
+def wait_for_dom_quiet(driver, quiet_ms: int = DOM_QUIET_MS, timeout: float = SETTLE_TIMEOUT) -> bool:
+    """
+    Waits until the DOM has not mutated for quiet_ms (MutationObserver based).
+
+    Capped by SETTLE_TIMEOUT: animated pages never go quiet, which is not an error.
+    """
+    condition = lambda d: _page_state(d).get("sinceMutation", 0) >= quiet_ms
+    return bool(_wait(driver, condition, f"DOM quiet ({quiet_ms}ms)", timeout, "DOM not quiet (still animating), continuing"))
+
+
+def wait_for_page_settled(driver, timeout: float = SETTLE_TIMEOUT) -> bool:
+    """
+    Waits for a page to be ready to read: document complete, network idle and DOM quiet.
+
+    Used after navigation and after clicks that may load new content. Pages that
+    poll or animate all the time never go quiet, so the wait is capped by the
+    short SETTLE_TIMEOUT (not WAIT_TIMEOUT) and running out only means "not settled".
+    """
+    def condition(d):
+        state = _page_state(d)
+        return (
+            state.get("ready") == "complete"
+            and state.get("inflight", 0) == 0
+            and state.get("sinceNetwork", 0) >= NETWORK_IDLE_MS
+            and state.get("sinceMutation", 0) >= DOM_QUIET_MS
+        )
+
+    return bool(_wait(driver, condition, "page to settle", timeout, "page not settled (still busy), continuing"))
+
+
+def wait_for_element_interactable(driver, selector: str, by: str = "xpath", timeout: float = WAIT_TIMEOUT):
+    """
+    Waits until an element is visible and enabled.
+
+    Args:
+        driver: Selenium WebDriver.
+        selector (str): Element selector.
+        by (str): Selector type (xpath, css, id, name).
+        timeout (float): Maximum seconds to wait.
+
+    Returns:
+        WebElement | None: The element, or None if it never became interactable.
+    """
+    locator = (BY_TYPES.get(by, By.XPATH), selector)
+    return _wait(driver, EC.element_to_be_clickable(locator), f"element {selector} ({by})", timeout)
+
+
+def wait_for_handle_interactable(driver, element, description: str = "element", timeout: float = WAIT_TIMEOUT):
+    """
+    Waits until an already-resolved element is visible and enabled.
+
+    Args:
+        driver: Selenium WebDriver.
+        element (WebElement): Element handle (e.g. from the ElementResolver cache).
+        description (str): What is being waited for (for the log).
+        timeout (float): Maximum seconds to wait.
+
+    Returns:
+        WebElement | None: The element, or None if it never became interactable.
+    """
+    return _wait(driver, EC.element_to_be_clickable(element), description, timeout)
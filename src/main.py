@@ -3,102 +3,482 @@
 # 📦 Imports
 import sys
 import os
-import pandas as pd
+import argparse
 import json
+import threading
 import time
+from datetime import datetime
+
+# ⏱️ Cold start: time spent importing the agent's modules
+IMPORT_STARTED = time.perf_counter()
 
 # 🛠️ Add project root to path so imports work correctly
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 # 📥 Load modules
-from config.settings import EMAIL_FOR_LOGIN, PASSWORD_FOR_LOGIN
-from src.browser.driver_setup import get_driver
+from config.settings import EMAIL_FOR_LOGIN, PASSWORD_FOR_LOGIN, PLAN_CACHE_ENABLED, MEMORY_INDEX_ENABLED
+from config.settings import OUTCOME_OBSERVER_ENABLED, PRESCREEN_ENABLED, FIELD_MAPPER_ENABLED
+from src.browser.driver_setup import DriverPool
+from src.browser.resource_blocker import log_network_stats
+from src.browser.waits import wait_for_page_settled, last_outcome
+from src.browser.outcome_observer import accept_outcome
 from src.agent.decision_maker import decide_next_actions
-from src.tools.hands_tool import HandsTool
-from src.tools.logger_tool import log_event
-from src.tools.scribe_tool import record_application_result
-
-# 📂 Load job links from input CSV
-try:
-    job_links_df = pd.read_csv("input/job_links.csv")
-    job_links = job_links_df["Link"].dropna().tolist()
-    log_event(f"📥 Loaded {len(job_links)} job link(s) from CSV.")
-except Exception as e:
-    log_event(f"❌ Failed to load job_links.csv: {e}")
-    job_links = []
-
-# 📂 Load memory (FAQ and resume info)
-try:
-    with open("memory/faq_memory.json", "r", encoding="utf-8") as f:
-        memory_data = json.load(f)
-    log_event("🧠 Loaded memory memory/faq_memory.json successfully.")
-except Exception as e:
-    log_event(f"❌ Failed to load memory: {e}")
-    memory_data = {}
-
-# 🖥️ Start the browser session
-driver = get_driver()
-hands = HandsTool(driver)
-
-# 🔁 Loop through each job link
-for link in job_links:
+from src.agent.link_session import LinkSession
+from src.agent.llm_scheduler import scheduler
+from src.agent.response_cache import response_cache, MODES as RESPONSE_CACHE_MODES
+from src.agent.link_state import LinkStateMachine, page_hash, live_form_state, SUCCESS, HUMAN, FAILED, ACTING, ESCALATE, ABORT
+from src.agent.prefetcher import Prefetcher
+from src.agent.prescreen import Prescreener
+from src.tools.dom_distiller import distill_dom, page_fingerprint
+from src.tools.field_mapper import FieldMapper
+from src.tools.hands_tool import HandsTool, ActionStream
+from src.tools.link_reader import LinkReader, group_by_domain, domain_counts
+from src.tools.logger_tool import log_event, log_context, shutdown_logger
+from src.tools.memory_index import MemoryIndex
+from src.tools.plan_cache import PlanCache
+from src.tools.profiler import profiler
+from src.tools.scribe_tool import OrderedResultWriter, OUTPUT_FILE, get_results_store, export_results_csv
+from src.tools.token_counter import ledger
+
+IMPORT_SECONDS = time.perf_counter() - IMPORT_STARTED
+
+
+def load_job_links(path: str = "input/job_links.csv", resume: bool = False):
+    """
+    Streams job links from a CSV, JSONL or text file, dropping duplicates (by normalized URL).
+
+    Args:
+        path (str): Links file.
+        resume (bool): Also skip links whose latest recorded attempt did not fail.
+
+    Returns:
+        LinkReader | list: Iterable of links in input order (empty if the file is missing).
+    """
+    if not os.path.isfile(path):
+        log_event(f"❌ Job links file not found: {path}")
+        return []
+    finished = get_results_store().finished_urls() if resume else set()
+    return LinkReader(path, skip_urls=finished)
+
+
+def load_memory(path: str = "memory/faq_memory.json") -> dict:
+    """Loads candidate memory (FAQ and resume info)."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            memory_data = json.load(f)
+        log_event(f"🧠 Loaded memory {path} successfully.")
+        return memory_data
+    except Exception as e:
+        log_event(f"❌ Failed to load memory: {e}")
+        return {}
+
+
+def distill_page(dom_html: str):
+    """
+    distill_dom() that never fails the link.
+
+    Returns:
+        dict | None: The form model, or None if the page could not be parsed
+                     (the planner then falls back to sending the raw DOM).
+    """
+    try:
+        return distill_dom(dom_html)
+    except Exception as e:
+        log_event(f"⚠️ DOM distillation failed: {str(e)}")
+        return None
+
+
+def switch_to_new_tab(driver):
+    """Switches to the most recently opened tab if there is more than one."""
+    if len(driver.window_handles) > 1:
+        driver.switch_to.window(driver.window_handles[-1])
+        log_event("🧭 Switched to newly opened tab.")
+
+
+def process_link(driver, hands, link: str, memory_data: dict, plan_cache=None, prefetcher=None, memory_index=None,
+                 job_summary: dict = None, summary_known: bool = False, field_mapper=None):
+    """
+    Drives one job link through its state machine until a final state.
+
+    Args:
+        driver: Selenium WebDriver owned by the caller.
+        hands (HandsTool): Hands bound to the same driver.
+        link (str): Job link to apply to.
+        memory_data (dict): Candidate memory.
+        plan_cache (PlanCache | None): Shared plan cache.
+        prefetcher (Prefetcher | None): Source of a first-step plan planned ahead of time.
+        memory_index (MemoryIndex | None): Picks the memory entries relevant to each page.
+        job_summary (dict | None): Job summary found by pre-screening.
+        summary_known (bool): The summary came from structured data, so Gemini is not asked for it.
+        field_mapper (FieldMapper | None): Fills standard fields from memory before Gemini is asked.
+
+    Returns:
+        tuple: (status, job_summary, reason) to record.
+    """
+    session = LinkSession(link)
+    session.summary_known = summary_known
+    machine = LinkStateMachine(session)
+    job_summary = dict(job_summary or {})
     try:
         log_event(f"🌐 Opening job page: {link}")
-        driver.get(link)
-        time.sleep(3)
+        with log_context(stage="load"), profiler.stage("load"):
+            driver.get(link)
+            wait_for_page_settled(driver)
+        session.load_outcome = last_outcome(driver) if OUTCOME_OBSERVER_ENABLED else None
+        hands.outcome_baseline = session.load_outcome
+
+        first_step = True
+        while machine.next_step():
+            with log_context(step=machine.steps):
+                # 🎯 Outcome flags from the page-side observer (read during the last wait, no extra call)
+                outcome = accept_outcome(last_outcome(driver), session.load_outcome) if OUTCOME_OBSERVER_ENABLED else None
+                if outcome and outcome.get("state") == "success":
+                    log_event(f"🎉 Application submitted ({outcome.get('success')}).")
+                    return machine.finish(SUCCESS, outcome.get("success"), job_summary)
+                if outcome and outcome.get("state") == "captcha":
+                    log_event(f"🛑 Human intervention needed: verification detected ({outcome.get('captcha')})")
+                    return machine.finish(HUMAN, f"verification detected ({outcome.get('captcha')})", job_summary)
+                if outcome and outcome.get("state") == "error":
+                    log_event(f"⚠️ Page reports an error ({outcome.get('error')}).")
+
+                # 🧠 Read the updated DOM
+                with profiler.stage("capture"):
+                    dom_html = driver.page_source
+                with profiler.stage("distill"):
+                    form_model = distill_page(dom_html)
+                    fingerprint = page_fingerprint(form_model) if form_model else None
+
+                # 🧱 Stop sending the same page back to Gemini when actions change nothing
+                progress = machine.check_progress(page_hash(form_model or {"text": dom_html}, live_form_state(driver)))
+                if progress == ABORT:
+                    return machine.finish(FAILED, f"stalled: page unchanged after {machine.unchanged} step(s)", job_summary)
+                if progress == ESCALATE:
+                    session.escalate(
+                        f"The page did not change after the last {machine.unchanged} plan(s). Those actions had no effect: "
+                        "look for validation errors, required fields left empty, or a different button, and do not repeat them."
+                    )
+                    if plan_cache and fingerprint:
+                        plan_cache.invalidate(fingerprint)
 
-        while True:
-            # 🧠 Read the updated DOM
-            dom_html = driver.page_source
+                # ♻️ Replay a cached plan if this form structure was seen before
+                if plan_cache and not session.stall_note:
+                    cached_actions = plan_cache.lookup(fingerprint, memory_data)
+                    if cached_actions:
+                        log_event(f"♻️ Replaying cached plan ({len(cached_actions)} actions) for fingerprint {fingerprint[:10]}.")
+                        machine.transition(ACTING, "cached plan")
+                        with log_context(stage="replay"):
+                            replayed = hands.perform(cached_actions)
+                        if replayed:
+                            session.observe(form_model)
+                            session.record_actions(cached_actions)
+                            switch_to_new_tab(driver)
+                            with profiler.stage("settle"):
+                                wait_for_page_settled(driver)
+                            continue
 
-            # 🎯 Get next action plan from Gemini
-            plan = decide_next_actions(dom_html, memory_data)
+                        # ❌ Replay failed: drop the entry and ask Gemini about the current page
+                        plan_cache.invalidate(fingerprint)
+                        dom_html = driver.page_source
+                        form_model = distill_page(dom_html)
+                        fingerprint = page_fingerprint(form_model) if form_model else None
 
-            if not plan:
-                log_event("⚠️ No plan received. Skipping link.")
-                break
+                # 🔮 Use the plan prefetched for this page, if it is still valid
+                plan = None
+                if prefetcher and first_step:
+                    plan = prefetcher.take(link, fingerprint, session)
+                    if plan:
+                        session.observe(form_model)
+                first_step = False
 
-            status = plan.get("status", "")
+                # 🗺️ Fill standard fields straight from memory; Gemini only sees what is left
+                mapped_actions = []
+                session.prefilled = set()
+                if plan is None and field_mapper and form_model and not session.stall_note:
+                    mapping = field_mapper.map(form_model, allow_submit=session.summary_known or bool(job_summary))
+                    if mapping["complete"]:
+                        plan = {"status": "action_required", "actions": mapping["actions"]}
+                        session.observe(form_model)
+                    elif mapping["actions"]:
+                        with log_context(stage="map"):
+                            if hands.perform(mapping["actions"]):
+                                mapped_actions = mapping["actions"]
+                                session.record_actions(mapped_actions)
+                                session.prefilled = {action["selector"] for action in mapped_actions}
+                        with profiler.stage("capture"):
+                            dom_html = driver.page_source
+                        with profiler.stage("distill"):
+                            form_model = distill_page(dom_html)
 
-            # 🛑 Human intervention needed
-            if status == "human_intervention_required":
-                reason = plan.get("reason", "Unknown reason")
-                log_event(f"🛑 Human intervention needed: {reason}")
-                record_application_result(link, "Human Intervention", plan.get("job_summary", {}))
-                break
+                # 🎯 Get next action plan from Gemini (actions start executing while it streams)
+                stream = None
+                if plan is None:
+                    stream = ActionStream(hands)
+                    with log_context(stage="plan"):
+                        plan = decide_next_actions(dom_html, memory_data, session, memory_index, on_action=stream,
+                                                   form_model=form_model)
 
-            # ✅ Actions needed (click, type, select)
-            if status == "action_required":
-                actions = plan.get("actions", [])
-                if actions:
-                    hands.perform(actions)
+                if not plan:
+                    log_event("⚠️ No plan received. Skipping link.")
+                    return machine.finish(FAILED, "no plan received", job_summary)
+
+                status = plan.get("status", "")
+                if plan.get("job_summary") and not session.summary_known:
+                    job_summary = {**job_summary, **plan["job_summary"]}
+                    log_event(f"📋 Scraped Job Summary: {job_summary}")
+
+                # 🛑 Human intervention needed
+                if status == "human_intervention_required":
+                    reason = plan.get("reason", "Unknown reason")
+                    log_event(f"🛑 Human intervention needed: {reason}")
+                    return machine.finish(HUMAN, reason, job_summary)
+
+                # ✅ Actions needed (click, type, select)
+                if status == "action_required":
+                    actions = plan.get("actions", [])
+                    if not actions:
+                        log_event("⚠️ No actions found to perform. Skipping link.")
+                        return machine.finish(FAILED, "plan without actions", job_summary)
+
+                    machine.transition(ACTING)
+                    streamed = plan.get("streamed", 0)
+                    performed = stream.flush() if stream else True
+                    if actions[streamed:]:
+                        with log_context(stage="act"):
+                            performed = hands.perform(actions[streamed:], dismiss_modals=not streamed) and performed
+                    if performed and plan_cache:
+                        plan_cache.store(fingerprint, mapped_actions + actions, memory_data)
+                    session.record_actions(actions)
+                    session.escalate("")
 
                     # 🧭 Switch tab if a new one opened
-                    if len(driver.window_handles) > 1:
-                        driver.switch_to.window(driver.window_handles[-1])
-                        log_event("🧭 Switched to newly opened tab.")
+                    switch_to_new_tab(driver)
 
                     log_event("🧰 Actions performed successfully.")
-                else:
-                    log_event("⚠️ No actions found to perform. Skipping link.")
-                    break
 
-                # 📋 Job summary extraction if available
-                job_summary = plan.get("job_summary", {})
-                if job_summary:
-                    log_event(f"📋 Scraped Job Summary: {job_summary}")
+                    # 🔁 Continue looping once the page has settled
+                    with profiler.stage("settle"):
+                        wait_for_page_settled(driver)
 
-                # 🔁 Continue looping if no success/fail detected yet
-                time.sleep(2)
+                else:
+                    log_event(f"ℹ️ Unknown status: {status}. Skipping.")
+                    return machine.finish(FAILED, f"unknown plan status {status!r}", job_summary)
 
-            else:
-                log_event(f"ℹ️ Unknown status: {status}. Skipping.")
-                break
+        # ⏱️ A budget ran out
+        return machine.result(job_summary)
 
     except Exception as e:
         log_event(f"❌ Exception while processing link: {str(e)}")
-        record_application_result(link, "Failed", {})
+        return machine.finish(FAILED, f"exception: {str(e)[:200]}", job_summary)
+
+
+class SharedLinks:
+    """(index, link) pairs handed out to the workers one at a time, read lazily from the link source."""
+
+    def __init__(self, indexed_links):
+        self.links = iter(indexed_links)
+        self.lock = threading.Lock()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        with self.lock:
+            return next(self.links)
+
+
+def run_worker(worker_id: int, indexed_links, memory_data: dict, plan_cache, writer, worker_stats: dict, driver_pool,
+               prefetcher=None, memory_index=None, prescreener=None, field_mapper=None):
+    """
+    Worker loop: owns one browser and HandsTool, processes links until the source is exhausted.
+
+    Args:
+        worker_id (int): Worker number (for logs and stats).
+        indexed_links: Iterable of (index, link) pairs (shared by all workers in pool mode).
+        memory_data (dict): Candidate memory.
+        plan_cache (PlanCache | None): Shared plan cache.
+        writer (OrderedResultWriter): Records results in input order.
+        worker_stats (dict): Filled with this worker's throughput stats.
+        driver_pool (DriverPool): Warm browsers (recycled after N links or a crash).
+        prefetcher (Prefetcher | None): Pipelines the next links (sequential mode only).
+        memory_index (MemoryIndex | None): Shared memory index.
+        prescreener (Prescreener | None): Holds the job summaries found before the browser.
+        field_mapper (FieldMapper | None): Shared memory field mapper.
+    """
+    started = time.time()
+    processed = 0
+    driver = None
+    try:
+        driver = driver_pool.acquire()
+        hands = HandsTool(driver)
+        if prefetcher:
+            indexed_links = prefetcher.iterate(indexed_links)
+
+        with log_context(worker=worker_id):
+            log_event(f"👷 Worker {worker_id} started.")
+            for index, link in indexed_links:
+                job_summary, summary_known = prescreener.take(link) if prescreener else ({}, False)
+                with log_context(link=link):
+                    result = process_link(driver, hands, link, memory_data, plan_cache, prefetcher, memory_index,
+                                          job_summary, summary_known, field_mapper)
+                    log_network_stats(driver)
+                writer.submit(index, link, result)
+                processed += 1
+
+                # ♻️ Swap in a fresh browser if this one is worn out or crashed
+                next_driver = driver_pool.after_link(driver)
+                if next_driver is not driver:
+                    driver = next_driver
+                    hands = HandsTool(driver)
+
+    except Exception as e:
+        log_event(f"❌ Worker {worker_id} crashed: {str(e)}")
+
+    finally:
+        driver_pool.release(driver)
+        elapsed = time.time() - started
+        worker_stats[worker_id] = {
+            "links": processed,
+            "seconds": round(elapsed, 1),
+            "links_per_hour": round(processed * 3600 / elapsed, 1) if elapsed else 0.0,
+        }
+
+
+def run(job_links, memory_data: dict, workers: int = 1, prefetch: int = 0, profile_trace: str = None,
+        prescreen: bool = PRESCREEN_ENABLED):
+    """
+    Processes all job links with one or more browser workers.
+
+    job_links can be a list or a stream (e.g. a LinkReader); links are pulled as
+    workers become free, so a stream is never held in memory.
+    Results are written in the order of job_links, so the output matches a sequential run.
+    With a single worker, `prefetch` upcoming links are loaded and planned in the background.
+    With `prescreen`, jobs whose structured data fails the filters are skipped before any browser work.
+    A per-stage timing summary is logged at the end; `profile_trace` also writes it as Chrome trace JSON.
+    """
+    plan_cache = PlanCache() if PLAN_CACHE_ENABLED else None
+    memory_index = MemoryIndex(memory_data) if MEMORY_INDEX_ENABLED else None
+    field_mapper = FieldMapper(memory_data, memory_index) if FIELD_MAPPER_ENABLED else None
+    writer = OrderedResultWriter()
+    prescreener = Prescreener(memory_data) if prescreen else None
+    indexed_links = enumerate(job_links)
+    if prescreener:
+        indexed_links = prescreener.iterate(indexed_links, writer)
+    shared_links = SharedLinks(indexed_links)
+
+    worker_stats = {}
+    if isinstance(job_links, list):
+        workers = min(workers, len(job_links) or 1)
+    workers = max(1, workers)
+    driver_pool = DriverPool(size=workers)
+    if workers == 1:
+        prefetcher = Prefetcher(memory_data, depth=prefetch, memory_index=memory_index, prescreener=prescreener,
+                                field_mapper=field_mapper) if prefetch > 0 else None
+        try:
+            run_worker(1, shared_links, memory_data, plan_cache, writer, worker_stats, driver_pool,
+                       prefetcher, memory_index, prescreener, field_mapper)
+        finally:
+            if prefetcher:
+                prefetcher.close()
+    else:
+        if prefetch > 0:
+            log_event("ℹ️ Prefetch is only used with a single worker, ignoring --prefetch.")
+        log_event(f"👷 Starting {workers} browser workers.")
+        threads = [
+            threading.Thread(
+                target=run_worker,
+                args=(worker_id, shared_links, memory_data, plan_cache, writer, worker_stats, driver_pool,
+                      None, memory_index, prescreener, field_mapper),
+                name=f"worker-{worker_id}",
+            )
+            for worker_id in range(1, workers + 1)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    driver_pool.close()
+
+    # 🧾 Links a crashed worker never reached are recorded as failed
+    for index, link in shared_links:
+        writer.submit(index, link, ("Failed", {}, "not reached: worker crashed"))
+
+    # 📊 Per-worker throughput
+    for worker_id, stats in sorted(worker_stats.items()):
+        log_event(
+            f"📊 Worker {worker_id}: {stats['links']} link(s) in {stats['seconds']}s "
+            f"({stats['links_per_hour']} links/hour)"
+        )
+    if plan_cache:
+        log_event(f"♻️ Plan cache stats: {plan_cache.stats()}")
+    if prescreener:
+        log_event(f"🔍 Pre-screen stats: {prescreener.stats()}")
+    log_event(f"🚦 LLM scheduler stats: {scheduler.stats()}")
+    if response_cache.enabled:
+        log_event(f"💽 Response cache stats: {response_cache.stats()}")
+
+    # ⏱️ Where the time went: p50/p95 per stage, slowest links, optional trace
+    profiler.log_summary()
+    if profile_trace:
+        profiler.write_trace(profile_trace)
+        log_event(f"⏱️ Chrome trace written to {profile_trace} (open in chrome://tracing or ui.perfetto.dev).")
+
+    # 📒 Token/cost ledger next to the results CSV
+    ledger_file = os.path.join(os.path.dirname(OUTPUT_FILE), f"token_ledger_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv")
+    ledger.write(ledger_file)
+    log_event(f"📒 LLM usage: {ledger.totals()} ➔ {ledger_file}")
+
+    # 🗄️ Commit results and refresh the CSV export
+    get_results_store().flush()
+    export_results_csv()
+
+
+def dry_run(job_links, memory_data: dict, prescreen: bool = PRESCREEN_ENABLED):
+    """Reads (and pre-screens) the links and reports what a run would process, without a browser or Gemini."""
+    prescreener = Prescreener(memory_data) if prescreen else None
+    if prescreener:
+        job_links = (link for _, link in prescreener.iterate(enumerate(job_links)))
+    counts = domain_counts(job_links)
+    if prescreener:
+        log_event(f"🔍 Pre-screen stats: {prescreener.stats()}")
+    log_event(f"🧪 Dry run: {sum(counts.values())} link(s) on {len(counts)} domain(s) would be processed.")
+    for domain, count in counts.most_common(10):
+        log_event(f"   {domain}: {count}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="AI Job Application Agent")
+    parser.add_argument("--links", default="input/job_links.csv", help="CSV, JSONL or text file of job links")
+    parser.add_argument("--workers", type=int, default=1, help="Number of parallel browser workers")
+    parser.add_argument("--prefetch", type=int, default=0, help="Links to load and plan ahead (single worker only)")
+    parser.add_argument("--resume", action="store_true", help="Skip links already finished, retry only failures")
+    parser.add_argument("--group-by-domain", action="store_true", help="Process links of the same site one after another")
+    parser.add_argument("--no-prescreen", action="store_true", help="Send every link to the browser, skip no job up front")
+    parser.add_argument("--dry-run", action="store_true", help="Only read the links and report what would be processed")
+    parser.add_argument("--llm-cache", choices=RESPONSE_CACHE_MODES,
+                        help="Record Gemini responses to disk, or replay them without calling Gemini")
+    parser.add_argument("--profile-trace", metavar="PATH", help="Write per-stage timings as Chrome trace JSON")
+    args = parser.parse_args()
+    if args.llm_cache:
+        response_cache.mode = args.llm_cache
+
+    job_links = load_job_links(args.links, resume=args.resume)
+    if args.group_by_domain:
+        job_links = group_by_domain(job_links)
+    memory_data = load_memory()
+
+    # ⏱️ Cold start: imports plus reading the inputs, until the first browser is requested
+    log_event(f"🚀 Cold start: {IMPORT_SECONDS:.2f}s imports, ready after {time.perf_counter() - IMPORT_STARTED:.2f}s.")
+
+    if args.dry_run:
+        dry_run(job_links, memory_data, prescreen=PRESCREEN_ENABLED and not args.no_prescreen)
+    else:
+        run(job_links, memory_data, workers=args.workers, prefetch=args.prefetch, profile_trace=args.profile_trace,
+            prescreen=PRESCREEN_ENABLED and not args.no_prescreen)
+
+        # 🛑 All links done
+        log_event("✅ All job links processed and browser closed.")
+    shutdown_logger()
+
 
-# 🛑 All links done
-driver.quit()
-log_event("✅ All job links processed and browser closed.")
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+# src/tools/batch_fill.py
+
+# 🛠️ Project imports
+from src.tools.logger_tool import log_event
+from src.tools.element_resolver import parse_selector
+
+# ⚡ Action types that can be applied page-side without real key events
+BATCHABLE_TYPES = {"type": "text", "check": None, "select": "option_text"}
+
+# 📜 Applies a list of actions in one execute_script call.
+#    Values go through the native value setter so React/Vue controlled inputs see the change,
+#    then input/change/blur events are dispatched. Returns one boolean per action.
+BATCH_FILL_SCRIPT = """
+var actions = arguments[0];
+
+function resolve(by, selector) {
+    try {
+        if (by === 'xpath') {
+            return document.evaluate(selector, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+        }
+        if (by === 'id') return document.getElementById(selector);
+        if (by === 'name') return document.getElementsByName(selector)[0] || null;
+        return document.querySelector(selector);
+    } catch (e) {
+        return null;
+    }
+}
+
+function fire(el, names) {
+    names.forEach(function (name) { el.dispatchEvent(new Event(name, {bubbles: true})); });
+}
+
+function apply(action) {
+    var el = resolve(action.by, action.selector);
+    if (!el || el.disabled) return false;
+
+    if (action.type === 'type') {
+        var proto = el instanceof HTMLTextAreaElement ? HTMLTextAreaElement.prototype
+                  : el instanceof HTMLInputElement ? HTMLInputElement.prototype : null;
+        if (!proto || el.readOnly || el.type === 'file') return false;
+        el.focus();
+        Object.getOwnPropertyDescriptor(proto, 'value').set.call(el, action.text);
+        fire(el, ['input', 'change']);
+        el.blur();
+        return el.value === action.text;
+    }
+
+    if (action.type === 'check') {
+        if (!(el instanceof HTMLInputElement)) return false;
+        if (!el.checked) el.click();
+        return el.checked;
+    }
+
+    if (action.type === 'select') {
+        if (!(el instanceof HTMLSelectElement)) return false;
+        var wanted = action.option_text.trim();
+        for (var i = 0; i < el.options.length; i++) {
+            if (el.options[i].text.trim() === wanted) {
+                el.selectedIndex = i;
+                fire(el, ['input', 'change']);
+                return true;
+            }
+        }
+        return false;
+    }
+    return false;
+}
+
+return actions.map(function (action) {
+    try {
+        return apply(action);
+    } catch (e) {
+        return false;
+    }
+});
+"""
+
+
+def is_batchable(action: dict) -> bool:
+    """Returns True if the action can be applied by the batch script."""
+    action_type = action.get("type")
+    if action_type not in BATCHABLE_TYPES or not action.get("selector"):
+        return False
+    value_key = BATCHABLE_TYPES[action_type]
+    return value_key is None or bool(action.get(value_key))
+
+
+def fill_batch(driver, actions: list) -> list:
+    """
+    Applies type/check/native-select actions in a single WebDriver round trip.
+
+    Args:
+        driver: Selenium WebDriver.
+        actions (list): Batchable actions (see is_batchable).
+
+    Returns:
+        list: One bool per action; False entries should be retried one by one.
+    """
+    payload = []
+    for action in actions:
+        by, selector = parse_selector(action.get("selector"))
+        payload.append({"type": action.get("type"), "by": by, "selector": selector,
+                        "text": action.get("text"), "option_text": action.get("option_text")})
+    try:
+        results = driver.execute_script(BATCH_FILL_SCRIPT, payload) or []
+    except Exception as e:
+        log_event(f"⚠️ Batch fill script failed: {str(e)}")
+        results = []
+
+    results = [bool(result) for result in results] + [False] * (len(actions) - len(results))
+    log_event(f"⚡ Batch filled {sum(results)}/{len(actions)} action(s) in one round trip.")
+    return results
@@ -0,0 +1,363 @@
+# src/tools/dom_distiller.py
+
+# 📦 Import libraries
+import hashlib
+import json
+import re
+from html.parser import HTMLParser
+
+# 🚫 Subtrees that never contain anything the agent can interact with
+SKIP_TAGS = {"script", "style", "svg", "noscript", "template", "iframe", "canvas", "object", "video", "audio", "picture"}
+
+# 🧱 Tags that never have a closing tag (not pushed on the element stack)
+VOID_TAGS = {"area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "param", "source", "track", "wbr"}
+
+# ✍️ Interactive tags
+FIELD_TAGS = {"input", "textarea", "select"}
+BUTTON_INPUT_TYPES = {"submit", "button", "reset", "image"}
+
+# 🙈 Inputs that are often visually hidden but still usable by Selenium (custom widgets)
+KEEP_WHEN_HIDDEN = {"file", "checkbox", "radio"}
+
+# 🔗 Links are only kept as buttons when they look like part of the apply flow
+ACTION_LINK_WORDS = ("apply", "next", "continue", "submit", "review", "start", "accept", "sign in", "log in", "upload")
+
+# 📏 Limits keeping the model compact
+MAX_TEXT_CHARS = 1500
+MAX_LABEL_CHARS = 120
+MAX_OPTIONS = 60
+
+HIDDEN_STYLE = re.compile(r"display\s*:\s*none|visibility\s*:\s*hidden", re.IGNORECASE)
+WHITESPACE = re.compile(r"\s+")
+
+
+def _clean(text: str, limit: int = MAX_LABEL_CHARS) -> str:
+    """Collapse whitespace and cut text to a maximum length."""
+    text = WHITESPACE.sub(" ", text or "").strip()
+    return text[:limit]
+
+
+def _is_hidden(attrs: dict) -> bool:
+    """Returns True if the attributes mark the element as not rendered."""
+    if "hidden" in attrs or attrs.get("aria-hidden") == "true":
+        return True
+    return bool(HIDDEN_STYLE.search(attrs.get("style") or ""))
+
+
+def _xpath_literal(value: str) -> str:
+    """Quotes a value for use inside an XPath expression."""
+    if "'" not in value:
+        return f"'{value}'"
+    if '"' not in value:
+        return f'"{value}"'
+    parts = value.split("'")
+    return "concat(" + ", \"'\", ".join(f"'{p}'" for p in parts) + ")"
+
+
+class _FormModelParser(HTMLParser):
+    """Single pass over the page HTML collecting fields, buttons and visible text."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.stack = [{"tag": "#root", "path": "", "counts": {}, "hidden": False}]
+        self.skip_depth = 0
+        self.fields = []
+        self.buttons = []
+        self.skeleton = []
+        self.text_chunks = []
+        self.text_length = 0
+        self.title = ""
+        self.label_for = {}
+        self.fields_by_id = {}
+        self.open_labels = []
+        self.open_select = None
+        self.open_option = None
+        self.open_button = None
+        self.open_textarea = None
+        self.in_title = False
+        self.last_text = ""
+
+    # 🧭 Element stack handling
+    def _push(self, tag: str, attrs: dict) -> dict:
+        parent = self.stack[-1]
+        index = parent["counts"].get(tag, 0) + 1
+        parent["counts"][tag] = index
+        node = {
+            "tag": tag,
+            "path": f"{parent['path']}/{tag}[{index}]",
+            "counts": {},
+            "hidden": parent["hidden"] or _is_hidden(attrs),
+        }
+        return node
+
+    def _xpath(self, tag: str, attrs: dict, node: dict) -> str:
+        """Builds the most stable XPath available: id, then name(+value), then position."""
+        if attrs.get("id"):
+            return f"//{tag}[@id={_xpath_literal(attrs['id'])}]"
+        if attrs.get("name"):
+            xpath = f"//{tag}[@name={_xpath_literal(attrs['name'])}]"
+            if attrs.get("type") in ("radio", "checkbox") and attrs.get("value"):
+                xpath = xpath[:-1] + f" and @value={_xpath_literal(attrs['value'])}]"
+            return xpath
+        return node["path"]
+
+    def handle_starttag(self, tag, attrs):
+        attrs = {k: (v if v is not None else "") for k, v in attrs}
+
+        if self.skip_depth:
+            if tag not in VOID_TAGS:
+                self.skip_depth += 1
+            return
+        if tag in SKIP_TAGS:
+            self._push(tag, attrs)  # Keeps sibling positions correct
+            self.skip_depth = 1
+            return
+        if tag == "title":
+            self.in_title = True
+
+        node = self._push(tag, attrs)
+        if tag not in VOID_TAGS:
+            self.stack.append(node)
+
+        if tag == "label":
+            self.open_labels.append({"for": attrs.get("for"), "text": [], "fields": []})
+        elif tag in FIELD_TAGS:
+            self._start_field(tag, attrs, node)
+        elif tag == "option" and self.open_select is not None:
+            self.open_option = []
+        elif tag == "button" or (tag == "a" and (attrs.get("role") == "button" or attrs.get("href") is not None)):
+            if not node["hidden"]:
+                self.open_button = {"tag": tag, "attrs": attrs, "xpath": self._xpath(tag, attrs, node), "text": []}
+
+    def _start_field(self, tag: str, attrs: dict, node: dict):
+        field_type = (attrs.get("type") or ("text" if tag == "input" else tag)).lower()
+        if field_type == "hidden":
+            return
+        if node["hidden"] and field_type not in KEEP_WHEN_HIDDEN:
+            return
+
+        if tag == "input" and field_type in BUTTON_INPUT_TYPES:
+            self._add_button("input", attrs, self._xpath(tag, attrs, node), attrs.get("value") or field_type)
+            return
+
+        field = {"xpath": self._xpath(tag, attrs, node), "tag": tag, "type": field_type}
+        label = attrs.get("aria-label") or self.label_for.get(attrs.get("id"), "")
+        for key, value in (("name", attrs.get("name")), ("label", label), ("placeholder", attrs.get("placeholder"))):
+            if value:
+                field[key] = _clean(value)
+        if "required" in attrs or attrs.get("aria-required") == "true":
+            field["required"] = True
+        if field_type in ("checkbox", "radio") and attrs.get("value"):
+            field["value"] = _clean(attrs["value"])
+        if not field.get("label") and self.last_text:
+            field["context"] = self.last_text
+            self.last_text = ""
+
+        self.fields.append(field)
+        if attrs.get("id"):
+            self.fields_by_id[attrs["id"]] = field
+        self.skeleton.append(f"{field['xpath']}:{field_type}")
+        if self.open_labels:
+            self.open_labels[-1]["fields"].append(field)
+        if tag == "select":
+            field["options"] = []
+            self.open_select = field
+        elif tag == "textarea":
+            self.open_textarea = field
+
+    def _add_button(self, tag: str, attrs: dict, xpath: str, text: str):
+        text = _clean(text) or _clean(attrs.get("aria-label", ""))
+        if tag == "a" and attrs.get("role") != "button":
+            if not any(word in text.lower() for word in ACTION_LINK_WORDS):
+                return
+        self.buttons.append({"xpath": xpath, "tag": tag, "text": text})
+        self.skeleton.append(f"{xpath}:{attrs.get('type', '')}")
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        if tag not in VOID_TAGS:
+            self.handle_endtag(tag)
+
+    def handle_endtag(self, tag):
+        if self.skip_depth:
+            self.skip_depth -= 1
+            return
+        if tag == "title":
+            self.in_title = False
+
+        if tag == "label" and self.open_labels:
+            label = self.open_labels.pop()
+            text = _clean(" ".join(label["text"]))
+            targets = list(label["fields"])
+            if label["for"]:
+                self.label_for[label["for"]] = text
+                if label["for"] in self.fields_by_id:
+                    targets.append(self.fields_by_id[label["for"]])
+            for field in targets:
+                if text and not field.get("label"):
+                    field["label"] = text
+                    field.pop("context", None)
+        elif tag == "option" and self.open_option is not None:
+            if len(self.open_select["options"]) < MAX_OPTIONS:
+                self.open_select["options"].append(_clean(" ".join(self.open_option)))
+            self.open_option = None
+        elif tag == "select":
+            self.open_select = None
+        elif tag == "textarea":
+            self.open_textarea = None
+        elif tag in ("button", "a") and self.open_button and self.open_button["tag"] == tag:
+            button = self.open_button
+            self.open_button = None
+            self._add_button(tag, button["attrs"], button["xpath"], " ".join(button["text"]))
+
+        # 🧭 Pop up to (and including) the matching open element
+        for depth in range(len(self.stack) - 1, 0, -1):
+            if self.stack[depth]["tag"] == tag:
+                del self.stack[depth:]
+                break
+
+    def handle_data(self, data):
+        if self.skip_depth:
+            return
+        if self.in_title:
+            self.title = _clean(self.title + " " + data)
+            return
+        text = _clean(data)
+        if not text or self.stack[-1]["hidden"]:
+            return
+
+        if self.open_option is not None:
+            self.open_option.append(text)
+            return
+        for label in self.open_labels:
+            label["text"].append(text)
+        if self.open_button is not None:
+            self.open_button["text"].append(text)
+            return
+        if self.open_textarea is not None:
+            return
+
+        self.last_text = text[:MAX_LABEL_CHARS]
+        if self.text_length < MAX_TEXT_CHARS:
+            self.text_chunks.append(text)
+            self.text_length += len(text) + 1
+
+
+def distill_dom(dom_html: str) -> dict:
+    """
+    Reduces raw page HTML to a compact model of what can be interacted with.
+
+    Scripts, styles, SVGs, hidden nodes and other non-interactive markup are dropped.
+    Each field and button keeps a stable XPath (id, then name, then position).
+
+    Args:
+        dom_html (str): Full HTML source of the current page.
+
+    Returns:
+        dict: Form model with "title", "fields", "buttons", "text" and "skeleton".
+    """
+    parser = _FormModelParser()
+    parser.feed(dom_html or "")
+    parser.close()
+
+    text = " ".join(parser.text_chunks)[:MAX_TEXT_CHARS]
+    return {
+        "title": parser.title,
+        "fields": parser.fields,
+        "buttons": parser.buttons,
+        "text": text,
+        "skeleton": parser.skeleton,
+    }
+
+
+def render_form_model(form_model: dict) -> str:
+    """
+    Serializes a form model into compact JSON for the LLM prompt.
+
+    Args:
+        form_model (dict): Output of distill_dom().
+
+    Returns:
+        str: Compact JSON string (skeleton and tag names excluded, the XPaths carry the tag).
+    """
+    visible = {key: value for key, value in form_model.items() if key != "skeleton" and value}
+    for key in ("fields", "buttons"):
+        if key in visible:
+            visible[key] = [{k: v for k, v in item.items() if k != "tag"} for item in visible[key]]
+    return json.dumps(visible, ensure_ascii=False, separators=(",", ":"))
+
+
+def field_labels(form_model: dict) -> list:
+    """
+    Returns every label-like string of the form fields (label, placeholder, name, context).
+
+    Args:
+        form_model (dict): Output of distill_dom().
+
+    Returns:
+        list: Strings describing what each field asks for.
+    """
+    labels = []
+    for field in form_model.get("fields", []):
+        for key in ("label", "placeholder", "name", "context"):
+            if field.get(key):
+                labels.append(field[key])
+    return labels
+
+
+def page_fingerprint(form_model: dict):
+    """
+    Hashes the tag/attribute skeleton of a form model (text removed).
+
+    Pages built from the same ATS template share a fingerprint even when
+    the job text differs.
+
+    Args:
+        form_model (dict): Output of distill_dom().
+
+    Returns:
+        str | None: Hex digest, or None if the page has nothing interactive.
+    """
+    if not form_model.get("skeleton"):
+        return None
+    return hashlib.sha1("\n".join(form_model["skeleton"]).encode("utf-8")).hexdigest()
+
+
+def diff_form_models(previous: dict, current: dict) -> dict:
+    """
+    Structural diff between two form models of the same link.
+
+    Fields and buttons are matched by XPath; anything new or changed is kept,
+    unchanged items are only counted.
+
+    Args:
+        previous (dict): Form model from the previous step.
+        current (dict): Form model of the page now.
+
+    Returns:
+        dict: "fields"/"buttons" that are new or changed, "removed" XPaths,
+              "text" if the visible text changed, "unchanged" count and
+              "ratio" (changed items / current items).
+    """
+    delta = {"fields": [], "buttons": [], "removed": []}
+    unchanged = 0
+    for key in ("fields", "buttons"):
+        before = {item["xpath"]: item for item in previous.get(key, [])}
+        now = {item["xpath"] for item in current.get(key, [])}
+        for item in current.get(key, []):
+            if before.get(item["xpath"]) == item:
+                unchanged += 1
+            else:
+                delta[key].append(item)
+        delta["removed"].extend(xpath for xpath in before if xpath not in now)
+
+    if current.get("text") != previous.get("text"):
+        delta["text"] = current.get("text", "")
+    if current.get("title") != previous.get("title"):
+        delta["title"] = current.get("title", "")
+
+    total = len(current.get("fields", [])) + len(current.get("buttons", []))
+    changed = len(delta["fields"]) + len(delta["buttons"])
+    delta["unchanged"] = unchanged
+    delta["ratio"] = changed / total if total else 1.0
+    return delta
@@ -0,0 +1,160 @@
+# src/tools/element_resolver.py
+
+# 📦 Import libraries
+import re
+from selenium.common.exceptions import NoSuchElementException, StaleElementReferenceException
+
+# 🛠️ Project imports
+from src.browser.waits import BY_TYPES
+from src.tools.logger_tool import log_event
+
+# 🏷️ Explicit selector prefixes Gemini sometimes emits, e.g. "name=email" or "css=#apply"
+SELECTOR_PREFIX = re.compile(r"^(xpath|css|id|name)\s*[=:]\s*", re.IGNORECASE)
+
+# 📜 Resolves many selectors in one round trip. Returns [pageId, element-or-null, ...];
+#    pageId is set once per document, so a new value means every cached handle is gone.
+RESOLVE_SCRIPT = """
+var specs = arguments[0];
+if (!window.__agentPageId) {
+    window.__agentPageId = Date.now().toString(36) + Math.random().toString(36).slice(2);
+}
+var found = [window.__agentPageId];
+specs.forEach(function (spec) {
+    var el = null;
+    try {
+        if (spec[0] === 'xpath') {
+            el = document.evaluate(spec[1], document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+        } else if (spec[0] === 'css') {
+            el = document.querySelector(spec[1]);
+        } else if (spec[0] === 'id') {
+            el = document.getElementById(spec[1]);
+        } else if (spec[0] === 'name') {
+            el = document.getElementsByName(spec[1])[0] || null;
+        }
+    } catch (e) {
+        el = null;
+    }
+    found.push(el && el.nodeType === 1 ? el : null);
+});
+return found;
+"""
+
+
+def parse_selector(selector: str, by: str = None) -> tuple:
+    """
+    Works out the selector type when it is not given.
+
+    "xpath=", "css=", "id=" and "name=" prefixes win; otherwise selectors
+    starting with "/", "./" or "(" are XPath and everything else is CSS.
+
+    Args:
+        selector (str): Selector from the plan.
+        by (str): Explicit type (xpath, css, id, name), or None to detect it.
+
+    Returns:
+        tuple: (by, selector without prefix)
+    """
+    selector = (selector or "").strip()
+    if by:
+        return by, selector
+    match = SELECTOR_PREFIX.match(selector)
+    if match:
+        return match.group(1).lower(), selector[match.end():].strip()
+    if selector.startswith(("/", "./", "(")):
+        return "xpath", selector
+    return "css", selector
+
+
+class ElementResolver:
+    """
+    Single lookup layer for HandsTool.
+
+    Element handles are cached per page. `resolve_all` looks up every selector
+    of a plan in one script call; `resolve` falls back to find_element for
+    selectors that were not on the page yet. A handle that went stale (the
+    page navigated or re-rendered the node) is dropped and looked up again
+    by `use`.
+    """
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.cache = {}
+        self.page_id = None
+        self.hits = 0
+        self.lookups = 0
+
+    def resolve_all(self, selectors: list) -> int:
+        """
+        Resolves and caches many selectors with one WebDriver call.
+
+        Args:
+            selectors (list): Selectors (types are auto-detected).
+
+        Returns:
+            int: Number of selectors found on the page.
+        """
+        specs = list(dict.fromkeys(parse_selector(s) for s in selectors if s))
+        specs = [spec for spec in specs if spec[0] in BY_TYPES]
+        if not specs:
+            return 0
+        try:
+            found = self.driver.execute_script(RESOLVE_SCRIPT, [list(spec) for spec in specs])
+        except Exception as e:
+            log_event(f"⚠️ Bulk element lookup failed: {str(e)}")
+            return 0
+
+        page_id, elements = found[0], found[1:]
+        if page_id != self.page_id:
+            self.cache.clear()
+            self.page_id = page_id
+        self.lookups += 1
+        resolved = 0
+        for spec, element in zip(specs, elements):
+            if element is not None:
+                self.cache[spec] = element
+                resolved += 1
+        return resolved
+
+    def resolve(self, selector: str, by: str = None):
+        """
+        Returns the element for a selector, from the cache when possible.
+
+        Raises:
+            NoSuchElementException: If the selector matches nothing (or its type is unsupported).
+        """
+        spec = parse_selector(selector, by)
+        if spec[0] not in BY_TYPES:
+            raise NoSuchElementException(f"Unsupported selector type: {spec[0]}")
+        if spec in self.cache:
+            self.hits += 1
+            return self.cache[spec]
+
+        self.lookups += 1
+        element = self.driver.find_element(BY_TYPES[spec[0]], spec[1])
+        self.cache[spec] = element
+        return element
+
+    def invalidate(self, selector: str = None, by: str = None):
+        """Drops one cached handle, or all of them."""
+        if selector is None:
+            self.cache.clear()
+        else:
+            self.cache.pop(parse_selector(selector, by), None)
+
+    def use(self, selector: str, operation, by: str = None):
+        """
+        Runs operation(element), looking the element up again once if its handle is stale.
+
+        Args:
+            selector (str): Element selector.
+            operation (callable): Receives the WebElement.
+            by (str): Selector type, or None to detect it.
+
+        Returns:
+            Whatever the operation returns.
+        """
+        try:
+            return operation(self.resolve(selector, by))
+        except StaleElementReferenceException:
+            self.invalidate(selector, by)
+            return operation(self.resolve(selector, by))
@@ -0,0 +1,241 @@
+# src/tools/field_mapper.py
+
+# 📦 Import libraries
+import difflib
+import re
+
+# 🛠️ Project imports
+from config.settings import FIELD_MAPPER_CUTOFF, FIELD_MAPPER_MIN_COVERAGE
+from src.tools.memory_index import MemoryIndex, normalize_label
+from src.tools.logger_tool import log_event
+
+# 🙊 Words that carry no meaning in a form label ("Please enter your e-mail")
+STOPWORDS = {
+    "a", "an", "the", "your", "you", "my", "please", "enter", "provide", "what", "is", "are", "of", "to", "in",
+    "on", "for", "do", "this", "us", "our", "here", "optional", "required", "select", "choose", "type",
+}
+
+# 👥 Words that make a label ask about someone other than the candidate ("Last name of reference")
+QUALIFIERS = {
+    "reference", "references", "referee", "referrer", "emergency", "manager", "supervisor", "spouse", "partner",
+    "parent", "guardian", "relative", "recruiter", "hiring", "employer", "company", "school", "previous", "former",
+}
+
+# 📅 Labels asking for a date need a value that looks like one ("Start date" is not "Immediate")
+DATE_WORDS = {"date", "dob"}
+
+# ✍️ Field types filled by typing a memory value
+TEXT_TYPES = {"text", "email", "tel", "url", "search"}
+
+# 🏷️ Input types that name their memory key even when the label does not
+TYPE_HINTS = {"email": "Email", "tel": "Phone"}
+
+# ⏭️ Button texts that move an application forward (clicked without Gemini only when unambiguous)
+SUBMIT_WORDS = ("apply", "submit", "next", "continue", "review")
+
+# 📏 Longer memory values are free text (e.g. a work history) and left to Gemini
+MAX_VALUE_CHARS = 200
+
+# 🔢 Placeholder options such as "Select..." or "--"
+PLACEHOLDER_OPTION = re.compile(r"^(select|choose|please select|--|-)\b", re.IGNORECASE)
+
+
+def _content_words(text: str) -> list:
+    """Normalized words of a label without stopwords."""
+    return [word for word in normalize_label(text).split() if word not in STOPWORDS]
+
+
+def _name_label(name: str) -> str:
+    """Last segment of a field name, e.g. 'job_application[answers][email]' ➔ 'email'."""
+    parts = re.findall(r"[A-Za-z0-9_\-]+", name or "")
+    return parts[-1].replace("_", " ").replace("-", " ") if parts else ""
+
+
+def match_option(value: str, options: list):
+    """
+    Picks the option of a select (or radio group) that expresses a memory value.
+
+    Exact match first, then options containing every word of the value (or the
+    other way round), then difflib similarity.
+
+    Returns:
+        str | None: The option text, or None if no single option fits.
+    """
+    target = normalize_label(value)
+    choices = [(option, normalize_label(option)) for option in options
+               if normalize_label(option) and not PLACEHOLDER_OPTION.match(option.strip())]
+    if not target or not choices:
+        return None
+
+    exact = [option for option, text in choices if text == target]
+    if exact:
+        return exact[0]
+
+    target_words = set(target.split())
+    covering = [
+        (option, text) for option, text in choices
+        if target_words <= set(text.split()) or set(text.split()) <= target_words
+    ]
+    if covering:
+        ranked = sorted(covering, key=lambda c: difflib.SequenceMatcher(None, target, c[1]).ratio(), reverse=True)
+        if len(ranked) == 1 or ranked[0][1] != ranked[1][1]:
+            return ranked[0][0]
+        return None
+
+    close = difflib.get_close_matches(target, [text for _, text in choices], n=1, cutoff=FIELD_MAPPER_CUTOFF)
+    return next((option for option, text in choices if close and text == close[0]), None)
+
+
+class FieldMapper:
+    """
+    Maps standard form fields to candidate memory without Gemini.
+
+    A field is mapped when one memory key's name or synonym (MemoryIndex
+    phrases) covers most of the field's label, placeholder or name, or the
+    label is a one-word misspelling of it. Labels about someone else
+    ("Phone of emergency contact") only map when a phrase covers them whole. Text fields get a "type" action, selects
+    and radio groups the option matching the memory value. Free-text
+    questions (textareas), uploads, checkboxes and anything ambiguous are
+    left for Gemini.
+    """
+
+    def __init__(self, memory_data: dict, memory_index: MemoryIndex = None,
+                 min_coverage: float = FIELD_MAPPER_MIN_COVERAGE, cutoff: float = FIELD_MAPPER_CUTOFF):
+        """
+        Args:
+            memory_data (dict): Candidate memory.
+            memory_index (MemoryIndex | None): Shared index (built here if not given).
+            min_coverage (float): Share of a label's words a memory phrase must cover.
+            cutoff (float): difflib ratio for near-miss labels (e.g. "Zip-code" for "zipcode").
+        """
+        index = memory_index or MemoryIndex(memory_data)
+        self.min_coverage = min_coverage
+        self.cutoff = cutoff
+        self.values = {}
+        self.phrases = {}
+        for flat_key, value in index.flat.items():
+            entry = index.entries[flat_key]
+            if entry["nested"] or len(value) > MAX_VALUE_CHARS or "\n" in value:
+                continue  # Work history, education etc. need judgement
+            self.values[flat_key] = value
+            for phrase in entry["top"] | entry["leaf"]:
+                if phrase:
+                    self.phrases.setdefault(phrase, set()).add(flat_key)
+        self.cache = {}
+
+    def key_for(self, text: str):
+        """
+        Memory key asked for by one label-like string.
+
+        Returns:
+            str | None: The single best key, or None if nothing (or more than one key) fits.
+        """
+        words = _content_words(text)
+        if not words:
+            return None
+        label = " ".join(words)
+        if label in self.cache:
+            return self.cache[label]
+
+        padded = f" {normalize_label(text)} "
+        qualified = any(word in QUALIFIERS for word in words)
+        scores = {}
+        for phrase, keys in self.phrases.items():
+            if f" {phrase} " in padded:
+                covered = len([w for w in phrase.split() if w not in STOPWORDS])
+                if qualified and covered < len(words):
+                    continue  # The phrase names the field, the extra words name whose it is
+                coverage = covered / len(words)
+            elif self._typo_of(label, phrase):
+                # 🔤 A misspelt single word scores its similarity, so an exact phrase always wins
+                coverage = difflib.SequenceMatcher(None, label, phrase).ratio()
+            else:
+                continue
+            for key in keys:
+                scores[key] = max(scores.get(key, 0.0), coverage)
+
+        best = max(scores.values(), default=0.0)
+        winners = [key for key, score in scores.items() if score == best]
+        key = winners[0] if best >= self.min_coverage and len(winners) == 1 else None
+        if key and DATE_WORDS & set(words) and not re.search(r"\d", self.values[key]):
+            key = None
+        self.cache[label] = key
+        return key
+
+    def _typo_of(self, label: str, phrase: str) -> bool:
+        """
+        True if a one-word label is a misspelling of a one-word phrase ("adress" for "address").
+
+        Words where one contains the other ("location" in "relocation") are different words, not typos.
+        """
+        if " " in label or " " in phrase or label in phrase or phrase in label:
+            return False
+        if abs(len(label) - len(phrase)) > 2:
+            return False
+        return difflib.SequenceMatcher(None, label, phrase).ratio() >= self.cutoff
+
+    def field_key(self, field: dict):
+        """Memory key for a field: label, then placeholder, then name, then input type."""
+        for text in (field.get("label"), field.get("placeholder"), _name_label(field.get("name")), field.get("context")):
+            if text:
+                key = self.key_for(text)
+                if key:
+                    return key
+        hint = TYPE_HINTS.get(field.get("type"))
+        return hint if hint in self.values else None
+
+    def map(self, form_model: dict, allow_submit: bool = False) -> dict:
+        """
+        Builds HandsTool actions for every field answerable from memory.
+
+        Args:
+            form_model (dict): Output of distill_dom().
+            allow_submit (bool): Also click the page's single submit/next button when every field is mapped.
+
+        Returns:
+            dict: {"actions": [...], "unmatched": [fields left for Gemini], "complete": bool}
+                  "complete" means the actions cover the whole page, submit click included.
+        """
+        actions, unmatched = [], []
+        radio_groups = {}
+        for field in form_model.get("fields", []):
+            if field["type"] == "radio" and field.get("name"):
+                radio_groups.setdefault(field["name"], []).append(field)
+                continue
+
+            key = self.field_key(field) if field["type"] in TEXT_TYPES or field["tag"] == "select" else None
+            if key is None:
+                unmatched.append(field)
+            elif field["tag"] == "select":
+                option = match_option(self.values[key], field.get("options", []))
+                if option:
+                    actions.append({"type": "select", "selector": field["xpath"], "option_text": option})
+                else:
+                    unmatched.append(field)
+            else:
+                actions.append({"type": "type", "selector": field["xpath"], "text": self.values[key]})
+
+        # 🔘 Radio groups: the question is the group name (or the first radio's context), the answer its label
+        for name, radios in radio_groups.items():
+            key = self.key_for(_name_label(name)) or self.key_for(radios[0].get("context", ""))
+            options = [radio.get("label") or radio.get("value", "") for radio in radios]
+            option = match_option(self.values[key], options) if key else None
+            if option:
+                radio = radios[options.index(option)]
+                actions.append({"type": "check", "selector": radio["xpath"]})
+            else:
+                unmatched.extend(radios)
+
+        # ⏭️ Nothing left for Gemini: move on with the page's only submit/next button
+        complete = False
+        if allow_submit and not unmatched:
+            submits = [b for b in form_model.get("buttons", []) if any(w in b["text"].lower() for w in SUBMIT_WORDS)]
+            if len(submits) == 1:
+                actions.append({"type": "click", "selector": submits[0]["xpath"]})
+                complete = True
+
+        if complete:
+            log_event(f"🗺️ Whole page mapped from memory ({len(actions) - 1} field(s) + submit), no Gemini call needed.")
+        elif actions:
+            log_event(f"🗺️ Mapped {len(actions)} field(s) from memory, {len(unmatched)} left for Gemini.")
+        return {"actions": actions, "unmatched": unmatched, "complete": complete}
@@ -2,225 +2,273 @@
 
 # 📦 Import necessary libraries
 import os
-import time
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import Select, WebDriverWait
+from selenium.webdriver.support.ui import Select
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.common.action_chains import ActionChains
 from selenium.common.exceptions import NoSuchElementException, ElementClickInterceptedException
-from selenium.webdriver.support import expected_conditions as EC
 
 # 🛠️ Correct import after restructure
-from src.tools.logger_tool import log_event  # Custom logger to track steps
+from config.settings import BATCH_FILL_ENABLED, OUTCOME_OBSERVER_ENABLED
+from src.tools.logger_tool import log_event, log_context  # Custom logger to track steps
+from src.tools.batch_fill import fill_batch, is_batchable
+from src.tools.profiler import profiler
+from src.tools.element_resolver import ElementResolver, parse_selector
+from src.browser.waits import (
+    wait_for_dom_quiet,
+    wait_for_element_interactable,
+    wait_for_handle_interactable,
+    wait_for_network_idle,
+    wait_for_page_settled,
+    last_outcome,
+)
+from src.browser.outcome_observer import accept_outcome
 
 # ✋ Hands Tool: Executes actions (no thinking)
 class HandsTool:
     def __init__(self, driver):
         """Initialize HandsTool with Selenium driver."""
         self.driver = driver
+        self.resolver = ElementResolver(driver)
+        self.outcome_baseline = None  # Observer flags of the current link's job page at load (set by process_link)
 
-    def click_element(self, identifier: str, by: str = "xpath"):
-        """Clicks an element by selector (xpath, css, id, name)."""
+    def click_element(self, identifier: str, by: str = None):
+        """Clicks an element by selector (xpath, css, id, name; auto-detected if by is None)."""
         try:
-            if by == "xpath":
-                element = self.driver.find_element(By.XPATH, identifier)
-            elif by == "css":
-                element = self.driver.find_element(By.CSS_SELECTOR, identifier)
-            elif by == "id":
-                element = self.driver.find_element(By.ID, identifier)
-            elif by == "name":
-                element = self.driver.find_element(By.NAME, identifier)
-            else:
-                log_event(f"❌ Unsupported selector type: {by}")
-                return False
+            def click(element):
+                if wait_for_handle_interactable(self.driver, element, identifier) is None:
+                    raise NoSuchElementException(f"Element not interactable: {identifier}")
+                element.click()
+
+            try:
+                self.resolver.use(identifier, click, by)
+            except NoSuchElementException:
+                # ⏳ Not rendered yet: wait for it to appear by locator, then click
+                by_type, selector = parse_selector(identifier, by)
+                element = wait_for_element_interactable(self.driver, selector, by_type)
+                if element is None:
+                    raise NoSuchElementException(f"Element not interactable: {identifier}")
+                element.click()
 
-            element.click()
-            log_event(f"✅ Clicked element: {identifier} ({by})")
-            time.sleep(2)
+            log_event(f"✅ Clicked element: {identifier}")
+            wait_for_page_settled(self.driver)
             return True
 
         except (NoSuchElementException, ElementClickInterceptedException) as e:
-            log_event(f"⚠️ Failed to click: {identifier} ({by}) - {str(e)}")
+            log_event(f"⚠️ Failed to click: {identifier} - {str(e)}")
             return False
 
-    def type_text(self, identifier: str, text: str, by: str = "xpath"):
+    def type_text(self, identifier: str, text: str, by: str = None):
         """Types into an input field by selector."""
         try:
-            if by == "xpath":
-                field = self.driver.find_element(By.XPATH, identifier)
-            elif by == "css":
-                field = self.driver.find_element(By.CSS_SELECTOR, identifier)
-            elif by == "id":
-                field = self.driver.find_element(By.ID, identifier)
-            elif by == "name":
-                field = self.driver.find_element(By.NAME, identifier)
-            else:
-                log_event(f"❌ Unsupported selector type: {by}")
-                return False
+            def fill(field):
+                field.clear()
+                field.send_keys(text)
 
-            field.clear()
-            field.send_keys(text)
-            log_event(f"✅ Typed text in field: {identifier} ({by}) --> {text}")
-            time.sleep(1)
+            self.resolver.use(identifier, fill, by)
+            log_event(f"✅ Typed text in field: {identifier} --> {text}")
+            wait_for_dom_quiet(self.driver)
             return True
 
         except NoSuchElementException as e:
-            log_event(f"⚠️ Failed to type: {identifier} ({by}) - {str(e)}")
+            log_event(f"⚠️ Failed to type: {identifier} - {str(e)}")
             return False
 
-    def select_dropdown(self, identifier: str, option_text: str, by: str = "xpath"):
+    def select_dropdown(self, identifier: str, option_text: str, by: str = None):
         """Selects an option from a dropdown by visible text."""
         try:
-            if by == "xpath":
-                dropdown = Select(self.driver.find_element(By.XPATH, identifier))
-            elif by == "css":
-                dropdown = Select(self.driver.find_element(By.CSS_SELECTOR, identifier))
-            elif by == "id":
-                dropdown = Select(self.driver.find_element(By.ID, identifier))
-            elif by == "name":
-                dropdown = Select(self.driver.find_element(By.NAME, identifier))
-            else:
-                log_event(f"❌ Unsupported selector type: {by}")
-                return False
-
-            dropdown.select_by_visible_text(option_text)
-            log_event(f"✅ Selected dropdown option: {option_text} ({by})")
-            time.sleep(1)
+            self.resolver.use(identifier, lambda element: Select(element).select_by_visible_text(option_text), by)
+            log_event(f"✅ Selected dropdown option: {option_text} ({identifier})")
+            wait_for_dom_quiet(self.driver)
             return True
 
         except NoSuchElementException as e:
-            log_event(f"⚠️ Failed to select dropdown: {identifier} ({by}) - {str(e)}")
+            log_event(f"⚠️ Failed to select dropdown: {identifier} - {str(e)}")
             return False
 
-    def check_checkbox(self, identifier: str, by: str = "xpath"):
+    def check_checkbox(self, identifier: str, by: str = None):
         """Checks a checkbox if not already checked."""
         try:
-            if by == "xpath":
-                checkbox = self.driver.find_element(By.XPATH, identifier)
-            elif by == "css":
-                checkbox = self.driver.find_element(By.CSS_SELECTOR, identifier)
-            elif by == "id":
-                checkbox = self.driver.find_element(By.ID, identifier)
-            elif by == "name":
-                checkbox = self.driver.find_element(By.NAME, identifier)
-            else:
-                log_event(f"❌ Unsupported selector type: {by}")
-                return False
-
-            if not checkbox.is_selected():
+            def check(checkbox):
+                if checkbox.is_selected():
+                    return False
                 checkbox.click()
-                log_event(f"✅ Checked checkbox: {identifier} ({by})")
+                return True
+
+            if self.resolver.use(identifier, check, by):
+                log_event(f"✅ Checked checkbox: {identifier}")
             else:
-                log_event(f"ℹ️ Checkbox already checked: {identifier} ({by})")
-            time.sleep(1)
+                log_event(f"ℹ️ Checkbox already checked: {identifier}")
+            wait_for_dom_quiet(self.driver)
             return True
 
         except NoSuchElementException as e:
-            log_event(f"⚠️ Failed to check checkbox: {identifier} ({by}) - {str(e)}")
+            log_event(f"⚠️ Failed to check checkbox: {identifier} - {str(e)}")
             return False
 
-    def upload_file(self, identifier: str, file_path: str, by: str = "xpath"):
+    def upload_file(self, identifier: str, file_path: str, by: str = None):
         """Uploads a file to an input[type='file'] field."""
         try:
-            if by == "xpath":
-                upload_input = self.driver.find_element(By.XPATH, identifier)
-            elif by == "css":
-                upload_input = self.driver.find_element(By.CSS_SELECTOR, identifier)
-            elif by == "id":
-                upload_input = self.driver.find_element(By.ID, identifier)
-            elif by == "name":
-                upload_input = self.driver.find_element(By.NAME, identifier)
-            else:
-                log_event(f"❌ Unsupported selector type: {by}")
-                return False
-
             file_path = os.path.abspath(file_path)
-            upload_input.send_keys(file_path)
-            log_event(f"✅ Uploaded file: {file_path} into {identifier} ({by})")
-            time.sleep(2)
+            self.resolver.use(identifier, lambda upload_input: upload_input.send_keys(file_path), by)
+            log_event(f"✅ Uploaded file: {file_path} into {identifier}")
+            wait_for_network_idle(self.driver)
             return True
 
         except NoSuchElementException as e:
-            log_event(f"⚠️ Failed to upload file: {identifier} ({by}) - {str(e)}")
+            log_event(f"⚠️ Failed to upload file: {identifier} - {str(e)}")
             return False
 
     def click(self, selector: str):
         """Direct click with JavaScript scrolling into view."""
         try:
-            log_event(f"🖱️ Attempting click: {selector} (xpath)")
-            element = self.driver.find_element(By.XPATH, selector)
-            self.driver.execute_script("arguments[0].scrollIntoView(true);", element)
-            self.driver.execute_script("arguments[0].click();", element)
-            log_event(f"✅ Clicked element: {selector} (xpath)")
+            log_event(f"🖱️ Attempting click: {selector}")
+
+            def js_click(element):
+                self.driver.execute_script("arguments[0].scrollIntoView(true); arguments[0].click();", element)
+
+            self.resolver.use(selector, js_click)
+            log_event(f"✅ Clicked element: {selector}")
         except Exception as e:
-            log_event(f"⚠️ Failed to click element: {selector} (xpath) - {str(e)}")
+            log_event(f"⚠️ Failed to click element: {selector} - {str(e)}")
             try:
                 self.driver.find_element(By.TAG_NAME, "body").send_keys(Keys.ESCAPE)
                 log_event("🔍 Modal overlay detected, sent ESC key.")
             except:
                 pass
 
-    def perform(self, actions):
-        """Performs list of actions received from Gemini."""
-        # First try dismissing cookie modals if they exist
+    def dismiss_cookie_modal(self):
+        """Dismisses a cookie consent dialog if one is showing."""
         try:
             modal = self.driver.find_element(By.XPATH, "//dialog[contains(@class, 'cookie')]")
             if modal.is_displayed():
                 log_event("🍪 Cookie modal detected. Dismissing...")
                 self.driver.find_element(By.TAG_NAME, "body").send_keys(Keys.ESCAPE)
-                time.sleep(1)
+                wait_for_dom_quiet(self.driver)
                 buttons = modal.find_elements(By.TAG_NAME, "button")
                 for btn in buttons:
                     if "reject" in btn.text.lower() or "decline" in btn.text.lower():
                         btn.click()
                         log_event("✅ Cookie modal dismissed by button.")
-                        time.sleep(1)
+                        wait_for_dom_quiet(self.driver)
                         break
         except Exception as e:
             log_event(f"ℹ️ No cookie modal or dismissal failed: {str(e)}")
 
-        for action in actions:
-            if self.detect_success_message():
+    def perform(self, actions, dismiss_modals: bool = True):
+        """
+        Performs list of actions received from Gemini.
+
+        Args:
+            actions (list): Action dicts.
+            dismiss_modals (bool): Check for a cookie modal first (skipped for later streamed chunks).
+
+        Returns:
+            bool: True if every action succeeded (or the application finished mid-way).
+        """
+        # First try dismissing cookie modals if they exist
+        if dismiss_modals:
+            self.dismiss_cookie_modal()
+
+        # 🔎 Look up every selector of the plan in one call (batched fills resolve page-side)
+        selectors = [
+            action.get("selector") for action in actions
+            if not (BATCH_FILL_ENABLED and is_batchable(action))
+        ]
+        if selectors:
+            found = self.resolver.resolve_all(selectors)
+            log_event(f"🔎 Resolved {found}/{len(selectors)} selector(s) in one lookup.", level="DEBUG")
+
+        all_succeeded = True
+        index = 0
+        while index < len(actions):
+            with profiler.stage("success_check"):
+                finished = self.detect_success_message()
+            if finished:
                 log_event("🎯 Application success detected mid-actions. Stopping further steps.")
                 break
 
-            action_type = action.get("type")
-            selector = action.get("selector")
-            text = action.get("text", None)
-            option_text = action.get("option_text", None)
-            file_path = action.get("file_path", None)
-
-            if action_type == "click":
-                self.click_element(selector)
-            elif action_type == "type":
-                if text:
-                    self.type_text(selector, text)
-            elif action_type == "select":
-                if option_text:
-                    self.select_dropdown(selector, option_text)
-            elif action_type == "dynamic_select":
-                if option_text:
-                    self.select_dynamic_dropdown(selector, option_text)
-            elif action_type == "check":
-                self.check_checkbox(selector)
-            elif action_type == "upload":
-                if file_path:
-                    self.upload_file(selector, file_path)
-            else:
-                log_event(f"⚠️ Unknown action type: {action_type}")
+            # ⚡ Consecutive type/check/select actions go to the page in one script call
+            if BATCH_FILL_ENABLED and is_batchable(actions[index]):
+                end = index
+                while end < len(actions) and is_batchable(actions[end]):
+                    end += 1
+                with profiler.stage("fill_batch"):
+                    all_succeeded = self.perform_batch(actions[index:end]) and all_succeeded
+                index = end
+                continue
+
+            with profiler.stage(f"action_{actions[index].get('type', 'unknown')}"):
+                all_succeeded = self.perform_action(actions[index]) and all_succeeded
+            index += 1
+
+        return all_succeeded
+
+    def perform_batch(self, actions):
+        """
+        Applies batchable actions in one round trip, retrying failures one by one.
+
+        Returns:
+            bool: True if every action eventually succeeded.
+        """
+        results = fill_batch(self.driver, actions)
+        for position, action in enumerate(actions):
+            if not results[position]:
+                log_event(f"↩️ Batch fill missed {action.get('selector')}, retrying with per-action path.")
+                results[position] = self.perform_action(action)
+        if any(results):
+            wait_for_dom_quiet(self.driver)
+        return all(results)
+
+    def perform_action(self, action):
+        """Performs a single action through the matching HandsTool method."""
+        action_type = action.get("type")
+        selector = action.get("selector")
+        text = action.get("text", None)
+        option_text = action.get("option_text", None)
+        file_path = action.get("file_path", None)
+
+        succeeded = False
+        if action_type == "click":
+            succeeded = self.click_element(selector)
+        elif action_type == "type":
+            if text:
+                succeeded = self.type_text(selector, text)
+        elif action_type == "select":
+            if option_text:
+                succeeded = self.select_dropdown(selector, option_text)
+        elif action_type == "dynamic_select":
+            if option_text:
+                succeeded = self.select_dynamic_dropdown(selector, option_text)
+        elif action_type == "check":
+            succeeded = self.check_checkbox(selector)
+        elif action_type == "upload":
+            if file_path:
+                succeeded = self.upload_file(selector, file_path)
+        else:
+            log_event(f"⚠️ Unknown action type: {action_type}")
+
+        return bool(succeeded)
 
     def select_dynamic_dropdown(self, selector: str, option_text: str):
         """Handles dynamic dropdowns that need typing before selecting."""
         try:
             log_event(f"🔽 Attempting dynamic select: {selector} -> {option_text}")
-            wait = WebDriverWait(self.driver, 10)
-            input_field = wait.until(EC.element_to_be_clickable((By.XPATH, selector)))
 
-            self.driver.execute_script("arguments[0].scrollIntoView(true);", input_field)
-            input_field.click()
-            input_field.clear()
-            input_field.send_keys(option_text)
-            time.sleep(1.5)
+            def open_and_type(input_field):
+                if wait_for_handle_interactable(self.driver, input_field, selector) is None:
+                    raise NoSuchElementException(f"Element not interactable: {selector}")
+                self.driver.execute_script("arguments[0].scrollIntoView(true);", input_field)
+                input_field.click()
+                input_field.clear()
+                input_field.send_keys(option_text)
+                return input_field
+
+            input_field = self.resolver.use(selector, open_and_type)
+
+            # ⏳ Options are usually fetched and rendered after typing
+            wait_for_network_idle(self.driver)
+            wait_for_dom_quiet(self.driver)
 
             if self.detect_success_message():
                 log_event("✅ Success detected after typing in dynamic dropdown. Skipping Enter.")
@@ -228,21 +276,32 @@ class HandsTool:
 
             ActionChains(self.driver)\
                 .move_to_element(input_field)\
-                .pause(0.5)\
                 .send_keys(Keys.ARROW_DOWN)\
-                .pause(0.2)\
                 .send_keys(Keys.ENTER)\
                 .perform()
 
             log_event(f"✅ Selected dynamic dropdown option: {option_text}")
-            time.sleep(1)
+            wait_for_dom_quiet(self.driver)
             return True
         except Exception as e:
             log_event(f"⚠️ Failed dynamic select: {selector} -> {option_text} - {str(e)}")
             return False
 
     def detect_success_message(self):
-        """Detects success message on the page after application submit."""
+        """
+        Detects success message on the page after application submit.
+
+        Uses the flags the outcome observer reported during the last wait (no WebDriver call),
+        minus success text the job page already showed at load; falls back to a DOM query
+        when the observer is disabled.
+        """
+        if OUTCOME_OBSERVER_ENABLED:
+            outcome = accept_outcome(last_outcome(self.driver), self.outcome_baseline) or {}
+            if outcome.get("state") == "success":
+                log_event(f"🎯 Detected successful application! ({outcome.get('success')})")
+                return True
+            return False
+
         try:
             success_element = self.driver.find_element(By.XPATH, "//div[contains(text(), 'Thank you for applying')]")
             if success_element.is_displayed():
@@ -250,3 +309,28 @@ class HandsTool:
                 return True
         except Exception:
             return False
+
+
+# ⚡ Executes streamed actions as they arrive, keeping consecutive fills batched
+class ActionStream:
+    def __init__(self, hands: HandsTool):
+        self.hands = hands
+        self.pending = []
+        self.performed = []
+        self.succeeded = True
+
+    def __call__(self, action: dict):
+        """Receives one streamed action; fills are held until a non-batchable action arrives."""
+        self.pending.append(action)
+        if not (BATCH_FILL_ENABLED and is_batchable(action)):
+            self.flush()
+
+    def flush(self) -> bool:
+        """Performs the held actions. Returns False if any streamed action failed so far."""
+        if self.pending:
+            first_chunk = not self.performed
+            with log_context(stage="act"):
+                self.succeeded = self.hands.perform(self.pending, dismiss_modals=first_chunk) and self.succeeded
+            self.performed.extend(self.pending)
+            self.pending = []
+        return self.succeeded
@@ -0,0 +1,165 @@
+# src/tools/link_reader.py
+
+# 📦 Import libraries
+import csv
+import hashlib
+import json
+import os
+import sys
+from collections import Counter, OrderedDict
+from urllib.parse import urlsplit
+
+# 🛠️ Project imports
+from src.tools.logger_tool import log_event
+from src.tools.url_utils import normalize_url, is_valid_url
+
+# 🏷️ Column (CSV) or key (JSONL) holding the link, first match wins (case-insensitive)
+LINK_FIELDS = ("link", "url", "job_link", "job_url", "href")
+
+# 📏 Allow very wide CSV rows (e.g. exports with a job description column)
+try:
+    csv.field_size_limit(sys.maxsize)
+except OverflowError:
+    csv.field_size_limit(2 ** 31 - 1)
+
+
+def _csv_links(f):
+    """Links from a CSV: the first LINK_FIELDS column, or the first column if there is no known header."""
+    reader = csv.reader(f)
+    header = next(reader, None)
+    if not header:
+        return
+    names = [name.strip().lower() for name in header]
+    column = next((names.index(name) for name in LINK_FIELDS if name in names), None)
+    if column is None:
+        column = 0
+        yield header[0]  # No header row: the first line is already a link
+    for row in reader:
+        if len(row) > column:
+            yield row[column]
+
+
+def _jsonl_links(f, path: str):
+    """Links from JSON Lines: objects with a LINK_FIELDS key, or bare strings."""
+    for number, line in enumerate(f, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            item = json.loads(line)
+        except json.JSONDecodeError:
+            log_event(f"⚠️ {path}:{number} is not valid JSON, skipped.")
+            continue
+        if isinstance(item, str):
+            yield item
+        elif isinstance(item, dict):
+            keys = {str(key).lower(): key for key in item}
+            key = next((keys[name] for name in LINK_FIELDS if name in keys), None)
+            if key is not None and isinstance(item[key], str):
+                yield item[key]
+
+
+def _text_links(f):
+    """Links from a plain text file, one per line (# starts a comment)."""
+    for line in f:
+        line = line.strip()
+        if line and not line.startswith("#"):
+            yield line
+
+
+def iter_raw_links(path: str):
+    """
+    Yields the links of a file as they are read, without loading the file.
+
+    .csv and .jsonl/.ndjson are parsed as such, anything else as one link per line.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    with open(path, "r", encoding="utf-8-sig", newline="") as f:
+        if extension == ".csv":
+            yield from _csv_links(f)
+        elif extension in (".jsonl", ".ndjson"):
+            yield from _jsonl_links(f, path)
+        else:
+            yield from _text_links(f)
+
+
+def link_domain(link: str) -> str:
+    """Host of a link without a leading www., used to group links."""
+    host = (urlsplit(normalize_url(link)).hostname or "").lower()
+    return host[4:] if host.startswith("www.") else host
+
+
+class LinkReader:
+    """
+    Streams the job links of a file: normalized, deduplicated and filtered on the fly.
+
+    Iterating reads the file once, so there is no limit on its size; only a
+    16-byte digest per unique link is kept to drop duplicates. Lines that are
+    not http(s) links (stray headers, notes) are skipped. Counts are in
+    `stats` and logged once the file has been read.
+    """
+
+    def __init__(self, path: str, skip_urls: set = None):
+        """
+        Args:
+            path (str): CSV, JSONL or text file of links.
+            skip_urls (set): Normalized URLs to leave out (e.g. already finished when resuming).
+        """
+        self.path = path
+        self.skip_urls = skip_urls or set()
+        self.stats = {"read": 0, "unique": 0, "duplicates": 0, "skipped": 0, "invalid": 0}
+
+    def __iter__(self):
+        seen = set()
+        for link in iter_raw_links(self.path):
+            link = (link or "").strip()
+            if not link:
+                continue
+            self.stats["read"] += 1
+            url = normalize_url(link)
+            if not is_valid_url(url):
+                self.stats["invalid"] += 1
+                log_event(f"⚠️ Skipping invalid link: {link[:200]}", level="DEBUG")
+                continue
+
+            digest = hashlib.blake2b(url.encode("utf-8"), digest_size=16).digest()
+            if digest in seen:
+                self.stats["duplicates"] += 1
+                continue
+            seen.add(digest)
+            if url in self.skip_urls:
+                self.stats["skipped"] += 1
+                continue
+            self.stats["unique"] += 1
+            yield link
+
+        stats = self.stats
+        log_event(
+            f"📥 Read {stats['read']} link(s) from {self.path}: {stats['unique']} to process, "
+            f"{stats['duplicates']} duplicate, {stats['skipped']} already finished, {stats['invalid']} invalid."
+        )
+
+
+def group_by_domain(links) -> list:
+    """
+    Reorders links so links of the same site follow each other (sites in order of first appearance).
+
+    Consecutive links on one ATS reuse its cached assets, cookies and cached
+    plans. This has to hold every link in memory, unlike plain streaming.
+
+    Args:
+        links (iterable): Job links.
+
+    Returns:
+        list: The same links, grouped by domain.
+    """
+    groups = OrderedDict()
+    for link in links:
+        groups.setdefault(link_domain(link), []).append(link)
+    log_event(f"🗂️ Grouped links into {len(groups)} domain(s).")
+    return [link for group in groups.values() for link in group]
+
+
+def domain_counts(links) -> Counter:
+    """Number of links per domain (streams, nothing but the counts is kept)."""
+    return Counter(link_domain(link) for link in links)
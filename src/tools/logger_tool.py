@@ -1,27 +1,176 @@
 # src/tools/logger_tool.py
 
 # 📦 Import libraries
+import atexit
+import json
 import os
+import queue
+import threading
+from contextlib import contextmanager
 from datetime import datetime
 
-# 📂 Set log folder and generate new log filename with timestamp
+# 🛠️ Project imports
+from config.settings import LOG_LEVEL, LOG_QUEUE_SIZE, LOG_BATCH_SIZE
+
+# 📂 Set log folder and generate new log filenames with timestamp (text + structured JSONL)
 LOG_FOLDER = "output"
 os.makedirs(LOG_FOLDER, exist_ok=True)
 LOG_FILE = os.path.join(LOG_FOLDER, f"application_log_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt")
+JSONL_FILE = os.path.splitext(LOG_FILE)[0] + ".jsonl"
+
+# 🎚️ Log levels
+LEVELS = {"DEBUG": 10, "INFO": 20, "WARNING": 30, "ERROR": 40}
+MIN_LEVEL = LEVELS.get(LOG_LEVEL.upper(), LEVELS["INFO"])
+
+# 🏷️ Level inferred from the emoji that existing messages start with
+#    (anything else is INFO, including the "⏳ Waited ..." blocked-time lines of the browser waits)
+EMOJI_LEVELS = {"❌": "ERROR", "⚠️": "WARNING", "⌛": "WARNING"}
+
+# ⏱️ WARNING/ERROR records wait this long for queue space before being dropped
+BLOCK_TIMEOUT = 2.0
+
+# 🧵 Background writer state
+_queue = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+_writer = None
+_writer_lock = threading.Lock()
+_dropped = 0
+_context = threading.local()
+_STOP = object()
+
+
+def _infer_level(message: str) -> str:
+    for emoji, level in EMOJI_LEVELS.items():
+        if message.startswith(emoji):
+            return level
+    return "INFO"
+
 
-def log_event(message: str):
+def current_log_context() -> dict:
+    """Returns the structured fields (link, worker, stage, ...) active on this thread."""
+    return dict(getattr(_context, "fields", {}))
+
+
+@contextmanager
+def log_context(**fields):
+    """
+    Adds structured fields to every log record emitted on this thread inside the block.
+
+    Example:
+        with log_context(worker=2, link=link):
+            log_event("🌐 Opening job page")
     """
-    Logs a message with a timestamp into a text file and console.
-    
+    previous = getattr(_context, "fields", {})
+    _context.fields = {**previous, **{k: v for k, v in fields.items() if v is not None}}
+    try:
+        yield
+    finally:
+        _context.fields = previous
+
+
+def log_event(message: str, level: str = None, **fields):
+    """
+    Logs a message with a timestamp into the text log, the JSONL log and console.
+
+    Records are queued and written by a background thread, so callers never
+    block on disk or console I/O (unless the queue is full of warnings/errors).
+
     Args:
         message (str): The message to log.
+        level (str): DEBUG, INFO, WARNING or ERROR (inferred from the emoji if omitted).
+        **fields: Extra structured fields for the JSONL record.
     """
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    log_message = f"[{timestamp}] {message}"
+    level = (level or _infer_level(message)).upper()
+    if LEVELS.get(level, LEVELS["INFO"]) < MIN_LEVEL:
+        return
+
+    record = {
+        "ts": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "level": level,
+        "message": message,
+        **current_log_context(),
+        **fields,
+    }
+    _ensure_writer()
+    try:
+        if LEVELS.get(level, 0) >= LEVELS["WARNING"]:
+            _queue.put(record, timeout=BLOCK_TIMEOUT)
+        else:
+            _queue.put_nowait(record)
+    except queue.Full:
+        global _dropped
+        _dropped += 1
+
+
+def _format_text(record: dict) -> str:
+    """Human-readable line: [timestamp] [worker] message."""
+    prefix = f"[{record['ts']}]"
+    if record.get("worker") is not None:
+        prefix += f" [w{record['worker']}]"
+    if record["level"] not in ("INFO", "DEBUG"):
+        prefix += f" [{record['level']}]"
+    return f"{prefix} {record['message']}"
+
+
+def _ensure_writer():
+    global _writer
+    if _writer is None:
+        with _writer_lock:
+            if _writer is None:
+                _writer = threading.Thread(target=_write_loop, name="log-writer", daemon=True)
+                _writer.start()
+
+
+def _write_loop():
+    """Drains the queue in batches and appends them to both log files."""
+    global _dropped
+    with open(LOG_FILE, "a", encoding="utf-8") as text_file, open(JSONL_FILE, "a", encoding="utf-8") as jsonl_file:
+        while True:
+            batch = [_queue.get()]
+            while len(batch) < LOG_BATCH_SIZE:
+                try:
+                    batch.append(_queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            stop = any(record is _STOP for record in batch)
+            records = [record for record in batch if record is not _STOP]
+            if _dropped:
+                dropped, _dropped = _dropped, 0
+                records.append({
+                    "ts": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                    "level": "WARNING",
+                    "message": f"⚠️ Logger queue full, dropped {dropped} record(s).",
+                })
+
+            if records:
+                lines = [_format_text(record) for record in records]
+                text_file.write("\n".join(lines) + "\n")
+                jsonl_file.write("".join(json.dumps(record, ensure_ascii=False, default=str) + "\n" for record in records))
+                text_file.flush()
+                jsonl_file.flush()
+
+                # Also print log to console for real-time visibility
+                print("\n".join(lines), flush=True)
+
+            for _ in batch:
+                _queue.task_done()
+            if stop:
+                return
+
+
+def flush_logs():
+    """Blocks until every queued record has been written."""
+    if _writer is not None and _writer.is_alive():
+        _queue.join()
+
+
+def shutdown_logger():
+    """Flushes remaining records and stops the writer thread (registered at exit)."""
+    global _writer
+    if _writer is not None and _writer.is_alive():
+        _queue.put(_STOP)
+        _writer.join()
+    _writer = None
 
-    # Write the log to the current session's unique log file
-    with open(LOG_FILE, "a", encoding="utf-8") as f:
-        f.write(log_message + "\n")
 
-    # Also print log to console for real-time visibility
-    print(log_message)
+atexit.register(shutdown_logger)
@@ -0,0 +1,156 @@
+# src/tools/memory_index.py
+
+# 📦 Import libraries
+import re
+
+# 📚 Extra phrases a form may use for each memory key (the key itself always matches)
+SYNONYMS = {
+    "Full Name": ["name", "your name", "legal name", "full legal name"],
+    "First Name": ["given name", "forename", "first"],
+    "Last Name": ["surname", "family name", "last"],
+    "City": ["town", "current location", "city of residence"],
+    "State": ["province", "region", "state of residence"],
+    "Country": ["country of residence", "nation"],
+    "Street Address": ["address", "address line 1", "street", "mailing address"],
+    "Street Address 2": ["address line 2", "apartment", "apt", "suite", "unit"],
+    "Phone": ["phone number", "mobile", "mobile number", "telephone", "cell", "contact number"],
+    "Email": ["e mail", "email address", "mail"],
+    "Zipcode": ["zip", "zip code", "postal code", "postcode"],
+    "LinkedIn": ["linkedin profile", "linkedin url"],
+    "GitHub": ["github profile", "github url", "git hub"],
+    "Portfolio Website": ["website", "portfolio", "personal website", "personal site"],
+    "Work Authorization Status": ["authorized to work", "work authorization", "legally authorized", "eligible to work", "right to work"],
+    "Visa Status": ["visa", "sponsorship", "require sponsorship", "immigration status"],
+    "Willingness to Relocate": ["relocate", "relocation", "willing to relocate"],
+    "Preferred Locations": ["preferred location", "location preference", "preferred office"],
+    "Salary Expectation": ["salary", "compensation", "desired salary", "expected salary", "pay expectation"],
+    "Notice Period": ["notice", "start date", "available to start", "earliest start", "availability"],
+    "How Did You Hear About This Job": ["hear about", "how did you hear", "how did you find", "referral source", "source"],
+    "Race/Ethnicity": ["race", "ethnicity", "hispanic", "latino", "ethnic background"],
+    "Gender": ["sex", "gender identity"],
+    "Veteran Status": ["veteran", "protected veteran", "military"],
+    "Disability Status": ["disability", "disabled"],
+    "Work Experience": ["employer", "company", "current company", "most recent", "experience", "employment", "job title", "position"],
+    "Education": ["school", "university", "college", "degree", "education", "major", "graduation"],
+    "Skills": ["skill", "technologies", "tech stack"],
+    "Certifications": ["certification", "certificate", "license"],
+    "Projects": ["project"],
+    "Languages": ["language", "languages spoken"],
+}
+
+NON_WORD = re.compile(r"[^a-z0-9]+")
+INDEX_SUFFIX = re.compile(r"\[\d+\]")
+
+
+def flatten_memory(memory_data, prefix: str = "") -> dict:
+    """
+    Flattens nested memory into {"Work Experience[0].Company": "Deloitte US", ...}.
+
+    Args:
+        memory_data: Candidate memory (dict, list or scalar).
+        prefix (str): Key path of the current node.
+
+    Returns:
+        dict: Flat key path ➔ string value.
+    """
+    flat = {}
+    if isinstance(memory_data, dict):
+        for key, value in memory_data.items():
+            flat.update(flatten_memory(value, f"{prefix}.{key}" if prefix else str(key)))
+    elif isinstance(memory_data, list):
+        if all(isinstance(item, str) for item in memory_data):
+            if memory_data:
+                flat[prefix] = ", ".join(memory_data)
+        else:
+            for index, item in enumerate(memory_data):
+                flat.update(flatten_memory(item, f"{prefix}[{index}]"))
+    elif memory_data not in (None, ""):
+        flat[prefix] = str(memory_data)
+    return flat
+
+
+def normalize_label(text: str) -> str:
+    """Lowercases and reduces text to space-separated words, e.g. 'E-mail*' ➔ 'e mail'."""
+    return NON_WORD.sub(" ", (text or "").lower()).strip()
+
+
+class MemoryIndex:
+    """
+    Index over candidate memory for picking only the entries a page asks about.
+
+    Built once at startup. Each flat entry is reachable through the words of
+    its key, its leaf name and the synonym table; lookups only score entries
+    that share a first word with the label, so cost grows with the label, not
+    with the memory file.
+    """
+
+    def __init__(self, memory_data: dict):
+        self.flat = flatten_memory(memory_data)
+        self.entries = {}
+        self.by_word = {}
+        for flat_key in self.flat:
+            top = INDEX_SUFFIX.sub("", flat_key.split(".")[0])
+            leaf = INDEX_SUFFIX.sub("", flat_key.split(".")[-1])
+            nested = flat_key != top
+            top_phrases = {normalize_label(top)} | {normalize_label(p) for p in SYNONYMS.get(top, [])}
+            leaf_phrases = {normalize_label(leaf)} | ({normalize_label(p) for p in SYNONYMS.get(leaf, [])} if nested else set())
+            self.entries[flat_key] = {"nested": nested, "top": top_phrases, "leaf": leaf_phrases}
+            for phrase in top_phrases | leaf_phrases:
+                if phrase:
+                    self.by_word.setdefault(phrase.split()[0], set()).add(flat_key)
+        self.cache = {}
+
+    def match(self, label: str) -> list:
+        """
+        Returns the flat memory keys that best answer one form label.
+
+        Scalar keys score 3 when their key or a synonym appears in the label.
+        Nested entries score 2 for their leaf name plus 1 for their parent key.
+        Ties go to the entry whose matched phrases cover more words, so
+        'Company name' picks Work Experience[*].Company over Full Name.
+        """
+        text = normalize_label(label)
+        if not text:
+            return []
+        if text in self.cache:
+            return self.cache[text]
+
+        padded = f" {text} "
+        candidates = set()
+        for word in text.split():
+            candidates |= self.by_word.get(word, set())
+
+        scores = {}
+        for flat_key in candidates:
+            entry = self.entries[flat_key]
+            top_words = max((len(p.split()) for p in entry["top"] if f" {p} " in padded), default=0)
+            leaf_words = max((len(p.split()) for p in entry["leaf"] if f" {p} " in padded), default=0)
+            if entry["nested"]:
+                score = (2 if leaf_words else 0) + (1 if top_words else 0)
+                words = leaf_words + top_words
+            else:
+                score = 3 if top_words or leaf_words else 0
+                words = max(top_words, leaf_words)
+            if score:
+                scores[flat_key] = (score, words)
+
+        best = max(scores.values(), default=None)
+        keys = sorted(key for key, score in scores.items() if score == best)
+        self.cache[text] = keys
+        return keys
+
+    def select(self, labels: list) -> dict:
+        """
+        Returns the slice of memory relevant to a set of form labels.
+
+        Args:
+            labels (list): Labels, placeholders and names found on the page.
+
+        Returns:
+            dict: Flat key ➔ value for every matched entry.
+        """
+        selected = {}
+        for label in labels:
+            for flat_key in self.match(label):
+                selected[flat_key] = self.flat[flat_key]
+        return selected
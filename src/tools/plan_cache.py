@@ -0,0 +1,175 @@
+# src/tools/plan_cache.py
+
+# 📦 Import libraries
+import json
+import os
+import re
+import threading
+from collections import OrderedDict
+from datetime import datetime
+
+# 🛠️ Project imports
+from config.settings import PLAN_CACHE_FILE, PLAN_CACHE_SIZE
+from src.tools.logger_tool import log_event
+from src.tools.memory_index import flatten_memory
+
+# 🔖 Placeholder used for values bound to candidate memory, e.g. {{memory:Email}}
+PLACEHOLDER = re.compile(r"^\{\{memory:(.+)\}\}$")
+
+# ✂️ Literal (non-memory) answers longer than this are treated as job specific and never cached
+MAX_LITERAL_CHARS = 40
+
+# ✍️ Action keys that carry values taken from memory
+VALUE_KEYS = ("text", "option_text")
+
+# 🤷 Generic answers that are kept literal instead of being bound to whichever memory key shares them
+GENERIC_ANSWERS = {"yes", "no", "true", "false", "n/a", "none"}
+
+
+class PlanCache:
+    """
+    Persistent LRU cache of action plans keyed by page fingerprint.
+
+    Values typed from candidate memory are stored as placeholders so a plan
+    recorded on one job page can be replayed on any page with the same form.
+    """
+
+    def __init__(self, path: str = PLAN_CACHE_FILE, max_entries: int = PLAN_CACHE_SIZE):
+        self.path = path
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        """Loads cached plans from disk if the cache file exists."""
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                self.entries = OrderedDict(json.load(f))
+            log_event(f"♻️ Loaded {len(self.entries)} cached plan(s) from {self.path}.")
+        except Exception as e:
+            log_event(f"⚠️ Failed to load plan cache, starting empty: {str(e)}")
+            self.entries = OrderedDict()
+
+    def _save(self):
+        """Writes the cache to disk (called with the lock held)."""
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self.entries, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            log_event(f"⚠️ Failed to save plan cache: {str(e)}")
+
+    def lookup(self, fingerprint, memory_data: dict):
+        """
+        Returns the cached actions for a page, re-bound to the current memory.
+
+        Args:
+            fingerprint (str | None): Page fingerprint from page_fingerprint().
+            memory_data (dict): Candidate memory used to fill placeholders.
+
+        Returns:
+            list | None: Ready-to-perform actions, or None on a miss.
+        """
+        with self.lock:
+            entry = self.entries.get(fingerprint) if fingerprint else None
+            if entry is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(fingerprint)
+
+        actions = _bind(entry["actions"], flatten_memory(memory_data))
+        with self.lock:
+            if actions is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return actions
+
+    def store(self, fingerprint, actions: list, memory_data: dict):
+        """
+        Caches a plan that was performed successfully.
+
+        Args:
+            fingerprint (str | None): Page fingerprint.
+            actions (list): Actions as returned by Gemini.
+            memory_data (dict): Candidate memory used to find bindable values.
+        """
+        if not fingerprint or not actions:
+            return
+        template = _unbind(actions, flatten_memory(memory_data))
+        if template is None:
+            log_event("ℹ️ Plan contains job-specific answers, not caching it.")
+            return
+
+        with self.lock:
+            self.entries[fingerprint] = {"actions": template, "stored_at": datetime.now().isoformat(timespec="seconds")}
+            self.entries.move_to_end(fingerprint)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+            self._save()
+        log_event(f"💾 Cached plan for page fingerprint {fingerprint[:10]} ({len(template)} actions).")
+
+    def invalidate(self, fingerprint):
+        """Drops a cached plan after a failed replay."""
+        with self.lock:
+            if fingerprint and self.entries.pop(fingerprint, None) is not None:
+                self.invalidations += 1
+                self._save()
+                log_event(f"🗑️ Invalidated cached plan {fingerprint[:10]}.")
+
+    def stats(self) -> dict:
+        """Returns hit/miss counters and the current cache size."""
+        with self.lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "invalidations": self.invalidations,
+                "entries": len(self.entries),
+            }
+
+
+def _unbind(actions: list, flat_memory: dict):
+    """Replaces memory values in actions with placeholders. Returns None if the plan is job specific."""
+    by_value = {}
+    for key, value in flat_memory.items():
+        normalized = value.strip().lower()
+        if normalized not in GENERIC_ANSWERS:
+            by_value.setdefault(normalized, key)
+
+    template = []
+    for action in actions:
+        action = dict(action)
+        for value_key in VALUE_KEYS:
+            value = action.get(value_key)
+            if not isinstance(value, str):
+                continue
+            memory_key = by_value.get(value.strip().lower())
+            if memory_key:
+                action[value_key] = f"{{{{memory:{memory_key}}}}}"
+            elif len(value) > MAX_LITERAL_CHARS:
+                return None
+        template.append(action)
+    return template
+
+
+def _bind(template: list, flat_memory: dict):
+    """Fills placeholders from memory. Returns None if a referenced key no longer exists."""
+    actions = []
+    for action in template:
+        action = dict(action)
+        for value_key in VALUE_KEYS:
+            match = PLACEHOLDER.match(action.get(value_key) or "")
+            if match:
+                if match.group(1) not in flat_memory:
+                    return None
+                action[value_key] = flat_memory[match.group(1)]
+        actions.append(action)
+    return actions
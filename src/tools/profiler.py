@@ -0,0 +1,148 @@
+# src/tools/profiler.py
+
+# 📦 Import libraries
+import json
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+# 🛠️ Project imports
+from src.tools.logger_tool import log_event, current_log_context
+
+
+def percentile(values: list, pct: float) -> float:
+    """Nearest-rank percentile of a list of numbers (0 for an empty list)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, math.ceil(pct / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+class Profiler:
+    """
+    Run-level record of how long each stage takes, per link and per step.
+
+    Stages are timed with the `stage()` context manager; the link, step and
+    worker come from the active log_context. Safe to use from parallel workers.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.records = []
+        self.origin = time.perf_counter()
+
+    @contextmanager
+    def stage(self, name: str):
+        """
+        Times the enclosed block as one occurrence of a stage.
+
+        Example:
+            with profiler.stage("llm"):
+                response = model.generate_content(prompt)
+        """
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, started, time.perf_counter() - started)
+
+    def record(self, name: str, started: float, duration: float):
+        """Adds one timed stage (perf_counter start, seconds) with the current log context."""
+        context = current_log_context()
+        with self.lock:
+            self.records.append({
+                "stage": name,
+                "start": started - self.origin,
+                "duration": duration,
+                "link": context.get("link"),
+                "step": context.get("step"),
+                "worker": context.get("worker"),
+                "thread": threading.current_thread().name,
+            })
+
+    def summary(self, slowest: int = 5) -> dict:
+        """
+        Aggregates the recorded stages.
+
+        Args:
+            slowest (int): Number of slowest links to return.
+
+        Returns:
+            dict: {"stages": {name: {count, total, p50, p95, max}}, "slowest_links": [(link, seconds), ...]}
+        """
+        with self.lock:
+            records = list(self.records)
+
+        durations = {}
+        per_link = {}
+        for record in records:
+            durations.setdefault(record["stage"], []).append(record["duration"])
+            if record["link"]:
+                per_link[record["link"]] = per_link.get(record["link"], 0.0) + record["duration"]
+
+        stages = {
+            name: {
+                "count": len(values),
+                "total": round(sum(values), 3),
+                "p50": round(percentile(values, 50), 3),
+                "p95": round(percentile(values, 95), 3),
+                "max": round(max(values), 3),
+            }
+            for name, values in durations.items()
+        }
+        slowest_links = sorted(per_link.items(), key=lambda item: item[1], reverse=True)[:slowest]
+        return {"stages": stages, "slowest_links": [(link, round(seconds, 2)) for link, seconds in slowest_links]}
+
+    def log_summary(self, slowest: int = 5):
+        """Logs p50/p95 per stage (slowest total first) and the slowest links."""
+        summary = self.summary(slowest)
+        if not summary["stages"]:
+            return
+        log_event("⏱️ Run profile (seconds):")
+        for name, stats in sorted(summary["stages"].items(), key=lambda item: item[1]["total"], reverse=True):
+            log_event(
+                f"⏱️   {name:<12} n={stats['count']:<5} total={stats['total']:<9} "
+                f"p50={stats['p50']:<7} p95={stats['p95']:<7} max={stats['max']}"
+            )
+        for link, seconds in summary["slowest_links"]:
+            log_event(f"🐢 Slowest link: {seconds}s ➔ {link}")
+
+    def write_trace(self, path: str):
+        """
+        Writes the recorded stages as Chrome trace JSON (open in chrome://tracing or Perfetto).
+
+        Args:
+            path (str): JSON file to write.
+        """
+        with self.lock:
+            records = list(self.records)
+
+        thread_ids = {}
+        events = []
+        for record in records:
+            tid = thread_ids.setdefault(record["thread"], len(thread_ids) + 1)
+            events.append({
+                "name": record["stage"],
+                "cat": "agent",
+                "ph": "X",
+                "ts": round(record["start"] * 1_000_000),
+                "dur": round(record["duration"] * 1_000_000),
+                "pid": 1,
+                "tid": tid,
+                "args": {"link": record["link"], "step": record["step"], "worker": record["worker"]},
+            })
+        events.extend(
+            {"name": "thread_name", "ph": "M", "pid": 1, "tid": tid, "args": {"name": thread}}
+            for thread, tid in thread_ids.items()
+        )
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+
+
+# ⏱️ Profiler shared by the whole run
+profiler = Profiler()
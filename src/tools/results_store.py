@@ -0,0 +1,163 @@
+# src/tools/results_store.py
+
+# 📦 Import libraries
+import csv
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+
+# 🛠️ Project imports
+from config.settings import RESULTS_DB, RESULTS_COMMIT_EVERY, RESULTS_COMMIT_SECONDS
+from src.tools.url_utils import normalize_url
+
+# 🧾 CSV export columns (the original results CSV layout plus the final-state reason)
+CSV_HEADER = ["Date", "Time", "Link", "Status", "Job Title", "Company", "Location", "Summary", "Reason"]
+
+# 🔁 Status that marks a link to be retried by a resumed run
+RETRY_STATUSES = {"Failed"}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS attempts (
+    id          INTEGER PRIMARY KEY AUTOINCREMENT,
+    url         TEXT NOT NULL,
+    link        TEXT NOT NULL,
+    status      TEXT NOT NULL,
+    job_title   TEXT,
+    company     TEXT,
+    location    TEXT,
+    summary     TEXT,
+    recorded_at TEXT NOT NULL,
+    reason      TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_attempts_url ON attempts (url, id);
+"""
+
+
+class ResultsStore:
+    """
+    SQLite (WAL) store of every application attempt, keyed by normalized URL.
+
+    Writes are committed in batches (every N records or T seconds) and on
+    flush/close. Safe to share between worker threads.
+    """
+
+    def __init__(self, path: str = RESULTS_DB, import_csv: str = None):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        is_new = not os.path.exists(path)
+
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self._migrate()
+        self.pending = 0
+        self.last_commit = time.monotonic()
+
+        # 📥 Carry over results recorded before the database existed
+        if is_new and import_csv and os.path.exists(import_csv):
+            self._import_csv(import_csv)
+
+    def _migrate(self):
+        """Adds columns introduced after a database was created."""
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(attempts)")}
+        if "reason" not in columns:
+            self.conn.execute("ALTER TABLE attempts ADD COLUMN reason TEXT")
+            self.conn.commit()
+
+    def _import_csv(self, csv_path: str):
+        with open(csv_path, newline="", encoding="utf-8") as f:
+            rows = [
+                (normalize_url(row["Link"]), row["Link"], row["Status"], row.get("Job Title", ""),
+                 row.get("Company", ""), row.get("Location", ""), row.get("Summary", ""),
+                 f"{row['Date']}T{row['Time']}", row.get("Reason", ""))
+                for row in csv.DictReader(f) if row.get("Link")
+            ]
+        with self.lock:
+            self.conn.executemany(
+                "INSERT INTO attempts (url, link, status, job_title, company, location, summary, recorded_at, reason) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            self.conn.commit()
+
+    def record(self, link: str, status: str, job_summary: dict, reason: str = ""):
+        """
+        Adds one attempt for a link.
+
+        Args:
+            link (str): Job link as processed.
+            status (str): Success / Human Intervention / Failed / ...
+            job_summary (dict): Job details extracted.
+            reason (str): Why the link ended in this state (budget, stall, verification, ...).
+        """
+        job_summary = job_summary or {}
+        with self.lock:
+            self.conn.execute(
+                "INSERT INTO attempts (url, link, status, job_title, company, location, summary, recorded_at, reason) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    normalize_url(link), link, status,
+                    job_summary.get("Job Title", ""), job_summary.get("Company Name", ""),
+                    job_summary.get("Location", ""), job_summary.get("Summary", ""),
+                    datetime.now().isoformat(timespec="seconds"), reason or "",
+                ),
+            )
+            self.pending += 1
+            if self.pending >= RESULTS_COMMIT_EVERY or time.monotonic() - self.last_commit >= RESULTS_COMMIT_SECONDS:
+                self._commit()
+
+    def _commit(self):
+        """Commits pending inserts (caller holds the lock)."""
+        self.conn.commit()
+        self.pending = 0
+        self.last_commit = time.monotonic()
+
+    def flush(self):
+        """Commits any pending inserts."""
+        with self.lock:
+            self._commit()
+
+    def latest_statuses(self) -> dict:
+        """Returns {normalized url: status of its most recent attempt}."""
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT url, status FROM attempts WHERE id IN (SELECT MAX(id) FROM attempts GROUP BY url)"
+            ).fetchall()
+        return dict(rows)
+
+    def finished_urls(self) -> set:
+        """Normalized URLs whose latest attempt does not need a retry."""
+        return {url for url, status in self.latest_statuses().items() if status not in RETRY_STATUSES}
+
+    def history(self, link: str) -> list:
+        """All attempts for one link, oldest first, as (status, recorded_at, reason) tuples."""
+        with self.lock:
+            return self.conn.execute(
+                "SELECT status, recorded_at, reason FROM attempts WHERE url = ? ORDER BY id", (normalize_url(link),)
+            ).fetchall()
+
+    def export_csv(self, csv_path: str):
+        """Writes every attempt to a CSV with the original results layout."""
+        with self.lock:
+            self._commit()
+            rows = self.conn.execute(
+                "SELECT recorded_at, link, status, job_title, company, location, summary, reason FROM attempts ORDER BY id"
+            ).fetchall()
+
+        os.makedirs(os.path.dirname(csv_path) or ".", exist_ok=True)
+        with open(csv_path, mode="w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(CSV_HEADER)
+            for recorded_at, link, status, job_title, company, location, summary, reason in rows:
+                date_str, _, time_str = recorded_at.partition("T")
+                writer.writerow([date_str, time_str, link, status, job_title, company, location, summary, reason or ""])
+
+    def close(self):
+        """Commits and closes the connection."""
+        with self.lock:
+            self._commit()
+            self.conn.close()
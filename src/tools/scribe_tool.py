@@ -1,50 +1,76 @@
 # src/tools/scribe_tool.py
 
 # 📦 Import libraries
-import os
-import csv
-from datetime import datetime
+import threading
 
 # 🛠️ Corrected import for logging
 from src.tools.logger_tool import log_event
+from src.tools.results_store import ResultsStore
 
-# 📂 Define output CSV path
+# 📂 Define output CSV path (exported from the results database)
 OUTPUT_FILE = "output/application_results.csv"
 
-def record_application_result(link, status, job_summary):
+# 🗄️ Results database, opened on first use and shared by all workers
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_results_store() -> ResultsStore:
+    """Returns the shared results store (imports an existing results CSV on first creation)."""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = ResultsStore(import_csv=OUTPUT_FILE)
+    return _store
+
+
+def record_application_result(link, status, job_summary, reason=""):
     """
-    Records the application result into a CSV file.
+    Records the application result into the results database.
     
     Args:
         link (str): Job link applied to.
         status (str): Application result (Success / Human Intervention / Failed).
         job_summary (dict): Job details extracted.
+        reason (str): Why the link reached this final state.
+    """
+    get_results_store().record(link, status, job_summary, reason)
+    log_event(f"📝 Job result saved: {status} for {link}{f' ({reason})' if reason else ''}")
+
+
+def export_results_csv(csv_path: str = OUTPUT_FILE):
+    """Exports every recorded attempt to the results CSV."""
+    get_results_store().export_csv(csv_path)
+    log_event(f"📤 Results exported to {csv_path}")
+
+
+class OrderedResultWriter:
+    """
+    Records results from parallel workers in the original link order.
+
+    A result is written as soon as every earlier link has finished, so the
+    results match a sequential run. Skipped links (result None) write nothing.
     """
-    os.makedirs("output", exist_ok=True)
-    is_new_file = not os.path.exists(OUTPUT_FILE)
-
-    with open(OUTPUT_FILE, mode="a", newline="", encoding="utf-8") as f:
-        writer = csv.writer(f)
-
-        # ✏️ Write header if new file
-        if is_new_file:
-            writer.writerow(["Date", "Time", "Link", "Status", "Job Title", "Company", "Location", "Summary"])
-
-        # 🕰️ Get current date and time
-        now = datetime.now()
-        date_str = now.strftime("%Y-%m-%d")
-        time_str = now.strftime("%H:%M:%S")
-
-        # ✏️ Write job application result
-        writer.writerow([
-            date_str,
-            time_str,
-            link,
-            status,
-            job_summary.get("Job Title", ""),
-            job_summary.get("Company Name", ""),
-            job_summary.get("Location", ""),
-            job_summary.get("Summary", "")
-        ])
-
-    log_event(f"📝 Job result saved: {status} for {link}")
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.next_index = 0
+        self.pending = {}
+
+    def submit(self, index: int, link: str, result):
+        """
+        Hands in the result of the link at position `index`.
+
+        Args:
+            index (int): Position of the link in the input list.
+            link (str): Job link.
+            result (tuple | None): (status, job_summary[, reason]) or None if skipped.
+        """
+        with self.lock:
+            self.pending[index] = (link, result)
+            while self.next_index in self.pending:
+                ready_link, ready_result = self.pending.pop(self.next_index)
+                self.next_index += 1
+                if ready_result is not None:
+                    record_application_result(ready_link, *ready_result)
@@ -1,19 +1,166 @@
 # src/tools/token_counter.py
 
+# 📦 Import libraries
+import csv
+import os
+import threading
+
+# 🛠️ Project imports
+from config.settings import TOKENIZER_MODEL, PRICE_PER_MILLION_INPUT, PRICE_PER_MILLION_OUTPUT
+
+# 🔤 Lazily loaded tokenizer: (name, count function)
+_tokenizer = None
+_tokenizer_lock = threading.Lock()
+
+
+def _load_tokenizer():
+    """
+    Picks the most accurate local tokenizer available.
+
+    1. Gemini's own SentencePiece tokenizer (google-cloud-aiplatform[tokenization])
+    2. tiktoken cl100k_base (close approximation)
+    3. The 1 token ≈ 4 characters heuristic
+    """
+    try:
+        from vertexai.preview import tokenization  # type: ignore
+        gemini_tokenizer = tokenization.get_tokenizer_for_model(TOKENIZER_MODEL)
+        return "gemini", lambda text: gemini_tokenizer.count_tokens(text).total_tokens
+    except Exception:
+        pass
+
+    try:
+        import tiktoken  # type: ignore
+        encoding = tiktoken.get_encoding("cl100k_base")
+        return "tiktoken", lambda text: len(encoding.encode(text, disallowed_special=()))
+    except Exception:
+        pass
+
+    return "heuristic", lambda text: len(text) // 4
+
+
+def tokenizer_name() -> str:
+    """Returns which tokenizer count_tokens uses (gemini, tiktoken or heuristic)."""
+    return _get_tokenizer()[0]
+
+
+def _get_tokenizer():
+    global _tokenizer
+    if _tokenizer is None:
+        with _tokenizer_lock:
+            if _tokenizer is None:
+                _tokenizer = _load_tokenizer()
+    return _tokenizer
+
+
 def count_tokens(text: str) -> int:
     """
-    Roughly estimate the number of tokens in a text.
-    
-    Assumption:
-    - 1 token ≈ 4 characters (average for English language).
-    
+    Count the number of tokens in a text.
+
+    Uses a local tokenizer when one is installed, otherwise estimates
+    1 token ≈ 4 characters (average for English language).
+
     Args:
         text (str): The input text.
 
     Returns:
-        int: Estimated number of tokens.
+        int: Number of tokens.
     """
     if not text:
         return 1  # Always return at least 1 token even if text is empty
 
-    return max(1, len(text) // 4)
+    name, count = _get_tokenizer()
+    try:
+        return max(1, count(text))
+    except Exception:
+        return max(1, len(text) // 4)
+
+
+def trim_to_budget(text: str, max_tokens: int) -> str:
+    """
+    Cuts text so that it fits in max_tokens.
+
+    Args:
+        text (str): Text to trim.
+        max_tokens (int): Token budget for this text.
+
+    Returns:
+        str: The text, shortened from the end if it was over budget.
+    """
+    tokens = count_tokens(text)
+    if tokens <= max_tokens:
+        return text
+    if max_tokens <= 0:
+        return ""
+
+    # ✂️ Cut proportionally, then tighten until it fits
+    end = int(len(text) * max_tokens / tokens)
+    while end > 0 and count_tokens(text[:end]) > max_tokens:
+        end = int(end * 0.9)
+    return text[:end]
+
+
+def estimate_cost(prompt_tokens: int, response_tokens: int) -> float:
+    """Estimated USD cost of one call from the configured per-million prices."""
+    return (prompt_tokens * PRICE_PER_MILLION_INPUT + response_tokens * PRICE_PER_MILLION_OUTPUT) / 1_000_000
+
+
+class TokenLedger:
+    """
+    Run-level record of LLM usage per link: calls, tokens, latency and estimated cost.
+
+    Safe to use from parallel workers.
+    """
+
+    HEADER = ["Link", "Calls", "Prompt Tokens", "Response Tokens", "Latency (s)", "Estimated Cost (USD)"]
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.links = {}
+
+    def record(self, link: str, prompt_tokens: int, response_tokens: int, latency: float):
+        """Adds one LLM call to the ledger."""
+        with self.lock:
+            entry = self.links.setdefault(link or "(unknown)", {"calls": 0, "prompt": 0, "response": 0, "latency": 0.0})
+            entry["calls"] += 1
+            entry["prompt"] += prompt_tokens
+            entry["response"] += response_tokens
+            entry["latency"] += latency
+
+    def totals(self) -> dict:
+        """Sums over all links."""
+        with self.lock:
+            entries = list(self.links.values())
+        prompt = sum(e["prompt"] for e in entries)
+        response = sum(e["response"] for e in entries)
+        return {
+            "calls": sum(e["calls"] for e in entries),
+            "prompt_tokens": prompt,
+            "response_tokens": response,
+            "latency": round(sum(e["latency"] for e in entries), 2),
+            "cost": round(estimate_cost(prompt, response), 4),
+        }
+
+    def write(self, path: str):
+        """
+        Writes one row per link, most expensive first.
+
+        Args:
+            path (str): CSV file to write.
+        """
+        with self.lock:
+            rows = [
+                [link, e["calls"], e["prompt"], e["response"], round(e["latency"], 2),
+                 round(estimate_cost(e["prompt"], e["response"]), 5)]
+                for link, e in self.links.items()
+            ]
+        rows.sort(key=lambda row: row[5], reverse=True)
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, mode="w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(self.HEADER)
+            writer.writerows(rows)
+
+
+# 📒 Ledger shared by the whole run
+ledger = TokenLedger()
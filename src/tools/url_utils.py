@@ -0,0 +1,61 @@
+# src/tools/url_utils.py
+
+# 📦 Import libraries
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+# 🧹 Query parameters that only track where a click came from
+TRACKING_PARAMS = {"gclid", "fbclid", "msclkid", "mc_cid", "mc_eid", "_hsenc", "_hsmi", "trk", "trackingid"}
+DEFAULT_PORTS = {"http": "80", "https": "443"}
+
+
+def normalize_url(url: str) -> str:
+    """
+    Normalizes a job link so the same posting always maps to the same key.
+
+    - lowercases scheme and host (keeping userinfo and IPv6 brackets), drops default ports
+    - drops the fragment, unless it is a route of a single-page app ("#/jobs/123", "#!/jobs/123")
+    - removes utm_* and other tracking parameters, sorts the rest
+    - strips a trailing slash from the path
+
+    Args:
+        url (str): Link as found in the input.
+
+    Returns:
+        str: Normalized URL (the stripped input if it cannot be parsed).
+    """
+    url = (url or "").strip()
+    try:
+        parts = urlsplit(url)
+        port = parts.port
+    except ValueError:
+        return url  # Malformed, e.g. a port out of range
+    if not parts.scheme or not parts.netloc:
+        return url
+
+    scheme = parts.scheme.lower()
+    host = parts.hostname or ""
+    if ":" in host:
+        host = f"[{host}]"  # IPv6 literal
+    if port and str(port) != DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{port}"
+    userinfo = parts.netloc.rpartition("@")[0]
+    if userinfo:
+        host = f"{userinfo}@{host}"
+
+    query = sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith("utm_") and key.lower() not in TRACKING_PARAMS
+    )
+    path = parts.path.rstrip("/") or "/"
+    fragment = parts.fragment if parts.fragment.startswith(("/", "!")) else ""
+    return urlunsplit((scheme, host, path, urlencode(query), fragment))
+
+
+def is_valid_url(url: str) -> bool:
+    """True for an http(s) link with a host and, if given, a valid port."""
+    try:
+        parts = urlsplit((url or "").strip())
+        parts.port
+    except ValueError:
+        return False
+    return parts.scheme.lower() in ("http", "https") and bool(parts.hostname)
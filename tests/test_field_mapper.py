@@ -0,0 +1,33 @@
+# tests/test_field_mapper.py
+
+# 🛠️ Project imports
+from src.tools.field_mapper import FieldMapper
+
+# 📂 Minimal candidate memory
+MEMORY = {
+    "First Name": "Shreyas",
+    "Last Name": "Katagi",
+    "Email": "svkatagi@gmail.com",
+    "Street Address": "431 El Camino Real",
+    "Willingness to Relocate": "Yes",
+    "Notice Period": "Immediate",
+}
+
+
+def test_location_is_not_relocation():
+    assert FieldMapper(MEMORY).key_for("Location") is None
+
+
+def test_reference_name_is_not_candidate_name():
+    assert FieldMapper(MEMORY).key_for("Last name of reference") is None
+
+
+def test_start_date_is_not_notice_period():
+    assert FieldMapper(MEMORY).key_for("Start date") is None
+
+
+def test_standard_labels_still_map():
+    mapper = FieldMapper(MEMORY)
+    assert mapper.key_for("Last name") == "Last Name"
+    assert mapper.key_for("Email address") == "Email"
+    assert mapper.key_for("Adress") == "Street Address"
@@ -0,0 +1,146 @@
+# tests/test_llm_scheduler.py
+
+# 📦 Import libraries
+import pytest
+
+# 🛠️ Project imports
+from src.agent.llm_scheduler import LLMScheduler, PartialResponseError, choose_tier, FAST, STRONG
+
+
+class ResourceExhausted(Exception):
+    """Stands in for google.api_core's 429 error (matched by name)."""
+
+
+class ServiceUnavailable(Exception):
+    """Stands in for google.api_core's 503 error (matched by name)."""
+
+
+class FakeClock:
+    """Manual monotonic clock; sleeping advances it."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds: float):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def make_scheduler(clock: FakeClock, rpm: int = 60, tpm: int = 10000, max_retries: int = 3) -> LLMScheduler:
+    tiers = {STRONG: {"model": "strong-model", "rpm": rpm, "tpm": tpm}, FAST: {"model": "", "rpm": 0, "tpm": 0}}
+    return LLMScheduler(client_factory=lambda name: name, tiers=tiers, max_retries=max_retries,
+                        backoff_base=1.0, backoff_max=8.0, sleep=clock.sleep, clock=clock)
+
+
+def failing(errors: list, result: str = "ok"):
+    """Call that raises the given errors in turn, then returns result."""
+    calls = []
+
+    def call(client):
+        calls.append(client)
+        if len(calls) <= len(errors):
+            raise errors[len(calls) - 1]
+        return result
+
+    call.calls = calls
+    return call
+
+
+def test_retries_transient_errors_with_growing_backoff():
+    clock = FakeClock()
+    scheduler = make_scheduler(clock)
+    call = failing([ServiceUnavailable(), ServiceUnavailable()])
+
+    assert scheduler.submit(call, STRONG, 100) == "ok"
+    assert len(call.calls) == 3
+    assert scheduler.stats()["retries"] == 2
+    # Each delay is between half and all of base * 2 ** attempt
+    assert 0.5 <= clock.sleeps[0] <= 1.0
+    assert 1.0 <= clock.sleeps[1] <= 2.0
+
+
+def test_gives_up_after_max_retries():
+    clock = FakeClock()
+    scheduler = make_scheduler(clock, max_retries=2)
+    call = failing([ServiceUnavailable()] * 5)
+
+    with pytest.raises(ServiceUnavailable):
+        scheduler.submit(call, STRONG, 100)
+    assert len(call.calls) == 3
+    assert scheduler.stats()["failures"] == 1
+
+
+def test_non_retryable_error_is_raised_at_once():
+    scheduler = make_scheduler(FakeClock())
+    call = failing([ValueError("bad prompt")])
+
+    with pytest.raises(ValueError):
+        scheduler.submit(call, STRONG, 100)
+    assert len(call.calls) == 1
+
+
+def test_rate_limit_drains_the_buckets():
+    # A 503 retry only backs off; a 429 empties the buckets, so the retry also waits for a refill
+    clock = FakeClock()
+    make_scheduler(clock, rpm=6).submit(failing([ServiceUnavailable()]), STRONG, 100)
+    assert len(clock.sleeps) == 1
+
+    clock = FakeClock()
+    scheduler = make_scheduler(clock, rpm=6)
+    scheduler.submit(failing([ResourceExhausted()]), STRONG, 100)
+    assert len(clock.sleeps) == 2
+    assert scheduler.stats()["waited_seconds"] > 0
+
+
+def test_tokens_reserved_once_across_retries():
+    clock = FakeClock()
+    scheduler = make_scheduler(clock)
+    scheduler.submit(failing([ServiceUnavailable(), ServiceUnavailable()]), STRONG, 3000)
+
+    # Backoff sleeps refill the bucket, so compare against a single reservation
+    assert scheduler.tokens[STRONG].level >= 10000 - 3000
+
+
+def test_failed_call_refunds_its_tokens():
+    scheduler = make_scheduler(FakeClock(), max_retries=0)
+    with pytest.raises(ServiceUnavailable):
+        scheduler.submit(failing([ServiceUnavailable()]), STRONG, 3000)
+
+    assert scheduler.tokens[STRONG].level == 10000
+
+
+def test_partial_response_keeps_its_tokens():
+    scheduler = make_scheduler(FakeClock())
+    error = PartialResponseError([{"type": "click", "selector": "//a"}], ServiceUnavailable())
+    with pytest.raises(PartialResponseError):
+        scheduler.submit(failing([error]), STRONG, 3000)
+
+    assert scheduler.tokens[STRONG].level == 10000 - 3000
+
+
+def test_waits_when_requests_per_minute_are_used_up():
+    clock = FakeClock()
+    scheduler = make_scheduler(clock, rpm=2)
+    for _ in range(3):
+        scheduler.submit(lambda client: client, STRONG, 0)
+
+    assert clock.sleeps == [pytest.approx(30.0)]
+
+
+def test_tier_without_model_falls_back_to_strong():
+    scheduler = make_scheduler(FakeClock())
+    assert scheduler.submit(lambda client: client, FAST, 0) == "strong-model"
+
+
+def test_choose_tier():
+    small = {"fields": [{}, {}], "buttons": [{}]}
+    large = {"fields": [{}] * 10, "buttons": [{}]}
+    assert choose_tier(small, 500) == FAST
+    assert choose_tier(small, 500, escalated=True) == STRONG
+    assert choose_tier(small, 100000) == STRONG
+    assert choose_tier(large, 500) == STRONG
+    assert choose_tier(None, 500) == STRONG